@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+autotune.py
+Автонастройка порога перехода Штрассена на стандартное умножение для текущей машины.
+
+Для каждого размера n и каждого порога cutoff замеряется время Штрассена:
+  - C++: ./build/benchmark --cutoffs ... (режим перебора порогов);
+  - NumPy: strassen_numpy.strassen(A, B, cutoff).
+Лучший порог — тот, у которого среднее (геометрическое) отношение
+к лучшему времени на каждом n минимально.
+Точка пересечения — наименьшее n, начиная с которого Штрассен с этим порогом
+быстрее базового алгоритма (multiplyStandard для C++, A @ B для NumPy).
+
+Результат сохраняется в профиль data/tuning/<fingerprint>.cfg
+(см. tuning_profile.py), который читают strassen_numpy.py и src/tuning.cpp.
+"""
+
+import argparse
+import csv
+import math
+import subprocess
+from collections import defaultdict
+
+import numpy as np
+
+from bench_stats import measure, parse_sizes
+from strassen_numpy import make_workspace, strassen
+from tuning_profile import PROJECT_ROOT, TUNING_DIR, save_profile
+
+BENCHMARK_BIN = PROJECT_ROOT / "build" / "benchmark"
+
+
+def choose_cutoff(times: dict, baseline: dict):
+    """
+    times    — {(n, cutoff): мс}, baseline — {n: мс}.
+    Возвращает (лучший cutoff, точка пересечения n или None).
+    """
+    by_n = defaultdict(dict)
+    for (n, cutoff), ms in times.items():
+        by_n[n][cutoff] = ms
+
+    cutoffs = sorted({c for (_, c) in times})
+    scores = {}
+    for c in cutoffs:
+        ratios = [by_n[n][c] / min(by_n[n].values()) for n in by_n if c in by_n[n]]
+        scores[c] = math.exp(sum(math.log(r) for r in ratios) / len(ratios))
+    best = min(cutoffs, key=lambda c: (scores[c], c))
+
+    # Наименьшее n, после которого Штрассен выигрывает на всех больших n
+    crossover = None
+    for n in sorted(by_n, reverse=True):
+        if best in by_n[n] and by_n[n][best] < baseline[n]:
+            crossover = n
+        else:
+            break
+    return best, crossover
+
+
+def tune_numpy(sizes, cutoffs, repeats):
+    times = {}
+    baseline = {}
+    for n in sizes:
+        A = np.random.rand(n, n)
+        B = np.random.rand(n, n)
+        stats, _ = measure(lambda: A @ B, repeats=repeats)
+        baseline[n] = stats["median"]
+        print(f"NumPy n = {n}: A @ B {baseline[n]:.3f} ms")
+        for c in cutoffs:
+            workspace = make_workspace(n, n, n, c, A.dtype)
+            stats, _ = measure(lambda: strassen(A, B, cutoff=c, workspace=workspace),
+                               repeats=repeats)
+            times[(n, c)] = stats["median"]
+            print(f"  cutoff = {c}: {times[(n, c)]:.3f} ms")
+    return choose_cutoff(times, baseline)
+
+
+def tune_cpp(sizes, cutoffs, repeats):
+    if not BENCHMARK_BIN.exists():
+        raise FileNotFoundError(
+            f"Не найден {BENCHMARK_BIN}. Сначала собери проект: cmake -B build && cmake --build build"
+        )
+
+    TUNING_DIR.mkdir(parents=True, exist_ok=True)
+    sweep_path = TUNING_DIR / "cpp_cutoff_sweep.csv"
+    subprocess.run(
+        [
+            str(BENCHMARK_BIN),
+            "--sizes", ",".join(map(str, sizes)),
+            "--cutoffs", ",".join(map(str, cutoffs)),
+            "--repeats", str(repeats),
+            "--out", str(sweep_path),
+        ],
+        check=True,
+    )
+
+    times = {}
+    baseline = {}
+    with sweep_path.open(encoding="utf-8") as f:
+        for row in csv.DictReader(f):
+            n = int(row["n"])
+            times[(n, int(row["cutoff"]))] = float(row["strassen_ms"])
+            baseline[n] = float(row["standard_ms"])
+    if not times:
+        raise RuntimeError(f"Пустой результат автонастройки C++: {sweep_path}")
+    return choose_cutoff(times, baseline)
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Автонастройка порога Штрассена")
+    parser.add_argument("--cpp-sizes", default="64:512")
+    parser.add_argument("--cpp-cutoffs", default="8:256")
+    parser.add_argument("--numpy-sizes", default="256:2048")
+    parser.add_argument("--numpy-cutoffs", default="32:1024")
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--skip-cpp", action="store_true", help="не настраивать C++")
+    parser.add_argument("--skip-numpy", action="store_true", help="не настраивать NumPy")
+    return parser.parse_args()
+
+
+def _fmt(n):
+    return "none" if n is None else n
+
+
+def main():
+    args = parse_args()
+    values = {}
+
+    if not args.skip_cpp:
+        cutoff, crossover = tune_cpp(
+            parse_sizes(args.cpp_sizes), parse_sizes(args.cpp_cutoffs), args.repeats
+        )
+        values["cpp_strassen_cutoff"] = cutoff
+        values["cpp_crossover_n"] = _fmt(crossover)
+        values["cpp_max_tuned_n"] = max(parse_sizes(args.cpp_sizes))
+        print(f"C++: порог = {cutoff}, Штрассен быстрее стандартного при n >= {_fmt(crossover)}")
+
+    if not args.skip_numpy:
+        cutoff, crossover = tune_numpy(
+            parse_sizes(args.numpy_sizes), parse_sizes(args.numpy_cutoffs), args.repeats
+        )
+        values["numpy_strassen_cutoff"] = cutoff
+        values["numpy_crossover_n"] = _fmt(crossover)
+        values["numpy_max_tuned_n"] = max(parse_sizes(args.numpy_sizes))
+        print(f"NumPy: порог = {cutoff}, Штрассен быстрее A @ B при n >= {_fmt(crossover)}")
+
+    if values:
+        path = save_profile(values)
+        print(f"Профиль автонастройки сохранён: {path}")
+
+
+if __name__ == "__main__":
+    main()
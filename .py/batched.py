@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+batched.py
+Пакетное умножение множества маленьких матриц одним вызовом.
+
+matmul_batched(A, B) принимает стопки матриц формы (batch, n, k) и (batch, k, m)
+и считает все произведения одним вызовом np.matmul. Одна из стопок может
+быть одиночной матрицей (n, k) или (k, m) — она транслируется (broadcasting)
+на весь пакет.
+
+Запуск как скрипт — произведений в секунду в зависимости от размера пакета,
+в сравнении с циклом Python из отдельных A[i] @ B[i]:
+  python3 .py/batched.py --sizes 4,8,16,32 --batches 1,16,256,4096,16384
+Результат: data/csv/batched.csv
+"""
+
+import argparse
+import csv
+
+import numpy as np
+
+from bench_stats import measure, parse_sizes
+from tuning_profile import PROJECT_ROOT
+
+DATA_DIR = PROJECT_ROOT / "data"
+CSV_DIR = DATA_DIR / "csv"
+
+
+def matmul_batched(A, B, out=None):
+    """
+    C[i] = A[i] @ B[i] для всех i одним вызовом.
+    A: (batch, n, k) или (n, k); B: (batch, k, m) или (k, m).
+    """
+    A = np.asarray(A)
+    B = np.asarray(B)
+    if A.ndim not in (2, 3) or B.ndim not in (2, 3):
+        raise ValueError(f"ожидались стопки матриц (batch, n, n), получено {A.shape} и {B.shape}")
+    if A.shape[-1] != B.shape[-2]:
+        raise ValueError(f"несогласованные размеры: {A.shape} и {B.shape}")
+    if A.ndim == 3 and B.ndim == 3 and A.shape[0] != B.shape[0]:
+        raise ValueError(f"разные размеры пакетов: {A.shape[0]} и {B.shape[0]}")
+    return np.matmul(A, B, out=out)
+
+
+def matmul_loop(A, B, out=None):
+    """То же самое циклом Python из отдельных A[i] @ B[i] — для сравнения."""
+    if out is None:
+        out = np.empty((A.shape[0], A.shape[1], B.shape[2]), dtype=np.result_type(A, B))
+    for i in range(A.shape[0]):
+        out[i] = A[i] @ B[i]
+    return out
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Пропускная способность пакетного умножения")
+    parser.add_argument("--sizes", default="4,8,16,32", help="размеры матриц n")
+    parser.add_argument("--batches", default="1,16,256,4096,16384", help="размеры пакетов")
+    parser.add_argument("--repeats", type=int, default=5)
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    CSV_DIR.mkdir(parents=True, exist_ok=True)
+
+    out_filename = CSV_DIR / "batched.csv"
+    with open(out_filename, "w", newline="") as f:
+        writer = csv.DictWriter(
+            f,
+            fieldnames=["n", "batch", "batched_ms", "loop_ms",
+                        "batched_per_s", "loop_per_s", "speedup"],
+        )
+        writer.writeheader()
+
+        for n in parse_sizes(args.sizes):
+            print(f"n = {n}")
+            for batch in parse_sizes(args.batches):
+                A = np.random.rand(batch, n, n)
+                B = np.random.rand(batch, n, n)
+                C = np.empty_like(A)
+
+                batched, _ = measure(lambda: matmul_batched(A, B, out=C), repeats=args.repeats)
+                loop, _ = measure(lambda: matmul_loop(A, B, out=C), repeats=args.repeats)
+
+                batched_per_s = batch / (batched["median"] / 1000.0)
+                loop_per_s = batch / (loop["median"] / 1000.0)
+                writer.writerow({
+                    "n": n,
+                    "batch": batch,
+                    "batched_ms": batched["median"],
+                    "loop_ms": loop["median"],
+                    "batched_per_s": batched_per_s,
+                    "loop_per_s": loop_per_s,
+                    "speedup": loop["median"] / batched["median"],
+                })
+                f.flush()
+                print(f"  batch = {batch:6d}: пакетно {batched_per_s:12.0f} произв./с, "
+                      f"цикл {loop_per_s:12.0f} произв./с "
+                      f"(x{loop['median'] / batched['median']:.1f})")
+
+    print(f"Готово. Данные записаны в {out_filename}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+bench_stats.py
+Общие средства замера времени для Python-бенчмарков (аналог src/bench_stats.cpp):
+
+  - прогрев (warm-up) перед замером;
+  - калибровка числа вызовов в одной выборке, как timeit.autorange:
+    число вызовов удваивается, пока выборка не длится хотя бы min_time;
+  - статистика по выборкам: min, медиана, p95 и 95% доверительный
+    интервал медианы (по порядковым статистикам, без предположений
+    о распределении);
+  - разбор списка размеров из командной строки: "64,128,300" или "64:4096".
+"""
+
+import math
+import time
+
+import numpy as np
+
+DEFAULT_REPEATS = 7
+DEFAULT_WARMUP = 1
+DEFAULT_MIN_TIME_MS = 50.0
+
+
+def _elapsed_ms(func, number: int) -> float:
+    start = time.perf_counter()
+    for _ in range(number):
+        func()
+    end = time.perf_counter()
+    return (end - start) * 1000.0
+
+
+def autorange(func, min_time_ms: float = DEFAULT_MIN_TIME_MS) -> int:
+    """Подбирает число вызовов, при котором одна выборка длится >= min_time_ms."""
+    number = 1
+    while _elapsed_ms(func, number) < min_time_ms:
+        number *= 2
+    return number
+
+
+def summarize(samples) -> dict:
+    """Статистика по выборкам (время одного вызова, мс)."""
+    s = np.sort(np.asarray(samples, dtype=float))
+    n = s.size
+    if n == 0:
+        raise ValueError("summarize: пустой список выборок")
+
+    # Непараметрический 95% ДИ медианы: ранги n/2 ± 1.96·√n/2 (с 1)
+    half = 1.96 * math.sqrt(n) / 2.0
+    lo = max(int(math.floor(n / 2.0 - half)), 1)
+    hi = min(int(math.ceil(1.0 + n / 2.0 + half)), n)
+
+    return {
+        "min": float(s[0]),
+        "median": float(np.percentile(s, 50)),
+        "p95": float(np.percentile(s, 95)),
+        "ci_low": float(s[lo - 1]),
+        "ci_high": float(s[hi - 1]),
+        "repeats": int(n),
+    }
+
+
+def measure(
+    func,
+    repeats: int = DEFAULT_REPEATS,
+    warmup: int = DEFAULT_WARMUP,
+    min_time_ms: float = DEFAULT_MIN_TIME_MS,
+) -> tuple[dict, list[float]]:
+    """
+    Замер функции без аргументов.
+    Возвращает (статистика, список выборок в мс на один вызов).
+    """
+    for _ in range(warmup):
+        func()
+
+    number = autorange(func, min_time_ms)
+    samples = [_elapsed_ms(func, number) / number for _ in range(repeats)]
+
+    stats = summarize(samples)
+    stats["number"] = number
+    return stats, samples
+
+
+def parse_sizes(text: str) -> list[int]:
+    """
+    "64,128,300" -> [64, 128, 300];
+    "64:4096"    -> степени двойки от 64 до 4096 включительно.
+    Части можно комбинировать: "2:512,1000,3000".
+    """
+    sizes: list[int] = []
+    for item in text.split(","):
+        item = item.strip()
+        if not item:
+            continue
+        if ":" not in item:
+            sizes.append(int(item))
+            continue
+
+        first, last = (int(x) for x in item.split(":", 1))
+        if first <= 0 or last < first:
+            raise ValueError(f"некорректный диапазон размеров: {item}")
+        n = first
+        while n <= last:
+            sizes.append(n)
+            n *= 2
+
+    if any(n <= 0 for n in sizes):
+        raise ValueError("размер матрицы должен быть положительным")
+    return sizes
@@ -1,97 +1,193 @@
 # benchmark_numpy.py
-import csv
-import time
-import os
-import shutil
+# Замеры движков NumPy (и C++ через ctypes) в хранилище data/store/results.sqlite.
+# Точки, для которых уже есть актуальный замер, пропускаются (см. results_store.py).
+# Движки NumPy замеряются при заданном числе потоков BLAS (--threads, blas_threads.py);
+# число потоков и библиотека BLAS записываются в хранилище вместе с замером.
+import argparse
 import numpy as np
 
-DATA_DIR = "data"
-CSV_DIR = os.path.join(DATA_DIR, "csv")
-PNG_DIR = os.path.join(DATA_DIR, "png")
-
-
-def ensure_dirs():
-    """Создаём папки data/, data/csv/, data/png/ при необходимости."""
-    os.makedirs(CSV_DIR, exist_ok=True)
-    os.makedirs(PNG_DIR, exist_ok=True)
+import blas_threads
+import cpp_kernels
+from bench_stats import (
+    DEFAULT_MIN_TIME_MS,
+    DEFAULT_REPEATS,
+    DEFAULT_WARMUP,
+    measure,
+    parse_sizes,
+)
+from results_store import DTYPES, ResultsStore, parse_dtypes
+from roofline import throughput
+from strassen_numpy import strassen
+
+
+def read_n_values_from_cpp(store: ResultsStore) -> list[int]:
+    """Размеры n, для которых в хранилище есть замеры C++ на этой машине."""
+    n_values = sorted(store.series("standard"))
+    if not n_values:
+        raise LookupError(
+            "В хранилище нет замеров C++. "
+            "Сначала запусти: python3 .py/results_store.py cpp (или передай --sizes)."
+        )
+    return n_values
 
 
-def ensure_cpp_csv() -> str:
-    """
-    Гарантируем, что timings.csv от C++ лежит в data/csv/.
-    Если файл лежит в корне проекта — переносим его туда.
-    Возвращаем путь к файлу.
-    """
-    data_path = os.path.join(CSV_DIR, "timings.csv")
-    root_path = "timings.csv"
+# Движки, которые замеряем: имя колонки -> функция умножения
+ENGINES = {
+    "numpy": lambda A, B: A @ B,   # или np.dot(A, B)
+    "strassen_numpy": strassen,
+}
 
-    if os.path.exists(data_path):
-        return data_path
+# C++-ядра через ctypes (если собрана build/libmatmul): те же входные матрицы
+CPP_ENGINES = {
+    "cpp_standard": cpp_kernels.multiply_standard,
+    "cpp_strassen": cpp_kernels.strassen,
+}
 
-    if os.path.exists(root_path):
-        ensure_dirs()
-        shutil.move(root_path, data_path)
-        print(f"Перенёс {root_path} -> {data_path}")
-        return data_path
 
-    raise FileNotFoundError(
-        "Не найден timings.csv. "
-        "Сначала запусти C++ benchmark (./benchmark)."
-    )
+# Движки, которые считают через BLAS: для них перебираются числа потоков
+BLAS_ENGINES = set(ENGINES)
 
 
-def read_n_values_from_cpp() -> list[int]:
-    """Читаем размеры n из C++-бенчмарка (уже внутри data/csv)."""
-    path = ensure_cpp_csv()
-    n_values: list[int] = []
-    with open(path, newline="") as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            n_values.append(int(row["n"]))
-    return n_values
+def available_engines() -> dict:
+    engines = dict(ENGINES)
+    if cpp_kernels.available():
+        engines.update(CPP_ENGINES)
+    return engines
 
 
-def measure_numpy(n: int, repeats: int = 3) -> float:
+def make_operands(n: int, dtype: str):
     """
-    Замеряем время умножения двух случайных матриц n x n с помощью NumPy.
-    Возвращаем среднее время (мс) по нескольким запускам.
+    Случайные матрицы n x n типа dtype: вещественные — из [0, 1),
+    целые — из 0..9, как в C++-бенчмарке (чтобы не было переполнения).
     """
-    times = []
-    for _ in range(repeats):
-        A = np.random.rand(n, n)
-        B = np.random.rand(n, n)
-
-        start = time.perf_counter()
-        _ = A @ B           # или np.dot(A, B)
-        end = time.perf_counter()
+    if np.issubdtype(np.dtype(dtype), np.integer):
+        return (np.random.randint(0, 10, (n, n)).astype(dtype),
+                np.random.randint(0, 10, (n, n)).astype(dtype))
+    return np.random.rand(n, n).astype(dtype), np.random.rand(n, n).astype(dtype)
 
-        times.append((end - start) * 1000.0)
 
-    return sum(times) / len(times)
+def measure_engine(multiply, A, B, repeats: int, warmup: int, min_time_ms: float):
+    """
+    Замер одного движка на заранее подготовленных матрицах A и B.
+    Матрицы создаются вне замеряемого цикла.
+    Возвращает (статистика, выборки в мс).
+    """
+    return measure(
+        lambda: multiply(A, B),
+        repeats=repeats,
+        warmup=warmup,
+        min_time_ms=min_time_ms,
+    )
 
 
-def main():
-    ensure_dirs()
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Бенчмарк умножения матриц на NumPy")
+    parser.add_argument(
+        "--sizes",
+        help='размеры n: "64,128,300" или диапазон степеней двойки "64:4096" '
+        "(по умолчанию — те же n, что у замеров C++ в хранилище)",
+    )
+    parser.add_argument("--repeats", type=int, default=DEFAULT_REPEATS,
+                        help="число выборок на точку")
+    parser.add_argument("--warmup", type=int, default=DEFAULT_WARMUP,
+                        help="число прогревочных запусков")
+    parser.add_argument("--min-time", type=float, default=DEFAULT_MIN_TIME_MS,
+                        help="минимальная длительность одной выборки, мс")
+    parser.add_argument(
+        "--engines",
+        help="движки через запятую (по умолчанию все доступные): "
+        + ",".join(list(ENGINES) + list(CPP_ENGINES)),
+    )
+    parser.add_argument("--dtypes", default="float64",
+                        help="типы элементов через запятую: " + ",".join(DTYPES))
+    parser.add_argument(
+        "--threads", default="default",
+        help='числа потоков BLAS для движков NumPy: "default" (по умолчанию), '
+        '"all" (1..число по умолчанию), "1,2,4" или "1:16"; кроме default нужен threadpoolctl',
+    )
+    parser.add_argument("--force", action="store_true",
+                        help="замерить заново даже актуальные точки")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    store = ResultsStore()
+
+    if args.sizes:
+        n_values = parse_sizes(args.sizes)
+    else:
+        try:
+            n_values = read_n_values_from_cpp(store)
+        except LookupError as e:
+            print(e)
+            return
+
+    engines = available_engines()
+    if args.engines:
+        names = [x for x in args.engines.split(",") if x]
+        unknown = [x for x in names if x not in engines]
+        if unknown:
+            print(f"Недоступные движки: {', '.join(unknown)}")
+            return
+        engines = {name: engines[name] for name in names}
 
     try:
-        n_values = read_n_values_from_cpp()
-    except FileNotFoundError as e:
+        dtypes = parse_dtypes(args.dtypes)
+    except ValueError as e:
         print(e)
         return
 
-    out_filename = os.path.join(CSV_DIR, "timings_numpy.csv")
-    with open(out_filename, "w", newline="") as f:
-        fieldnames = ["n", "numpy_ms"]
-        writer = csv.DictWriter(f, fieldnames=fieldnames)
-        writer.writeheader()
-
-        for n in n_values:
-            print(f"Замер NumPy для n = {n} ...")
-            t_np = measure_numpy(n)
-            writer.writerow({"n": n, "numpy_ms": t_np})
-            print(f"  numpy: {t_np:.3f} ms")
-
-    print(f"Готово. Данные NumPy записаны в {out_filename}")
+    try:
+        thread_counts = blas_threads.parse_threads(args.threads)
+    except ValueError as e:
+        print(e)
+        return
+    blas = blas_threads.blas_vendor()
+    if thread_counts == [0]:
+        print(f"BLAS: {blas}, число потоков не известно (нет threadpoolctl), "
+              "замер с пулом по умолчанию, в хранилище threads = 0")
+    else:
+        print(f"BLAS: {blas}, потоков по умолчанию {blas_threads.default_threads()}, "
+              f"замер при {', '.join(map(str, thread_counts))}")
+
+    # (движок, число потоков); 0 — пул по умолчанию с неизвестным числом
+    # потоков (нет threadpoolctl); C++-ядра от BLAS не зависят: тоже 0
+    runs = [(name, threads) for name in engines
+            for threads in (thread_counts if name in BLAS_ENGINES else [0])]
+
+    measured = 0
+    for n in n_values:
+        for dtype in dtypes:
+            todo = [(name, threads) for name, threads in runs
+                    if args.force or not store.has(name, n, dtype, threads)]
+            if not todo:
+                print(f"n = {n}, {dtype}: все замеры актуальны")
+                continue
+
+            print(f"Замер NumPy для n = {n}, {dtype} ...")
+            A, B = make_operands(n, dtype)
+
+            for name, threads in todo:
+                with blas_threads.limit(threads):
+                    stats, samples = measure_engine(
+                        engines[name], A, B, args.repeats, args.warmup, args.min_time
+                    )
+                store.put(name, n, samples, dtype=dtype, threads=threads,
+                          blas=blas if name in BLAS_ENGINES else "")
+                measured += 1
+                t = throughput(name, n, stats["median"], dtype)
+                rate = f", {t['gflops']:.2f} GFLOP/s" if t else ""
+                label = f"{name} [{threads} пот.]" if threads else name
+                print(
+                    f"  {label}: median {stats['median']:.4f} ms "
+                    f"(min {stats['min']:.4f}, p95 {stats['p95']:.4f}, "
+                    f"95% ДИ [{stats['ci_low']:.4f}; {stats['ci_high']:.4f}], "
+                    f"{stats['repeats']} x {stats['number']} вызовов){rate}"
+                )
+
+    store.close()
+    print(f"Готово. Новых замеров: {measured}, хранилище: {store.path}")
 
 
 if __name__ == "__main__":
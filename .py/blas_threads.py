@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+blas_threads.py
+Число потоков BLAS, на которых считает NumPy: узнать и ограничить.
+
+NumPy умножает через BLAS (OpenBLAS, MKL, BLIS), а тот сам выбирает число
+потоков — обычно по числу ядер. Замеры с разных машин без этого числа
+несравнимы, поэтому benchmark_numpy.py задаёт его явно для каждого замера
+и записывает в хранилище вместе с названием библиотеки.
+
+Узнать и менять пул во время работы умеет threadpoolctl (необязательная
+зависимость: pip install threadpoolctl). Без него название библиотеки
+берётся из np.show_config, а число потоков не известно: замер возможен
+только с пулом по умолчанию и записывается с threads = 0.
+
+  with limit(2):
+      C = A @ B          — BLAS считает в 2 потока
+  with limit(0):
+      C = A @ B          — пул по умолчанию, число потоков не трогаем
+
+Запуск как скрипт печатает библиотеку и число потоков:
+  python3 .py/blas_threads.py
+"""
+
+import contextlib
+
+import numpy as np
+
+from bench_stats import parse_sizes
+
+try:
+    import threadpoolctl
+except ImportError:  # threadpoolctl необязателен: без него число потоков не меняется
+    threadpoolctl = None
+
+
+def _blas_pools():
+    if threadpoolctl is None:
+        return []
+    return [pool for pool in threadpoolctl.threadpool_info() if pool.get("user_api") == "blas"]
+
+
+def can_control() -> bool:
+    """Можно ли менять число потоков BLAS во время работы."""
+    return bool(_blas_pools())
+
+
+def blas_vendor() -> str:
+    """Название и версия библиотеки BLAS, например "openblas 0.3.27"."""
+    pools = _blas_pools()
+    if pools:
+        return f"{pools[0]['internal_api']} {pools[0].get('version') or ''}".strip()
+    try:
+        blas = np.show_config(mode="dicts")["Build Dependencies"]["blas"]
+        return f"{blas['name']} {blas.get('version', '')}".strip()
+    except (TypeError, KeyError):  # старый NumPy: show_config без mode="dicts"
+        return "unknown"
+
+
+def default_threads():
+    """Число потоков BLAS по умолчанию; None — не известно (нет threadpoolctl)."""
+    pools = _blas_pools()
+    return int(pools[0]["num_threads"]) if pools else None
+
+
+def parse_threads(text: str) -> list[int]:
+    """
+    "all" -> 1, 2, ..., default_threads(); "default" -> [default_threads()]
+    (или [0], если число не известно); иначе как --sizes: "1,2,4" или "1:16"
+    (степени двойки). Всё, кроме default, требует threadpoolctl — ValueError.
+    """
+    default = default_threads()
+    if text == "default":
+        return [default or 0]
+    if default is None:
+        raise ValueError("Число потоков BLAS не меняется без threadpoolctl: "
+                         "pip install threadpoolctl")
+    if text == "all":
+        return list(range(1, default + 1))
+    return parse_sizes(text)
+
+
+@contextlib.contextmanager
+def limit(threads: int):
+    """Ограничивает пул BLAS threads потоками на время блока with (0 — не трогать)."""
+    if threads == 0:
+        yield
+        return
+    if not can_control():
+        raise RuntimeError(
+            f"Нельзя задать {threads} потоков BLAS: нужен threadpoolctl "
+            "(pip install threadpoolctl)"
+        )
+    with threadpoolctl.threadpool_limits(limits=threads, user_api="blas"):
+        yield
+
+
+def main():
+    default = default_threads()
+    if default is None:
+        print(f"BLAS: {blas_vendor()}, число потоков не известно и не меняется "
+              "(нет threadpoolctl)")
+    else:
+        print(f"BLAS: {blas_vendor()}, потоков по умолчанию: {default}, число потоков можно менять")
+
+
+if __name__ == "__main__":
+    main()
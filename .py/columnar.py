@@ -0,0 +1,231 @@
+#!/usr/bin/env python3
+"""
+columnar.py
+Двоичный столбцовый формат для сырых выборок замеров (*.mcol).
+
+Каждая выборка каждого повтора хранится отдельной строкой вместе с
+метаданными (алгоритм, n, dtype, номер повтора, потоки, ...). Файл
+читается в словарь массивов NumPy одним вызовом:
+
+  columns = load("data/store/samples.mcol")
+  columns["ms"][columns["algorithm"] == "strassen"]
+
+Файл — заголовок "MCOL" + версия и последовательность блоков; блок —
+столбцы одинаковой длины (числа как есть, строки — словарь + коды).
+Формат описан в include/columnar.h; C++-бенчмарк пишет его тем же кодом
+(build/benchmark -> timings_samples.mcol, блок на каждую пару n, dtype).
+
+Блоки только дописываются (append): замер сохраняет каждую точку сразу,
+и если процесс упал, недописанный последний блок при чтении отбрасывается,
+а всё замеренное раньше остаётся. Следующая запись отрезает такой хвост
+перед тем, как дописать свой блок.
+
+  python3 .py/columnar.py data/store/samples.mcol — что лежит в файле
+"""
+
+import argparse
+import struct
+from pathlib import Path
+
+import numpy as np
+
+MAGIC = b"MCOL"
+VERSION = 1
+HEADER = struct.Struct("<4sI")         # magic, версия
+CHUNK = struct.Struct("<4sIIQ")        # "CHNK", строк, столбцов, байт данных
+CHUNK_MAGIC = b"CHNK"
+
+FLOAT64, INT64, STRING = 1, 2, 3
+
+
+# --- Запись ---
+
+
+def _encode_column(name, values):
+    """Имя, тип и значения одного столбца."""
+    encoded_name = name.encode("utf-8")
+    out = [struct.pack("<B", len(encoded_name)), encoded_name]
+    values = np.asarray(values)
+    if values.dtype.kind in "biu":
+        out += [struct.pack("<B", INT64), values.astype("<i8").tobytes()]
+    elif values.dtype.kind == "f":
+        out += [struct.pack("<B", FLOAT64), values.astype("<f8").tobytes()]
+    else:
+        dictionary, codes = np.unique(values.astype(str), return_inverse=True)
+        out += [struct.pack("<BI", STRING, len(dictionary))]
+        for word in dictionary:
+            encoded = str(word).encode("utf-8")
+            out += [struct.pack("<H", len(encoded)), encoded]
+        out.append(codes.astype("<u4").tobytes())
+    return b"".join(out)
+
+
+def encode_chunk(columns: dict) -> bytes:
+    """Блок из словаря {имя: значения}; все столбцы одной длины."""
+    lengths = {len(values) for values in columns.values()}
+    if len(lengths) != 1:
+        raise ValueError(f"столбцы разной длины: {sorted(lengths)}")
+    payload = b"".join(_encode_column(name, values) for name, values in columns.items())
+    return CHUNK.pack(CHUNK_MAGIC, lengths.pop(), len(columns), len(payload)) + payload
+
+
+def _complete_length(f, size):
+    """
+    Длина заголовка и целых блоков файла f размером size байт: дальше —
+    недописанный хвост (запись оборвалась). 0 — нет даже заголовка.
+    """
+    if size < HEADER.size:
+        return 0
+    f.seek(0)
+    magic, version = HEADER.unpack(f.read(HEADER.size))
+    if magic != MAGIC or version != VERSION:
+        raise ValueError(f"{f.name}: не файл *.mcol версии {VERSION}")
+    offset = HEADER.size
+    while offset + CHUNK.size <= size:
+        f.seek(offset)
+        magic, _, _, chunk_size = CHUNK.unpack(f.read(CHUNK.size))
+        if magic != CHUNK_MAGIC:
+            raise ValueError(f"{f.name}: повреждён блок на смещении {offset}")
+        if offset + CHUNK.size + chunk_size > size:
+            break
+        offset += CHUNK.size + chunk_size
+    return offset
+
+
+def append(path, columns: dict):
+    """
+    Дописывает блок в конец файла (создаёт файл с заголовком, если его нет).
+    Недописанный хвост от упавшей записи сначала отрезается: иначе новый
+    блок лёг бы за ним и файл перестал бы читаться.
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    chunk = encode_chunk(columns)
+    path.touch()
+    with open(path, "r+b") as f:
+        size = f.seek(0, 2)
+        length = _complete_length(f, size)
+        if length < size:
+            f.truncate(length)
+        f.seek(length)
+        if length == 0:
+            f.write(HEADER.pack(MAGIC, VERSION))
+        f.write(chunk)
+
+
+def write(path, columns: dict):
+    """Новый файл из одного блока; старый заменяется целиком только после записи."""
+    path = Path(path)
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.unlink(missing_ok=True)
+    append(tmp, columns)
+    tmp.replace(path)
+    return path
+
+
+# --- Чтение ---
+
+
+def _decode_chunk(payload, rows, count):
+    columns = {}
+    offset = 0
+    for _ in range(count):
+        (name_length,) = struct.unpack_from("<B", payload, offset)
+        offset += 1
+        name = bytes(payload[offset:offset + name_length]).decode("utf-8")
+        offset += name_length
+        (kind,) = struct.unpack_from("<B", payload, offset)
+        offset += 1
+        if kind in (FLOAT64, INT64):
+            dtype = "<f8" if kind == FLOAT64 else "<i8"
+            columns[name] = np.frombuffer(payload, dtype, rows, offset)
+            offset += rows * 8
+        elif kind == STRING:
+            (size,) = struct.unpack_from("<I", payload, offset)
+            offset += 4
+            dictionary = []
+            for _ in range(size):
+                (length,) = struct.unpack_from("<H", payload, offset)
+                offset += 2
+                dictionary.append(bytes(payload[offset:offset + length]).decode("utf-8"))
+                offset += length
+            codes = np.frombuffer(payload, "<u4", rows, offset)
+            offset += rows * 4
+            columns[name] = np.asarray(dictionary, dtype=str)[codes]
+        else:
+            raise ValueError(f"неизвестный тип столбца {kind} ({name})")
+    return columns
+
+
+def read_chunks(path):
+    """
+    Блоки файла по порядку: (столбцы, None); последним — (None, число
+    байт недописанного хвоста), если файл обрывается посреди блока.
+    """
+    data = memoryview(Path(path).read_bytes())
+    if len(data) < HEADER.size:
+        raise ValueError(f"{path}: нет заголовка *.mcol")
+    magic, version = HEADER.unpack_from(data)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError(f"{path}: не файл *.mcol версии {VERSION}")
+
+    offset = HEADER.size
+    while offset < len(data):
+        if offset + CHUNK.size > len(data):
+            yield None, len(data) - offset
+            return
+        magic, rows, count, size = CHUNK.unpack_from(data, offset)
+        if magic != CHUNK_MAGIC:
+            raise ValueError(f"{path}: повреждён блок на смещении {offset}")
+        if offset + CHUNK.size + size > len(data):
+            yield None, len(data) - offset
+            return
+        payload = data[offset + CHUNK.size:offset + CHUNK.size + size]
+        yield _decode_chunk(payload, rows, count), None
+        offset += CHUNK.size + size
+
+
+def load(path) -> dict:
+    """
+    Весь файл одним вызовом: {столбец: массив NumPy}. Недописанный
+    последний блок (запись оборвалась) пропускается. Если набор столбцов
+    в блоках различается, недостающие значения — NaN / -1 / "".
+    """
+    chunks = [columns for columns, _ in read_chunks(path) if columns is not None]
+    names = list(dict.fromkeys(name for columns in chunks for name in columns))
+    result = {}
+    for name in names:
+        kinds = {columns[name].dtype.kind for columns in chunks if name in columns}
+        fill = "" if "U" in kinds else np.nan if "f" in kinds else -1
+        parts = [columns[name] if name in columns
+                 else np.full(len(next(iter(columns.values()))), fill)
+                 for columns in chunks]
+        result[name] = np.concatenate(parts)
+    return result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Содержимое файла *.mcol")
+    parser.add_argument("path", help="файл *.mcol")
+    args = parser.parse_args(argv)
+
+    chunks, rows, tail = 0, 0, 0
+    for columns, truncated in read_chunks(args.path):
+        if columns is None:
+            tail = truncated
+            continue
+        chunks += 1
+        rows += len(next(iter(columns.values()), []))
+    print(f"{args.path}: блоков {chunks}, строк {rows}")
+    if tail:
+        print(f"Недописанный хвост: {tail} байт (запись оборвалась), пропущен при чтении")
+    columns = load(args.path)
+    for name, values in columns.items():
+        if values.dtype.kind == "U":
+            print(f"  {name}: строки, {len(np.unique(values))} различных")
+        else:
+            print(f"  {name}: {values.dtype}, от {values.min()} до {values.max()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,319 @@
+#!/usr/bin/env python3
+"""
+complexity_fit.py
+Эмпирический показатель сложности: аппроксимация T(n) ≈ c · n^a по замерам.
+
+Для каждого алгоритма из хранилища (results_store.py):
+  - находится асимптотический диапазон — самый длинный хвост по n, на котором
+    точки в координатах log–log ложатся на прямую (среднеквадратичный остаток
+    не больше --tolerance); на малых n время определяется накладными
+    расходами, и такие точки в аппроксимацию не попадают;
+  - методом наименьших квадратов по медианам находятся наклон a и константа c;
+  - 95% доверительные интервалы — бутстрэп: точки диапазона выбираются
+    с возвращением, у каждой медиана пересчитывается по выборке повторов
+    с возвращением; все реплики аппроксимируются сразу, векторно;
+  - по модели предсказывается время для незамеренных размеров (--predict)
+    с интервалом по тем же репликам.
+
+  python3 .py/complexity_fit.py
+  python3 .py/complexity_fit.py --predict 8192,16384,65536 --bootstrap 5000
+Результат:
+  data/csv/complexity_fit.csv          — показатель, константа и их интервалы
+  data/csv/complexity_predictions.csv  — прогноз времени с интервалом
+  data/png/complexity_fit.png          — замеры, модели и прогноз (log–log)
+"""
+
+import argparse
+import csv
+import math
+
+import numpy as np
+
+from bench_stats import parse_sizes
+from results_store import CSV_DIR, DATA_DIR, ResultsStore
+
+PNG_DIR = DATA_DIR / "png"
+FIT_CSV = CSV_DIR / "complexity_fit.csv"
+PREDICTIONS_CSV = CSV_DIR / "complexity_predictions.csv"
+FIT_PNG = PNG_DIR / "complexity_fit.png"
+
+DEFAULT_PREDICT = "8192,16384,32768"
+DEFAULT_BOOTSTRAP = 2000
+MIN_POINTS = 4
+# Допустимый среднеквадратичный остаток в натуральном логарифме (≈ 10%)
+DEFAULT_TOLERANCE = 0.1
+
+FIT_FIELDS = ["algorithm", "dtype", "n_min", "n_max", "points", "exponent",
+              "exponent_low", "exponent_high", "constant_ms", "constant_low_ms",
+              "constant_high_ms", "rms"]
+PREDICTION_FIELDS = ["algorithm", "dtype", "n", "predicted_ms", "low_ms", "high_ms"]
+
+
+# --- Аппроксимация ---
+
+
+def suffix_fits(x, y):
+    """
+    Прямые y = a x + b по всем хвостам x[i:], y[i:] сразу (обратные
+    накопленные суммы). Возвращает массивы (a, b, rms) длины len(x).
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    rev = lambda v: np.cumsum(v[::-1])[::-1]  # noqa: E731
+    cnt = rev(np.ones_like(x))
+    sx, sy = rev(x), rev(y)
+    sxx, sxy, syy = rev(x * x), rev(x * y), rev(y * y)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        a = (cnt * sxy - sx * sy) / (cnt * sxx - sx * sx)
+        b = (sy - a * sx) / cnt
+        sse = syy + a * a * sxx + cnt * b * b - 2 * a * sxy - 2 * b * sy + 2 * a * b * sx
+        rms = np.sqrt(np.maximum(sse, 0.0) / cnt)
+    return a, b, rms
+
+
+def detect_range(n, t, min_points=MIN_POINTS, tolerance=DEFAULT_TOLERANCE):
+    """
+    Начало асимптотического диапазона (индекс в отсортированных n):
+    самый длинный хвост из >= min_points точек с остатком <= tolerance,
+    а если такого нет — хвост с наименьшим остатком. None, если точек мало.
+    """
+    if len(n) < min_points:
+        return None
+    _, _, rms = suffix_fits(np.log(n), np.log(t))
+    candidates = np.arange(len(n) - min_points + 1)
+    good = candidates[rms[candidates] <= tolerance]
+    if good.size:
+        return int(good[0])
+    return int(candidates[np.argmin(rms[candidates])])
+
+
+def bootstrap_fits(n, samples, replicas, rng):
+    """
+    Наклоны и сдвиги (в log–log) для replicas бутстрэп-реплик: точки
+    выбираются с возвращением, медиана каждой точки — по выборке повторов
+    с возвращением. Вырожденные реплики (одно n) отбрасываются.
+    """
+    points = len(n)
+    medians = np.empty((replicas, points))
+    for j, s in enumerate(samples):
+        s = np.asarray(s, dtype=float)
+        medians[:, j] = np.median(s[rng.integers(0, s.size, (replicas, s.size))], axis=1)
+
+    pick = rng.integers(0, points, (replicas, points))
+    X = np.log(np.asarray(n, dtype=float))[pick]
+    Y = np.log(np.take_along_axis(medians, pick, axis=1))
+    xc = X - X.mean(axis=1, keepdims=True)
+    sxx = (xc * xc).sum(axis=1)
+    ok = sxx > 0
+    slope = (xc[ok] * (Y[ok] - Y[ok].mean(axis=1, keepdims=True))).sum(axis=1) / sxx[ok]
+    intercept = Y[ok].mean(axis=1) - slope * X[ok].mean(axis=1)
+    return slope, intercept
+
+
+def fit_series(algorithm, dtype, series, predict_sizes=(), replicas=DEFAULT_BOOTSTRAP,
+               min_points=MIN_POINTS, tolerance=DEFAULT_TOLERANCE, seed=0):
+    """
+    Модель T(n) = c · n^a для одного алгоритма; series — {n: запись хранилища}.
+    None, если точек меньше min_points.
+    """
+    n = np.array(sorted(series), dtype=float)
+    t = np.array([series[int(v)]["median_ms"] for v in n])
+    keep = t > 0
+    n, t = n[keep], t[keep]
+    start = detect_range(n, t, min_points, tolerance)
+    if start is None:
+        return None
+
+    n, t = n[start:], t[start:]
+    a, b, rms = suffix_fits(np.log(n), np.log(t))
+    samples = [series[int(v)]["samples"] or [series[int(v)]["median_ms"]] for v in n]
+    slopes, intercepts = bootstrap_fits(n, samples, replicas, np.random.default_rng(seed))
+
+    fit = {
+        "algorithm": algorithm,
+        "dtype": dtype,
+        "n_min": int(n[0]),
+        "n_max": int(n[-1]),
+        "points": len(n),
+        "exponent": float(a[0]),
+        "exponent_low": float(np.percentile(slopes, 2.5)),
+        "exponent_high": float(np.percentile(slopes, 97.5)),
+        "constant_ms": float(math.exp(b[0])),
+        "constant_low_ms": float(np.exp(np.percentile(intercepts, 2.5))),
+        "constant_high_ms": float(np.exp(np.percentile(intercepts, 97.5))),
+        "rms": float(rms[0]),
+        "predictions": {},
+    }
+    for size in predict_sizes:
+        replica_ms = np.exp(intercepts + slopes * math.log(size))
+        fit["predictions"][size] = (
+            predict(fit, size),
+            float(np.percentile(replica_ms, 2.5)),
+            float(np.percentile(replica_ms, 97.5)),
+        )
+    return fit
+
+
+def predict(fit, n):
+    """Время по модели, мс."""
+    return fit["constant_ms"] * n ** fit["exponent"]
+
+
+def fit_store(store, dtype="float64", **kwargs):
+    """Модели для всех алгоритмов хранилища с замерами этого типа."""
+    fits = []
+    for alg in store.algorithms():
+        series = store.series(alg, dtype)
+        fit = fit_series(alg, dtype, series, **kwargs) if series else None
+        if fit is not None:
+            fits.append(fit)
+    return fits
+
+
+# --- Сохранение и чтение ---
+
+
+def save_fits(fits, fit_path=FIT_CSV, predictions_path=PREDICTIONS_CSV):
+    fit_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(fit_path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=FIT_FIELDS, extrasaction="ignore")
+        writer.writeheader()
+        writer.writerows(fits)
+    with open(predictions_path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(PREDICTION_FIELDS)
+        for fit in fits:
+            for size, (ms, low, high) in sorted(fit["predictions"].items()):
+                writer.writerow([fit["algorithm"], fit["dtype"], size, ms, low, high])
+
+
+def load_fits(fit_path=FIT_CSV, predictions_path=PREDICTIONS_CSV):
+    """Модели из CSV (с прогнозами); пустой список, если аппроксимации ещё не было."""
+    if not fit_path.exists():
+        return []
+    with open(fit_path, newline="", encoding="utf-8") as f:
+        fits = [
+            {key: (value if key in ("algorithm", "dtype")
+                   else int(value) if key in ("n_min", "n_max", "points") else float(value))
+             for key, value in row.items()}
+            for row in csv.DictReader(f)
+        ]
+    by_key = {(fit["algorithm"], fit["dtype"]): fit for fit in fits}
+    for fit in fits:
+        fit["predictions"] = {}
+    if predictions_path.exists():
+        with open(predictions_path, newline="", encoding="utf-8") as f:
+            for row in csv.DictReader(f):
+                fit = by_key.get((row["algorithm"], row["dtype"]))
+                if fit is not None:
+                    fit["predictions"][int(row["n"])] = (
+                        float(row["predicted_ms"]), float(row["low_ms"]), float(row["high_ms"])
+                    )
+    return fits
+
+
+def format_ms(ms):
+    """Время для людей: мс, с, мин или ч."""
+    if ms < 1000:
+        return f"{ms:.3g} мс"
+    if ms < 60_000:
+        return f"{ms / 1000:.3g} с"
+    if ms < 3_600_000:
+        return f"{ms / 60_000:.3g} мин"
+    return f"{ms / 3_600_000:.3g} ч"
+
+
+def describe(fit):
+    """Однострочное описание модели: T(n) ≈ c · n^a [ДИ], диапазон n."""
+    return (
+        f"{fit['algorithm']}: T(n) ≈ {fit['constant_ms']:.3g} · n^{fit['exponent']:.3f} мс, "
+        f"95% ДИ показателя [{fit['exponent_low']:.3f}; {fit['exponent_high']:.3f}], "
+        f"n = {fit['n_min']}…{fit['n_max']} ({fit['points']} точек)"
+    )
+
+
+# --- График ---
+
+
+def plot_fits(fits, store, path=FIT_PNG):
+    """Замеры (вне диапазона — бледнее), модели на диапазоне и прогноз с интервалом."""
+    from matplotlib.figure import Figure
+
+    from matplotlib import colormaps
+
+    fig = Figure(figsize=(9, 6))
+    ax = fig.subplots()
+    # Алгоритмов больше десяти — палитра на 20 цветов, чтобы они не повторялись
+    ax.set_prop_cycle(color=colormaps["tab20"].colors)
+    for fit in fits:
+        series = store.series(fit["algorithm"], fit["dtype"])
+        n_all = np.array(sorted(series), dtype=float)
+        t_all = np.array([series[int(v)]["median_ms"] for v in n_all])
+        inside = (n_all >= fit["n_min"]) & (n_all <= fit["n_max"])
+
+        line, = ax.loglog(n_all[inside], t_all[inside], marker="o", linestyle="",
+                          label=f"{fit['algorithm']}: a = {fit['exponent']:.2f}")
+        color = line.get_color()
+        ax.loglog(n_all[~inside], t_all[~inside], marker="o", linestyle="", color=color,
+                  alpha=0.3)
+
+        n_fit = np.geomspace(fit["n_min"], fit["n_max"], 50)
+        ax.loglog(n_fit, predict(fit, n_fit), color=color)
+        if fit["predictions"]:
+            sizes = sorted(fit["predictions"])
+            n_ext = np.array([fit["n_max"]] + sizes, dtype=float)
+            ax.loglog(n_ext, predict(fit, n_ext), color=color, linestyle="--")
+            low = [fit["predictions"][s][1] for s in sizes]
+            high = [fit["predictions"][s][2] for s in sizes]
+            ax.fill_between(sizes, low, high, color=color, alpha=0.15)
+
+    ax.set_xscale("log", base=2)
+    ax.set_xlabel("Размер матрицы n")
+    ax.set_ylabel("Время, мс")
+    ax.set_title("Эмпирическая сложность T(n) ≈ c · n^a (пунктир — прогноз, 95% ДИ)")
+    ax.grid(True, which="both", linestyle="--", linewidth=0.5)
+    ax.legend(fontsize="small", loc="upper left", bbox_to_anchor=(1.02, 1.0))
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fig.savefig(path, bbox_inches="tight")
+    return path
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Аппроксимация показателя сложности по замерам")
+    parser.add_argument("--dtype", default="float64", help="тип элементов (по умолчанию float64)")
+    parser.add_argument("--predict", default=DEFAULT_PREDICT,
+                        help=f"размеры для прогноза (по умолчанию {DEFAULT_PREDICT})")
+    parser.add_argument("--bootstrap", type=int, default=DEFAULT_BOOTSTRAP,
+                        help=f"число бутстрэп-реплик (по умолчанию {DEFAULT_BOOTSTRAP})")
+    parser.add_argument("--min-points", type=int, default=MIN_POINTS,
+                        help=f"минимум точек в диапазоне (по умолчанию {MIN_POINTS})")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE,
+                        help="допустимый остаток в log-координатах (по умолчанию 0.1)")
+    parser.add_argument("--seed", type=int, default=0, help="зерно генератора бутстрэпа")
+    args = parser.parse_args(argv)
+    if args.bootstrap < 1 or args.min_points < 2:
+        parser.error("--bootstrap должен быть >= 1, --min-points >= 2")
+
+    predict_sizes = parse_sizes(args.predict) if args.predict else []
+    with ResultsStore() as store:
+        fits = fit_store(store, args.dtype, predict_sizes=predict_sizes,
+                         replicas=args.bootstrap, min_points=args.min_points,
+                         tolerance=args.tolerance, seed=args.seed)
+        if not fits:
+            print(f"В хранилище {store.path} нет алгоритмов с {args.min_points}+ замерами "
+                  f"типа {args.dtype}.")
+            return
+        save_fits(fits)
+        png = plot_fits(fits, store)
+
+    for fit in fits:
+        print(describe(fit))
+        for size, (ms, low, high) in sorted(fit["predictions"].items()):
+            print(f"    n = {size}: {format_ms(ms)} [{format_ms(low)}; {format_ms(high)}]")
+    print(f"Результат: {FIT_CSV}, {PREDICTIONS_CSV}, {png}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+cpp_kernels.py
+Вызов C++-ядер (multiplyStandard, strassenRec) прямо из Python через ctypes.
+
+Библиотека build/libmatmul.so (build/libmatmul.dylib на macOS) собирается
+из CMakeLists.txt вместе с app и benchmark. Массивы NumPy передаются
+по указателю на данные и оборачиваются в MatrixView без копирования;
+поэтому принимаются только C-contiguous матрицы одного типа из DTYPES
+(float64, float32, int64) — другие массивы нужно привести заранее,
+например через np.ascontiguousarray(A, dtype=np.float64).
+
+Порог Штрассена берётся из профиля автонастройки (tuning_profile.py).
+"""
+
+import ctypes
+import sys
+
+import numpy as np
+
+from tuning_profile import PROJECT_ROOT, profile_int
+
+BUILD_DIR = PROJECT_ROOT / "build"
+LIB_NAME = "libmatmul.dylib" if sys.platform == "darwin" else "libmatmul.so"
+
+# Коды возврата из include/capi.h
+MATMUL_OK = 0
+MATMUL_EBADSIZE = 1
+MATMUL_ENOMEM = 2
+MATMUL_EINTERNAL = 3
+
+# Типы элементов, для которых собраны ядра: dtype -> суффикс функций C API
+DTYPES = {
+    np.dtype(np.float64): "",
+    np.dtype(np.float32): "_f32",
+    np.dtype(np.int64): "_i64",
+}
+
+_lib = None
+
+
+def load_library(path=None):
+    """Загружает библиотеку (один раз) и настраивает сигнатуры функций."""
+    global _lib
+    if _lib is not None and path is None:
+        return _lib
+
+    lib = ctypes.CDLL(str(path or BUILD_DIR / LIB_NAME))
+    for dtype, suffix in DTYPES.items():
+        matrix = np.ctypeslib.ndpointer(dtype=dtype, ndim=2, flags="C_CONTIGUOUS")
+        for name in ("matmul_standard", "matmul_strassen"):
+            func = getattr(lib, name + suffix)
+            func.argtypes = [matrix, matrix, matrix, ctypes.c_int, ctypes.c_int, ctypes.c_int]
+            func.restype = ctypes.c_int
+    lib.matmul_set_strassen_cutoff.argtypes = [ctypes.c_int]
+    lib.matmul_set_strassen_cutoff.restype = ctypes.c_int
+    lib.matmul_get_strassen_cutoff.argtypes = []
+    lib.matmul_get_strassen_cutoff.restype = ctypes.c_int
+
+    cutoff = profile_int("cpp_strassen_cutoff")
+    if cutoff is not None:
+        lib.matmul_set_strassen_cutoff(cutoff)
+
+    _lib = lib
+    return lib
+
+
+def available() -> bool:
+    """True, если библиотека собрана и загружается."""
+    try:
+        load_library()
+    except OSError:
+        return False
+    return True
+
+
+def _check(A, B, out):
+    for name, M in (("A", A), ("B", B)):
+        if not isinstance(M, np.ndarray) or M.dtype not in DTYPES \
+                or not M.flags.c_contiguous:
+            raise TypeError(f"{name}: нужна C-contiguous матрица float64, float32 или int64 "
+                            "(без копирования)")
+    if A.dtype != B.dtype:
+        raise TypeError(f"разные типы элементов: {A.dtype} и {B.dtype}")
+    dtype = A.dtype
+    if A.ndim != 2 or B.ndim != 2 or A.shape[1] != B.shape[0] or 0 in A.shape + B.shape:
+        raise ValueError(f"несогласованные размеры матриц: {A.shape} и {B.shape}")
+
+    shape = (A.shape[0], B.shape[1])
+    if out is None:
+        out = np.empty(shape, dtype=dtype)
+    elif out.shape != shape or out.dtype != dtype or not out.flags.c_contiguous \
+            or not out.flags.writeable:
+        raise TypeError(f"out: нужна записываемая C-contiguous матрица {dtype} {shape}")
+    return out
+
+
+def _call(name, A, B, out):
+    out = _check(A, B, out)
+    func = getattr(load_library(), name + DTYPES[A.dtype])
+    m, k = A.shape
+    n = B.shape[1]
+    code = func(A, B, out, m, k, n)
+    if code == MATMUL_EBADSIZE:
+        raise ValueError(f"недопустимые размеры матриц: {A.shape} и {B.shape}")
+    if code == MATMUL_ENOMEM:
+        raise MemoryError(f"C++-ядру {name} не хватило памяти для {A.shape} x {B.shape}")
+    if code == MATMUL_EINTERNAL:
+        raise RuntimeError(f"внутренняя ошибка C++-ядра {name} (исключение C++)")
+    if code != MATMUL_OK:
+        raise RuntimeError(f"ошибка C++-ядра, код {code}")
+    return out
+
+
+def multiply_standard(A, B, out=None):
+    """C = A @ B стандартным алгоритмом C++ (multiplyStandard)."""
+    return _call("matmul_standard", A, B, out)
+
+
+def strassen(A, B, out=None):
+    """
+    C = A @ B алгоритмом Штрассена C++ (strassenRec на непрерывных матрицах).
+    A — m x k, B — k x n, размеры любые; тип элементов — любой из DTYPES.
+    """
+    return _call("matmul_strassen", A, B, out)
+
+
+def set_strassen_cutoff(cutoff: int):
+    if load_library().matmul_set_strassen_cutoff(cutoff) != MATMUL_OK:
+        raise ValueError("порог Штрассена должен быть >= 1")
+
+
+def get_strassen_cutoff() -> int:
+    return load_library().matmul_get_strassen_cutoff()
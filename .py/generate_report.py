@@ -3,10 +3,15 @@
 generate_report.py
 Создаёт краткий Markdown-отчёт по анализу алгоритмов умножения матриц
 в файле ../data/report.md (относительно папки .py).
+
+Если есть результаты .py/complexity_fit.py, в отчёт добавляется таблица
+эмпирических показателей сложности и прогноз времени для больших n.
 """
 
 from pathlib import Path
 
+from complexity_fit import format_ms, load_fits
+
 # Папка .py
 PY_DIR = Path(__file__).resolve().parent
 # Корень проекта (папка уровнем выше)
@@ -16,6 +21,56 @@ DATA_DIR = PROJECT_ROOT / "data"
 REPORT_PATH = DATA_DIR / "report.md"
 
 
+def build_fit_section(fits):
+    """Раздел отчёта с моделями T(n) ≈ c · n^a; пустая строка, если моделей нет."""
+    if not fits:
+        return ""
+
+    lines = [
+        "### 3.1. Эмпирические показатели сложности",
+        "",
+        "Показатель a и константа c в модели T(n) ≈ c · n^a получены методом наименьших "
+        "квадратов в координатах log–log (`.py/complexity_fit.py`). Для каждого алгоритма "
+        "берётся асимптотический диапазон: самый длинный хвост по n, на котором точки "
+        "ложатся на прямую. 95% доверительные интервалы показаны в скобках, их дал бутстрэп "
+        "по точкам и повторам замеров.",
+        "",
+        "| Алгоритм | dtype | Диапазон n | a | 95% ДИ a | c, мс |",
+        "|---|---|---|---|---|---|",
+    ]
+    for fit in fits:
+        lines.append(
+            f"| {fit['algorithm']} | {fit['dtype']} | {fit['n_min']}…{fit['n_max']} "
+            f"| {fit['exponent']:.3f} | [{fit['exponent_low']:.3f}; {fit['exponent_high']:.3f}] "
+            f"| {fit['constant_ms']:.3g} |"
+        )
+
+    sizes = sorted({size for fit in fits for size in fit["predictions"]})
+    if sizes:
+        lines += [
+            "",
+            "Прогноз времени по моделям для незамеренных размеров (в скобках — 95% ДИ):",
+            "",
+            "| Алгоритм | dtype | " + " | ".join(f"n = {size}" for size in sizes) + " |",
+            "|---|---|" + "---|" * len(sizes),
+        ]
+        for fit in fits:
+            cells = []
+            for size in sizes:
+                if size in fit["predictions"]:
+                    ms, low, high = fit["predictions"][size]
+                    cells.append(f"{format_ms(ms)} [{format_ms(low)}; {format_ms(high)}]")
+                else:
+                    cells.append("")
+            lines.append(f"| {fit['algorithm']} | {fit['dtype']} | " + " | ".join(cells) + " |")
+
+    lines += [
+        "",
+        "График с замерами, моделями и прогнозом: `data/png/complexity_fit.png`.",
+    ]
+    return "\n".join(lines) + "\n"
+
+
 def main():
     DATA_DIR.mkdir(parents=True, exist_ok=True)
 
@@ -69,7 +124,9 @@ T(n) = O(n^{log2 7}) ≈ O(n^{2.807}).
 Результаты сохранены в файлах:
 
 - `data/csv/timings.csv` — стандартный алгоритм C++ и алгоритм Штрассена;
-- `data/csv/timings_numpy.csv` — умножение матриц в NumPy.
+- `data/csv/timings_numpy.csv` — умножение матриц в NumPy (`A @ B` и Штрассен на NumPy из `.py/strassen_numpy.py`);
+- `data/csv/throughput.csv` — GFLOP/s, ГБ/с и интенсивность каждого замера по модели работы из `.py/roofline.py`;
+- `data/csv/complexity_fit.csv` и `data/csv/complexity_predictions.csv` — эмпирические показатели сложности и прогноз времени (`.py/complexity_fit.py`).
 
 На основе этих данных построены графики:
 
@@ -77,10 +134,13 @@ T(n) = O(n^{log2 7}) ≈ O(n^{2.807}).
 - `data/png/timings_strassen.png` — время работы алгоритма Штрассена;
 - `data/png/timings_numpy.png` — время работы NumPy;
 - `data/png/timings_all.png` — сравнение всех трёх алгоритмов (линейный масштаб);
-- `data/png/timings_all_loglog.png` — сравнение всех трёх алгоритмов в логарифмическом масштабе.
+- `data/png/timings_all_loglog.png` — сравнение всех трёх алгоритмов в логарифмическом масштабе;
+- `data/png/gflops.png` — производительность в GFLOP/s (фактическое число операций, для Штрассена — меньше 2n^3);
+- `data/png/roofline.png` — положение алгоритмов относительно пиков машины (умножение на BLAS и тест памяти в духе STREAM);
+- `data/png/complexity_fit.png` — замеры, аппроксимация T(n) ≈ c · n^a и прогноз для больших n.
 
 На графике `timings_all_loglog.png` видно, что кривые для стандартного алгоритма и алгоритма Штрассена растут в соответствии с теоретическими оценками O(n^3) и O(n^{log2 7}).
-Асимптотические оценки получены из анализа алгоритмов, а экспериментальные данные подтверждают характер их роста.
+Асимптотические оценки получены из анализа алгоритмов. Насколько замеры им соответствуют, показывает аппроксимация показателя степени (раздел 3.1).
 
 Дополнительно построены теоретические графики:
 
@@ -107,6 +167,10 @@ T(n) = O(n^{log2 7}) ≈ O(n^{2.807}).
 
 """
 
+    fit_section = build_fit_section(load_fits())
+    if fit_section:
+        report_md = report_md.replace("\n---\n\n## 4.", "\n" + fit_section + "\n---\n\n## 4.", 1)
+
     REPORT_PATH.write_text(report_md, encoding="utf-8")
     print(f"Отчёт сгенерирован: {REPORT_PATH}")
 
@@ -0,0 +1,442 @@
+#!/usr/bin/env python3
+"""
+matmul_server.py
+Локальный asyncio-сервер умножения матриц и генератор нагрузки к нему.
+
+Сервер слушает localhost по TCP (--port) или Unix-сокет (--unix) и
+принимает запросы «умножь A на B». Одновременные запросы одинаковой формы
+объединяются в один пакетный вызов np.matmul (batched.matmul_batched):
+маленькие произведения по одному тратят время на накладные расходы
+вызова, а пакетом — на арифметику. BLAS считает в пуле потоков,
+цикл событий при этом свободен и принимает новые запросы.
+
+Противодавление: запросы ждут в ограниченной очереди (--queue-size),
+в работе одновременно не больше --workers пакетов. Пока пул занят,
+очередь копится (следующий пакет будет крупнее); когда она заполнена,
+сервер перестаёт читать сокеты и клиенты ждут на отправке.
+
+Протокол (little-endian): запрос — заголовок "MMUL", тип (0 — float64,
+1 — float32), m, k, n (uint32), затем байты A (m x k) и B (k x n) по строкам.
+Ответ — статус (0 — успех), rows, cols, длина данных, затем байты C
+или текст ошибки в UTF-8.
+
+  python3 .py/matmul_server.py serve --port 8765
+  python3 .py/matmul_server.py bench --sizes 32 --concurrency 1:64
+
+bench поднимает сервер в том же процессе (или подключается к --connect)
+и для каждой степени параллелизма замеряет задержку p50/p99 и пропускную
+способность — с объединением запросов и без него (--max-batch 1).
+Результат: data/csv/server_load.csv и data/png/server_load.png
+"""
+
+import argparse
+import asyncio
+import csv
+import struct
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from batched import matmul_batched
+from bench_stats import parse_sizes
+from tuning_profile import PROJECT_ROOT
+
+DATA_DIR = PROJECT_ROOT / "data"
+LOAD_CSV = DATA_DIR / "csv" / "server_load.csv"
+LOAD_PNG = DATA_DIR / "png" / "server_load.png"
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+DEFAULT_MAX_BATCH = 64
+DEFAULT_QUEUE_SIZE = 256
+DEFAULT_WORKERS = 2
+MAX_ELEMENTS = 1 << 24  # на операнд и на результат: 128 МБ в float64
+
+MAGIC = b"MMUL"
+REQUEST = struct.Struct("<4sBIII")   # magic, тип, m, k, n
+RESPONSE = struct.Struct("<BIIQ")    # статус, rows, cols, длина данных
+DTYPES = {0: np.dtype(np.float64), 1: np.dtype(np.float32)}
+DTYPE_CODES = {dtype: code for code, dtype in DTYPES.items()}
+
+LOAD_FIELDS = ["mode", "n", "concurrency", "requests", "p50_ms", "p99_ms",
+               "throughput_rps", "mean_batch"]
+
+
+class ProtocolError(ValueError):
+    """Некорректный запрос: отвечаем ошибкой и закрываем соединение."""
+
+
+# --- Протокол ---
+
+
+def encode_request(A, B) -> bytes:
+    A = np.ascontiguousarray(A)
+    B = np.ascontiguousarray(B, dtype=A.dtype)
+    if A.dtype not in DTYPE_CODES:
+        raise TypeError(f"поддерживаются float64 и float32, получено {A.dtype}")
+    m, k = A.shape
+    n = B.shape[1]
+    return REQUEST.pack(MAGIC, DTYPE_CODES[A.dtype], m, k, n) + A.tobytes() + B.tobytes()
+
+
+async def read_request(reader):
+    """(A, B) из потока; None — клиент закрыл соединение."""
+    try:
+        header = await reader.readexactly(REQUEST.size)
+    except asyncio.IncompleteReadError:
+        return None
+    magic, code, m, k, n = REQUEST.unpack(header)
+    if magic != MAGIC or code not in DTYPES:
+        raise ProtocolError("неизвестный формат запроса")
+    if min(m, k, n) == 0 or max(m * k, k * n, m * n) > MAX_ELEMENTS:
+        raise ProtocolError(f"недопустимые размеры {m} x {k} на {k} x {n}")
+    dtype = DTYPES[code]
+    A = np.frombuffer(await reader.readexactly(m * k * dtype.itemsize), dtype).reshape(m, k)
+    B = np.frombuffer(await reader.readexactly(k * n * dtype.itemsize), dtype).reshape(k, n)
+    return A, B
+
+
+def encode_response(C=None, error=None) -> bytes:
+    if error is not None:
+        message = error.encode("utf-8")
+        return RESPONSE.pack(1, 0, 0, len(message)) + message
+    C = np.ascontiguousarray(C)
+    return RESPONSE.pack(0, C.shape[0], C.shape[1], C.nbytes) + C.tobytes()
+
+
+async def read_response(reader, dtype):
+    status, rows, cols, size = RESPONSE.unpack(await reader.readexactly(RESPONSE.size))
+    payload = await reader.readexactly(size)
+    if status != 0:
+        raise RuntimeError(f"сервер: {payload.decode('utf-8')}")
+    return np.frombuffer(payload, dtype).reshape(rows, cols)
+
+
+# --- Сервер ---
+
+
+class MatmulServer:
+    """Очередь запросов, объединение одинаковых по форме и пул потоков для BLAS."""
+
+    def __init__(self, max_batch=DEFAULT_MAX_BATCH, queue_size=DEFAULT_QUEUE_SIZE,
+                 workers=DEFAULT_WORKERS, window_ms=0.0):
+        self.max_batch = max_batch
+        self.queue_size = queue_size
+        self.workers = workers
+        self.window_ms = window_ms
+        self.requests = 0
+        self.batches = 0
+        self.largest_batch = 0
+        self._server = None
+
+    async def start(self, host=DEFAULT_HOST, port=DEFAULT_PORT, unix=None):
+        """Запускает приём соединений; возвращает адрес (host, port) или путь сокета."""
+        self._queue = asyncio.Queue(maxsize=self.queue_size)
+        self._slots = asyncio.Semaphore(self.workers)
+        self._pool = ThreadPoolExecutor(max_workers=self.workers,
+                                        thread_name_prefix="matmul")
+        self._dispatcher = asyncio.create_task(self._dispatch())
+        if unix is not None:
+            self._server = await asyncio.start_unix_server(self._handle, path=unix)
+            return unix
+        self._server = await asyncio.start_server(self._handle, host, port)
+        return self._server.sockets[0].getsockname()[:2]
+
+    async def close(self):
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        self._dispatcher.cancel()
+        self._pool.shutdown(wait=True)
+
+    async def serve_forever(self):
+        await self._server.serve_forever()
+
+    def stats(self) -> dict:
+        return {
+            "requests": self.requests, "batches": self.batches,
+            "mean_batch": self.requests / self.batches if self.batches else 0.0,
+            "largest_batch": self.largest_batch, "queued": self._queue.qsize(),
+        }
+
+    async def submit(self, A, B):
+        """Ставит запрос в очередь (ждёт, если она полна) и возвращает C = A * B."""
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((A, B, future))
+        return await future
+
+    async def _handle(self, reader, writer):
+        try:
+            while True:
+                try:
+                    request = await read_request(reader)
+                except ProtocolError as e:
+                    writer.write(encode_response(error=str(e)))
+                    break
+                if request is None:
+                    break
+                try:
+                    C = await self.submit(*request)
+                except Exception as e:  # сбой ядра (например, нехватка памяти) — ответ клиенту
+                    writer.write(encode_response(error=f"{type(e).__name__}: {e}"))
+                else:
+                    writer.write(encode_response(C))
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    async def _collect(self):
+        """Первый запрос из очереди и всё, что успело накопиться (или пришло за окно)."""
+        batch = [await self._queue.get()]
+        deadline = asyncio.get_running_loop().time() + self.window_ms / 1000.0
+        while len(batch) < self.max_batch:
+            if not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+                continue
+            remaining = deadline - asyncio.get_running_loop().time()
+            if remaining <= 0:
+                break
+            try:
+                async with asyncio.timeout(remaining):
+                    batch.append(await self._queue.get())
+            except TimeoutError:
+                break
+        return batch
+
+    async def _dispatch(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            # Слот берётся до сбора пакета: пока все потоки заняты,
+            # запросы копятся в очереди и следующий пакет выйдет крупнее
+            await self._slots.acquire()
+            batch = await self._collect()
+            groups = {}
+            for A, B, future in batch:
+                groups.setdefault((A.shape, B.shape, A.dtype), []).append((A, B, future))
+            for i, group in enumerate(groups.values()):
+                if i > 0:
+                    await self._slots.acquire()
+                self.requests += len(group)
+                self.batches += 1
+                self.largest_batch = max(self.largest_batch, len(group))
+                task = loop.run_in_executor(self._pool, _multiply_group,
+                                            [(A, B) for A, B, _ in group])
+                task.add_done_callback(
+                    lambda done, group=group: self._deliver(done, group))
+
+    def _deliver(self, done, group):
+        self._slots.release()
+        futures = [future for _, _, future in group]
+        error = asyncio.CancelledError() if done.cancelled() else done.exception()
+        for i, future in enumerate(futures):
+            if future.done():
+                continue
+            if error is not None:
+                future.set_exception(error)
+            else:
+                future.set_result(done.result()[i])
+
+
+def _multiply_group(pairs):
+    """Произведения одной формы: один запрос — A @ B, несколько — одним np.matmul."""
+    if len(pairs) == 1:
+        A, B = pairs[0]
+        return [A @ B]
+    C = matmul_batched(np.stack([A for A, _ in pairs]), np.stack([B for _, B in pairs]))
+    return list(C)
+
+
+# --- Клиент и генератор нагрузки ---
+
+
+async def connect(address):
+    """Соединение с сервером: address — (host, port) или путь Unix-сокета."""
+    if isinstance(address, str):
+        return await asyncio.open_unix_connection(address)
+    return await asyncio.open_connection(*address)
+
+
+async def multiply_remote(reader, writer, A, B):
+    writer.write(encode_request(A, B))
+    await writer.drain()
+    return await read_response(reader, np.asarray(A).dtype)
+
+
+async def _client(address, A, B, count, latencies):
+    reader, writer = await connect(address)
+    try:
+        await multiply_remote(reader, writer, A, B)  # прогрев соединения
+        for _ in range(count):
+            start = time.perf_counter()
+            await multiply_remote(reader, writer, A, B)
+            latencies.append((time.perf_counter() - start) * 1000.0)
+    finally:
+        writer.close()
+        await writer.wait_closed()
+
+
+async def run_load(address, n, concurrency, requests_per_client, dtype=np.float64):
+    """concurrency клиентов, каждый шлёт requests_per_client запросов подряд."""
+    rng = np.random.default_rng(0)
+    A = rng.random((n, n)).astype(dtype)
+    B = rng.random((n, n)).astype(dtype)
+    latencies = []
+    start = time.perf_counter()
+    await asyncio.gather(*(_client(address, A, B, requests_per_client, latencies)
+                           for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    return {
+        "requests": len(latencies),
+        "p50_ms": float(np.percentile(latencies, 50)),
+        "p99_ms": float(np.percentile(latencies, 99)),
+        "throughput_rps": len(latencies) / elapsed,
+    }
+
+
+async def sweep(sizes, levels, requests_per_client, modes, connect_to=None, workers=DEFAULT_WORKERS):
+    """Строки таблицы нагрузки: для каждого режима, n и степени параллелизма."""
+    rows = []
+    for mode, max_batch in modes.items():
+        server = None
+        address = connect_to
+        if address is None:
+            server = MatmulServer(max_batch=max_batch, workers=workers)
+            address = await server.start(port=0)
+        try:
+            for n in sizes:
+                print(f"{mode}, n = {n}")
+                for concurrency in levels:
+                    before = server.stats() if server else None
+                    row = await run_load(address, n, concurrency, requests_per_client)
+                    mean_batch = float("nan")
+                    if server:
+                        after = server.stats()
+                        batches = after["batches"] - before["batches"]
+                        mean_batch = (after["requests"] - before["requests"]) / max(batches, 1)
+                    row = {"mode": mode, "n": n, "concurrency": concurrency,
+                           **row, "mean_batch": mean_batch}
+                    rows.append(row)
+                    print(f"  клиентов {concurrency:4d}: p50 {row['p50_ms']:8.3f} ms, "
+                          f"p99 {row['p99_ms']:8.3f} ms, {row['throughput_rps']:9.0f} запр./с, "
+                          f"пакет {mean_batch:5.1f}")
+        finally:
+            if server:
+                await server.close()
+    return rows
+
+
+def save_load(rows, path=LOAD_CSV):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=LOAD_FIELDS)
+        writer.writeheader()
+        writer.writerows(rows)
+    return path
+
+
+def plot_load(rows, path=LOAD_PNG):
+    """Слева — задержка p50 и p99, справа — пропускная способность от числа клиентов."""
+    from matplotlib.figure import Figure
+
+    fig = Figure(figsize=(13, 5))
+    ax_latency, ax_rate = fig.subplots(1, 2)
+    series = {}
+    for r in rows:
+        series.setdefault((r["mode"], r["n"]), []).append(r)
+
+    for i, ((mode, n), points) in enumerate(sorted(series.items())):
+        points.sort(key=lambda r: r["concurrency"])
+        clients = [r["concurrency"] for r in points]
+        label = f"{mode}, n = {n}"
+        ax_latency.plot(clients, [r["p50_ms"] for r in points], "-", marker="o",
+                        markersize=3, color=f"C{i}", label=f"{label}: p50")
+        ax_latency.plot(clients, [r["p99_ms"] for r in points], ":", marker="^",
+                        markersize=3, color=f"C{i}", label=f"{label}: p99")
+        ax_rate.plot(clients, [r["throughput_rps"] for r in points], "-", marker="o",
+                     markersize=3, color=f"C{i}", label=label)
+
+    for ax in (ax_latency, ax_rate):
+        ax.set_xscale("log", base=2)
+        ax.set_xlabel("Число одновременных клиентов")
+        ax.grid(True, which="both", linestyle="--", linewidth=0.5)
+        ax.legend(fontsize="small")
+    ax_latency.set_yscale("log")
+    ax_latency.set_ylabel("Задержка, мс")
+    ax_latency.set_title("Задержка запроса")
+    ax_rate.set_ylabel("Запросов в секунду")
+    ax_rate.set_title("Пропускная способность")
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fig.savefig(path, bbox_inches="tight")
+    return path
+
+
+def _parse_address(text):
+    """host:port или путь Unix-сокета."""
+    host, sep, port = text.rpartition(":")
+    if sep and port.isdigit():
+        return host or DEFAULT_HOST, int(port)
+    return text
+
+
+async def _serve(args):
+    server = MatmulServer(args.max_batch, args.queue_size, args.workers, args.window_ms)
+    address = await server.start(args.host, args.port, args.unix)
+    print(f"Сервер слушает {address} (пакет до {args.max_batch}, очередь {args.queue_size}, "
+          f"потоков {args.workers}). Остановка — Ctrl+C")
+    try:
+        await server.serve_forever()
+    finally:
+        print(f"Статистика: {server.stats()}")
+        await server.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Сервер умножения матриц и замер нагрузки")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    serve = sub.add_parser("serve", help="запустить сервер")
+    serve.add_argument("--host", default=DEFAULT_HOST)
+    serve.add_argument("--port", type=int, default=DEFAULT_PORT)
+    serve.add_argument("--unix", help="путь Unix-сокета (вместо TCP)")
+    serve.add_argument("--max-batch", type=int, default=DEFAULT_MAX_BATCH,
+                       help="наибольший пакет (1 — без объединения)")
+    serve.add_argument("--queue-size", type=int, default=DEFAULT_QUEUE_SIZE,
+                       help="длина очереди запросов")
+    serve.add_argument("--workers", type=int, default=DEFAULT_WORKERS,
+                       help="потоков для BLAS")
+    serve.add_argument("--window-ms", type=float, default=0.0,
+                       help="сколько ждать попутных запросов, мс (0 — брать только накопившиеся)")
+
+    bench = sub.add_parser("bench", help="замер задержки и пропускной способности")
+    bench.add_argument("--sizes", default="16,64", help="размеры матриц n")
+    bench.add_argument("--concurrency", default="1:64", help="числа одновременных клиентов")
+    bench.add_argument("--requests", type=int, default=50, help="запросов на клиента")
+    bench.add_argument("--workers", type=int, default=DEFAULT_WORKERS,
+                       help="потоков для BLAS у встроенного сервера")
+    bench.add_argument("--connect", help="адрес работающего сервера: host:port или путь сокета")
+    args = parser.parse_args(argv)
+
+    if args.command == "serve":
+        try:
+            asyncio.run(_serve(args))
+        except KeyboardInterrupt:
+            pass
+        return
+
+    if args.connect:
+        modes = {"external": None}
+        connect_to = _parse_address(args.connect)
+    else:
+        modes = {"coalesced": DEFAULT_MAX_BATCH, "single": 1}
+        connect_to = None
+    rows = asyncio.run(sweep(parse_sizes(args.sizes), parse_sizes(args.concurrency),
+                             args.requests, modes, connect_to, args.workers))
+    print(f"Таблица: {save_load(rows)}, график: {plot_load(rows)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,19 @@
 import numpy as np
 import time
 
+from result_cache import ResultCache
+
+# Общий кэш результатов процесса: повторное умножение тех же A и B
+# не пересчитывается (result_cache.py)
+CACHE = ResultCache()
+
+
+def multiply(A, B):
+    return A @ B     # или np.dot(A, B), np.matmul(A, B)
+
+
+multiply_cached = CACHE.wrap(multiply, "numpy")
+
 
 def print_matrix(m, name):
     print(f"{name}:")
@@ -23,12 +36,20 @@ def main():
     print_matrix(B, "B (NumPy)")
 
     start = time.perf_counter()
-    C = np.dot(A, B)     # или: C = A @ B, или np.matmul(A, B)
+    C = multiply_cached(A, B)
     end = time.perf_counter()
 
     print_matrix(C, "C = A * B (NumPy)")
     print(f"Время умножения (NumPy): {end - start:.6f} с")
 
+    # Те же операнды ещё раз: результат берётся из кэша по хешу A и B
+    start = time.perf_counter()
+    multiply_cached(A, B)
+    end = time.perf_counter()
+    stats = CACHE.stats()
+    print(f"Повторное умножение (из кэша): {end - start:.6f} с, "
+          f"попаданий {stats['hits']}, промахов {stats['misses']}")
+
 
 if __name__ == "__main__":
     main()
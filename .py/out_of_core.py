@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+"""
+out_of_core.py
+Блочное умножение матриц, которые не помещаются в память.
+
+A, B и C хранятся в .npy-файлах и открываются через np.memmap
+(np.load(..., mmap_mode="r") и np.lib.format.open_memmap).
+В память одновременно читаются только плитки (tiles) A и B размером
+tile x tile, а C записывается в файл плитка за плиткой.
+Размер плитки выбирается по бюджету памяти: одновременно живут
+четыре буфера tile x tile (плитка A, плитка B, произведение и накопитель).
+
+Запуск как скрипт — пропускная способность в зависимости от размера плитки:
+  python3 .py/out_of_core.py --n 4096 --tiles 256,512,1024
+Результат: data/csv/out_of_core.csv
+"""
+
+import argparse
+import csv
+import math
+import os
+
+import numpy as np
+
+from bench_stats import measure
+
+DATA_DIR = "data"
+CSV_DIR = os.path.join(DATA_DIR, "csv")
+WORK_DIR = os.path.join(DATA_DIR, "ooc")
+
+# Бюджет памяти по умолчанию — 256 МБ
+DEFAULT_MEMORY_BUDGET = 256 * 1024 * 1024
+
+# Сколько буферов tile x tile живёт одновременно
+BUFFERS_PER_TILE = 4
+
+
+def tile_for_budget(memory_budget: int, itemsize: int) -> int:
+    """Наибольший размер плитки, при котором буферы укладываются в бюджет."""
+    tile = int(math.isqrt(memory_budget // (BUFFERS_PER_TILE * itemsize)))
+    if tile < 1:
+        raise ValueError(f"бюджет памяти {memory_budget} байт слишком мал")
+    return tile
+
+
+def multiply_out_of_core(a_path, b_path, c_path, memory_budget=DEFAULT_MEMORY_BUDGET,
+                         tile=None):
+    """
+    C = A @ B для матриц в .npy-файлах, результат пишется в c_path.
+    Матрицы могут быть прямоугольными: (m x k) @ (k x n).
+    tile — размер плитки; если не задан, выбирается по memory_budget.
+    Возвращает размер плитки, который был использован.
+    """
+    A = np.load(a_path, mmap_mode="r")
+    B = np.load(b_path, mmap_mode="r")
+    if A.ndim != 2 or B.ndim != 2 or A.shape[1] != B.shape[0]:
+        raise ValueError(f"несогласованные размеры: {A.shape} и {B.shape}")
+
+    m, k = A.shape
+    n = B.shape[1]
+    dtype = np.result_type(A.dtype, B.dtype)
+    if tile is None:
+        tile = tile_for_budget(memory_budget, dtype.itemsize)
+    tile = max(1, min(tile, max(m, k, n)))
+
+    C = np.lib.format.open_memmap(c_path, mode="w+", dtype=dtype, shape=(m, n))
+
+    # Буферы выделяются один раз и переиспользуются для всех плиток
+    a_buf = np.empty((tile, tile), dtype=dtype)
+    b_buf = np.empty((tile, tile), dtype=dtype)
+    prod = np.empty((tile, tile), dtype=dtype)
+    acc = np.empty((tile, tile), dtype=dtype)
+
+    for i0 in range(0, m, tile):
+        i1 = min(i0 + tile, m)
+        for j0 in range(0, n, tile):
+            j1 = min(j0 + tile, n)
+            c_tile = acc[:i1 - i0, :j1 - j0]
+            c_tile.fill(0)
+
+            for k0 in range(0, k, tile):
+                k1 = min(k0 + tile, k)
+                a_tile = a_buf[:i1 - i0, :k1 - k0]
+                b_tile = b_buf[:k1 - k0, :j1 - j0]
+                p_tile = prod[:i1 - i0, :j1 - j0]
+
+                # Чтение плиток с диска (через page cache) в буферы
+                np.copyto(a_tile, A[i0:i1, k0:k1])
+                np.copyto(b_tile, B[k0:k1, j0:j1])
+                np.matmul(a_tile, b_tile, out=p_tile)
+                c_tile += p_tile
+
+            C[i0:i1, j0:j1] = c_tile
+
+    C.flush()
+    del C
+    return tile
+
+
+def create_random_npy(path, n, chunk_rows=1024, seed=None):
+    """Случайная матрица n x n в .npy, заполняется по chunk_rows строк за раз."""
+    rng = np.random.default_rng(seed)
+    M = np.lib.format.open_memmap(path, mode="w+", dtype=np.float64, shape=(n, n))
+    for r0 in range(0, n, chunk_rows):
+        r1 = min(r0 + chunk_rows, n)
+        M[r0:r1] = rng.random((r1 - r0, n))
+    M.flush()
+    del M
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Пропускная способность out-of-core умножения")
+    parser.add_argument("--n", type=int, default=4096, help="размер матриц n x n")
+    parser.add_argument("--tiles", default="256,512,1024",
+                        help="список размеров плитки через запятую")
+    parser.add_argument("--memory-mb", type=float, default=None,
+                        help="вместо --tiles: одна плитка, подобранная под бюджет памяти (МБ)")
+    parser.add_argument("--workdir", default=WORK_DIR, help="папка для .npy-файлов")
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--check", action="store_true",
+                        help="сверить результат с A @ B (только если A, B помещаются в память)")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    os.makedirs(CSV_DIR, exist_ok=True)
+    os.makedirs(args.workdir, exist_ok=True)
+
+    n = args.n
+    a_path = os.path.join(args.workdir, "A.npy")
+    b_path = os.path.join(args.workdir, "B.npy")
+    c_path = os.path.join(args.workdir, "C.npy")
+
+    print(f"Создаю A и B ({n} x {n}) в {args.workdir} ...")
+    create_random_npy(a_path, n, seed=1)
+    create_random_npy(b_path, n, seed=2)
+
+    itemsize = np.dtype(np.float64).itemsize
+    out_filename = os.path.join(CSV_DIR, "out_of_core.csv")
+    with open(out_filename, "w", newline="") as f:
+        writer = csv.DictWriter(
+            f, fieldnames=["n", "tile", "memory_mb", "ms", "gflops", "io_mb_per_s"]
+        )
+        writer.writeheader()
+
+        if args.memory_mb is not None:
+            tiles = [tile_for_budget(int(args.memory_mb * 2 ** 20), itemsize)]
+        else:
+            tiles = [int(x) for x in args.tiles.split(",") if x]
+
+        for tile in tiles:
+            tile = min(tile, n)
+            stats, _ = measure(
+                lambda: multiply_out_of_core(a_path, b_path, c_path, tile=tile),
+                repeats=args.repeats,
+                warmup=0,
+                min_time_ms=0.0,
+            )
+            seconds = stats["median"] / 1000.0
+            tiles_per_side = math.ceil(n / tile)
+            # A и B читаются tiles_per_side раз, C записывается один раз
+            io_bytes = itemsize * n * n * (2 * tiles_per_side + 1)
+            gflops = 2.0 * n ** 3 / seconds / 1e9
+            memory_mb = BUFFERS_PER_TILE * tile * tile * itemsize / 2 ** 20
+
+            writer.writerow({
+                "n": n,
+                "tile": tile,
+                "memory_mb": memory_mb,
+                "ms": stats["median"],
+                "gflops": gflops,
+                "io_mb_per_s": io_bytes / seconds / 2 ** 20,
+            })
+            f.flush()
+            print(f"  tile = {tile}: {stats['median']:.1f} ms, {gflops:.2f} GFLOP/s, "
+                  f"буферы {memory_mb:.1f} МБ")
+
+    if args.check:
+        C = np.load(c_path)
+        ok = np.allclose(C, np.load(a_path) @ np.load(b_path))
+        print("Проверка с A @ B:", "совпадает" if ok else "НЕ совпадает")
+
+    print(f"Готово. Данные записаны в {out_filename}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,468 @@
+#!/usr/bin/env python3
+"""
+pipeline.py
+Единая точка входа для всего конвейера ЛР: сборка, замеры, графики, отчёт.
+
+Этапы описаны как граф зависимостей (DAG). У каждого этапа есть
+входы и выходы (файлы); этап пропускается, если все его выходы
+существуют и новее всех входов. Независимые этапы (графики и отчёт)
+выполняются одновременно, а замеры — строго по одному, чтобы
+не мешать друг другу и не искажать время.
+
+Python-этапы не запускают новый интерпретатор на каждый скрипт:
+  - лёгкие этапы (отчёт, выгрузка CSV, бенчмарк NumPy) идут в потоках
+    этого процесса;
+  - plot_timings.py сам рисует графики в пуле процессов (объектный API
+    matplotlib), поэтому тоже идёт в потоке;
+  - остальные графики (pyplot не потокобезопасен) идут в пуле процессов,
+    которые порождаются через forkserver — matplotlib и модули графиков
+    импортируются в нём один раз и достаются рабочим процессам готовыми.
+
+Примеры:
+  python3 .py/pipeline.py                  — весь конвейер (кроме интерактивного app)
+  python3 .py/pipeline.py plots            — только то, что нужно для графиков
+  python3 .py/pipeline.py --force report   — пересобрать этап, даже если он актуален
+  python3 .py/pipeline.py --dry-run        — показать, что будет выполнено
+  python3 .py/pipeline.py app              — собрать и запустить демонстрацию app
+  python3 .py/pipeline.py regression       — замерить и сравнить с предыдущими замерами
+  python3 .py/pipeline.py sparse           — замер плотных и разреженных ядер по плотности
+  python3 .py/pipeline.py cache            — точка безубыточности кэша результатов
+  python3 .py/pipeline.py server           — задержка и пропускная способность сервера умножения
+"""
+
+import argparse
+import importlib
+import multiprocessing
+import os
+import subprocess
+import sys
+import threading
+import time
+from contextlib import nullcontext
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from results_store import BENCHMARK_BIN, BUILD_DIR, CSV_DIR, DEFAULT_CPP_SIZES, STORE_PATH, cpp_sources
+from tuning_profile import PROJECT_ROOT, PY_DIR, profile_path
+
+DATA_DIR = PROJECT_ROOT / "data"
+PNG_DIR = DATA_DIR / "png"
+APP_BIN = BUILD_DIR / "app"
+LIB_PATH = BUILD_DIR / ("libmatmul.dylib" if sys.platform == "darwin" else "libmatmul.so")
+
+# Модули, которые строят графики через pyplot: выполняются в пуле процессов
+PLOT_MODULES = ["plot_comparison_table", "plot_asymptotic_analysis"]
+
+
+@dataclass
+class Stage:
+    """
+    Этап конвейера.
+
+    run       — функция без аргументов (в потоке) или имя модуля с main()
+                (если process=True, выполняется в пуле процессов);
+    deps      — этапы, которые должны завершиться раньше;
+    inputs    — файлы, от которых зависит результат (отсутствующие игнорируются);
+    outputs   — файлы-результаты; без выходов этап выполняется всегда
+                (замеры сами решают, что устарело, через results_store.py);
+    exclusive — выполнять в одиночку (замеры времени);
+    default   — входит ли этап в конвейер по умолчанию.
+    """
+
+    name: str
+    run: object
+    deps: list = field(default_factory=list)
+    inputs: list = field(default_factory=list)
+    outputs: list = field(default_factory=list)
+    process: bool = False
+    exclusive: bool = False
+    default: bool = True
+
+
+# --- Действия этапов ---
+
+
+def _run_command(*cmd):
+    subprocess.run([str(c) for c in cmd], check=True, cwd=PROJECT_ROOT)
+
+
+def _build():
+    _run_command("cmake", "-B", BUILD_DIR)
+    _run_command("cmake", "--build", BUILD_DIR)
+
+
+def _bench_cpp(sizes):
+    from bench_stats import parse_sizes
+    from results_store import ResultsStore, run_cpp
+
+    with ResultsStore() as store:
+        run_cpp(store, parse_sizes(sizes))
+
+
+def _bench_numpy(sizes):
+    import benchmark_numpy
+
+    benchmark_numpy.main(["--sizes", sizes] if sizes else [])
+
+
+def _probe():
+    import roofline
+
+    roofline.probe()
+
+
+def _export():
+    from results_store import ResultsStore, export_all
+
+    with ResultsStore() as store:
+        export_all(store)
+
+
+def _complexity_fit():
+    import complexity_fit
+
+    complexity_fit.main([])
+
+
+def _plot_timings(workers):
+    import plot_timings
+
+    plot_timings.main(workers)
+
+
+def _sparse():
+    import sparse_numpy
+
+    sparse_numpy.main(["--cpp"])
+
+
+def _cache():
+    import result_cache
+
+    result_cache.main([])
+
+
+def _server():
+    import matmul_server
+
+    matmul_server.main(["bench"])
+
+
+def _regression():
+    import regression
+
+    counts = regression.run_compare()
+    if counts["regression"]:
+        raise RuntimeError("найдены регрессии производительности (data/csv/regression_diff.csv)")
+    if counts["insufficient"]:
+        raise RuntimeError("изменение медианы больше порога не проверено: мало выборок "
+                           "(data/csv/regression_diff.csv)")
+
+
+def _report():
+    import generate_report
+
+    generate_report.main()
+
+
+def _run_module(module: str) -> float:
+    """Выполняется в рабочем процессе: module.main(), возвращает время, с."""
+    start = time.perf_counter()
+    importlib.import_module(module).main()
+    return time.perf_counter() - start
+
+
+def _timed(func) -> float:
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start
+
+
+def build_stages(args) -> dict:
+    script = lambda name: PY_DIR / name  # noqa: E731
+    stages = [
+        Stage(
+            "build", _build,
+            inputs=cpp_sources(),
+            outputs=[APP_BIN, BENCHMARK_BIN, LIB_PATH],
+        ),
+        Stage(
+            "app", lambda: _run_command(APP_BIN),
+            deps=["build"], default=False,
+        ),
+        Stage(
+            "bench_cpp", lambda: _bench_cpp(args.cpp_sizes),
+            deps=["build"], exclusive=True,
+        ),
+        Stage(
+            "bench_numpy", lambda: _bench_numpy(args.numpy_sizes),
+            deps=["build", "bench_cpp"], exclusive=True,
+        ),
+        Stage(
+            "probe", _probe, exclusive=True,
+        ),
+        Stage(
+            "export", _export,
+            deps=["bench_cpp", "bench_numpy"],
+            inputs=[STORE_PATH, script("results_store.py")],
+            outputs=[CSV_DIR / "timings.csv", CSV_DIR / "timings_numpy.csv",
+                     CSV_DIR / "throughput.csv"],
+        ),
+        Stage(
+            "plot_timings", lambda: _plot_timings(args.jobs),
+            deps=["bench_cpp", "bench_numpy", "probe"],
+            inputs=[STORE_PATH, profile_path(), script("plot_timings.py"), script("roofline.py")],
+            outputs=[PNG_DIR / name for name in (
+                "timings_standard.png", "timings_strassen.png",
+                "timings_all.png", "timings_all_loglog.png",
+                "complexity_theory.png", "complexity_theory_loglog.png",
+                "complexity_saving_bar.png", "complexity_ratio.png",
+                "gflops.png", "roofline.png",
+            )],
+        ),
+        Stage(
+            "complexity_fit", _complexity_fit,
+            deps=["bench_cpp", "bench_numpy"],
+            inputs=[STORE_PATH, script("complexity_fit.py")],
+            outputs=[CSV_DIR / "complexity_fit.csv", CSV_DIR / "complexity_predictions.csv",
+                     PNG_DIR / "complexity_fit.png"],
+        ),
+        Stage(
+            "sparse", _sparse,
+            deps=["build"], exclusive=True, default=False,
+            inputs=[BENCHMARK_BIN, script("sparse_numpy.py")],
+            outputs=[CSV_DIR / "sparse_density_numpy.csv", CSV_DIR / "sparse_density_cpp.csv",
+                     PNG_DIR / "sparse_density.png"],
+        ),
+        Stage(
+            "cache", _cache,
+            deps=["build"], exclusive=True, default=False,
+            inputs=[LIB_PATH, script("result_cache.py")],
+            outputs=[CSV_DIR / "cache_breakeven.csv", PNG_DIR / "cache_breakeven.png"],
+        ),
+        Stage(
+            "server", _server,
+            exclusive=True, default=False,
+            inputs=[script("matmul_server.py"), script("batched.py")],
+            outputs=[CSV_DIR / "server_load.csv", PNG_DIR / "server_load.png"],
+        ),
+        Stage(
+            "regression", _regression,
+            deps=["bench_cpp", "bench_numpy"], default=False,
+        ),
+        Stage(
+            "report", _report,
+            deps=["complexity_fit"],
+            inputs=[script("generate_report.py"), CSV_DIR / "complexity_fit.csv"],
+            outputs=[DATA_DIR / "report.md"],
+        ),
+        Stage(
+            "comparison_table", "plot_comparison_table", process=True,
+            inputs=[script("plot_comparison_table.py")],
+            outputs=[PNG_DIR / "comparison_table.png"],
+        ),
+        Stage(
+            "asymptotic", "plot_asymptotic_analysis", process=True,
+            deps=["bench_cpp", "complexity_fit"],
+            inputs=[STORE_PATH, profile_path(), script("plot_asymptotic_analysis.py"),
+                    CSV_DIR / "complexity_fit.csv"],
+            outputs=[PNG_DIR / "asymptotic_analysis.png"],
+        ),
+    ]
+    return {stage.name: stage for stage in stages}
+
+
+# Группы этапов для удобного выбора целей
+TARGET_GROUPS = {
+    "bench": ["bench_cpp", "bench_numpy", "probe"],
+    "plots": ["plot_timings", "comparison_table", "asymptotic", "complexity_fit"],
+}
+
+
+# --- Планирование ---
+
+
+def select(stages: dict, targets) -> list:
+    """Цели вместе со всеми зависимостями, в топологическом порядке."""
+    if not targets:
+        targets = [name for name, stage in stages.items() if stage.default]
+
+    order, seen = [], set()
+
+    def visit(name, path=()):
+        if name in path:
+            raise ValueError(f"цикл в зависимостях: {' -> '.join(path + (name,))}")
+        if name in seen:
+            return
+        if name not in stages:
+            raise ValueError(f"неизвестный этап: {name}")
+        for dep in stages[name].deps:
+            visit(dep, path + (name,))
+        seen.add(name)
+        order.append(name)
+
+    for target in targets:
+        for name in TARGET_GROUPS.get(target, [target]):
+            visit(name)
+    return order
+
+
+def is_up_to_date(stage: Stage) -> bool:
+    if not stage.outputs:
+        return False
+    outputs = [Path(p) for p in stage.outputs]
+    if not all(p.exists() for p in outputs):
+        return False
+    inputs = [Path(p) for p in stage.inputs if Path(p).exists()]
+    if not inputs:
+        return True
+    newest_input = max(p.stat().st_mtime for p in inputs)
+    return min(p.stat().st_mtime for p in outputs) >= newest_input
+
+
+def _process_pool(jobs: int):
+    """
+    Пул процессов для графиков. Через forkserver модули графиков
+    (а с ними matplotlib) импортируются один раз в сервере, а рабочие
+    процессы получают их уже загруженными.
+    """
+    os.environ.setdefault("MPLBACKEND", "Agg")
+    if "forkserver" in multiprocessing.get_all_start_methods():
+        ctx = multiprocessing.get_context("forkserver")
+        ctx.set_forkserver_preload(PLOT_MODULES)
+    else:
+        ctx = multiprocessing.get_context("spawn")
+    return ProcessPoolExecutor(max_workers=jobs, mp_context=ctx)
+
+
+def run_pipeline(stages: dict, order, jobs=None, force=False, dry_run=False) -> dict:
+    """
+    Выполняет этапы order с учётом зависимостей.
+    Возвращает {этап: (статус, время в секундах)}.
+    """
+    jobs = jobs or os.cpu_count() or 1
+    results = {}
+    pending = list(order)
+    running = {}  # future -> имя этапа
+    lock = threading.Lock()
+
+    def finish(name, status, seconds=0.0):
+        results[name] = (status, seconds)
+        with lock:
+            print(f"[{name}] {status}" + (f" за {seconds:.2f} с" if seconds else ""),
+                  flush=True)
+
+    if dry_run:
+        for name in order:
+            stage = stages[name]
+            up_to_date = not force and is_up_to_date(stage)
+            print(f"{name}: {'актуален' if up_to_date else 'будет выполнен'}")
+        return results
+
+    uses_processes = any(stages[name].process for name in order)
+    with ThreadPoolExecutor(max_workers=jobs) as threads, \
+            (_process_pool(jobs) if uses_processes else nullcontext()) as processes:
+        while pending or running:
+            exclusive_running = any(stages[n].exclusive for n in running.values())
+
+            for name in list(pending):
+                stage = stages[name]
+                if any(dep in pending or dep in running.values()
+                       for dep in stage.deps if dep in order):
+                    continue
+                failed = [dep for dep in stage.deps
+                          if results.get(dep, ("",))[0] in ("ошибка", "пропущен")]
+                if failed:
+                    pending.remove(name)
+                    finish(name, "пропущен")
+                    print(f"  не выполнены зависимости: {', '.join(failed)}")
+                    continue
+                if not force and is_up_to_date(stage):
+                    pending.remove(name)
+                    finish(name, "актуален")
+                    continue
+
+                # Замеры идут в одиночку: ждём, пока остальные этапы закончатся,
+                # и не запускаем ничего нового, пока замер не завершён.
+                if exclusive_running or len(running) >= jobs:
+                    break
+                if stage.exclusive and running:
+                    break
+
+                pending.remove(name)
+                with lock:
+                    print(f"[{name}] запуск", flush=True)
+                if stage.process:
+                    future = processes.submit(_run_module, stage.run)
+                else:
+                    future = threads.submit(_timed, stage.run)
+                running[future] = name
+                if stage.exclusive:
+                    break
+
+            if not running:
+                continue
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                name = running.pop(future)
+                try:
+                    finish(name, "готово", future.result())
+                except (Exception, SystemExit) as e:
+                    finish(name, "ошибка")
+                    print(f"  {type(e).__name__}: {e}", file=sys.stderr)
+    return results
+
+
+def print_summary(results: dict, total: float):
+    if not results:
+        return
+    print("\nЭтап                 Статус       Время, с")
+    for name, (status, seconds) in results.items():
+        print(f"{name:<20} {status:<12} {seconds:8.2f}")
+    print(f"{'итого (стена)':<33} {total:8.2f}")
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Конвейер ЛР: сборка, замеры, графики, отчёт")
+    parser.add_argument("targets", nargs="*",
+                        help="этапы или группы (bench, plots); по умолчанию — все, кроме app")
+    parser.add_argument("-j", "--jobs", type=int, default=None,
+                        help="сколько этапов выполнять одновременно (по умолчанию — число ядер)")
+    parser.add_argument("--force", action="store_true",
+                        help="выполнить выбранные этапы, даже если выходы актуальны")
+    parser.add_argument("--dry-run", action="store_true", help="только показать план")
+    parser.add_argument("--cpp-sizes", default=DEFAULT_CPP_SIZES, help="размеры для build/benchmark")
+    parser.add_argument("--numpy-sizes", default=None,
+                        help="размеры для benchmark_numpy.py (по умолчанию — как у C++)")
+    parser.add_argument("--list", action="store_true", help="показать этапы и выйти")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    stages = build_stages(args)
+
+    if args.list:
+        for stage in stages.values():
+            deps = ", ".join(stage.deps) or "-"
+            note = "" if stage.default else "  (только явно)"
+            print(f"{stage.name:<18} зависит от: {deps}{note}")
+        return
+
+    try:
+        order = select(stages, args.targets)
+    except ValueError as e:
+        print(e)
+        sys.exit(2)
+
+    start = time.perf_counter()
+    results = run_pipeline(stages, order, args.jobs, args.force, args.dry_run)
+    print_summary(results, time.perf_counter() - start)
+
+    if any(status == "ошибка" for status, _ in results.values()):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -6,18 +6,24 @@ plot_asymptotic_analysis.py
 стандартного алгоритма умножения матриц и алгоритма Штрассена.
 
 Использует практические данные из:
-  data/csv/timings.csv
+  data/store/results.sqlite — хранилище результатов (results_store.py)
+  data/tuning/<fingerprint>.cfg — профиль автонастройки (.py/autotune.py), если есть
+  data/csv/complexity_fit.csv — показатели, аппроксимированные по замерам
+                                (.py/complexity_fit.py), если есть
 
 Сохраняет результат в:
   data/png/asymptotic_analysis.png
 """
 
 from pathlib import Path
-import csv
 import math
 
 import matplotlib.pyplot as plt
 
+from complexity_fit import describe, format_ms, load_fits
+from results_store import ResultsStore
+from tuning_profile import load_profile, profile_int
+
 # Пути относительно корня проекта
 PY_DIR = Path(__file__).resolve().parent
 PROJECT_ROOT = PY_DIR.parent
@@ -28,36 +34,64 @@ PNG_DIR = DATA_DIR / "png"
 
 def load_timings():
     """
-    Читает data/csv/timings.csv и возвращает список кортежей:
+    Читает замеры C++ из хранилища результатов и возвращает список кортежей:
     (n, standard_ms, strassen_ms)
     """
-    path = CSV_DIR / "timings.csv"
-    rows = []
-    if not path.exists():
-        return rows
+    with ResultsStore() as store:
+        standard = store.series("standard")
+        strassen = store.series("strassen")
+
+    # Штрассен на Matrix замеряется только для n = 2^k
+    return [
+        (n, standard[n]["median_ms"], strassen[n]["median_ms"])
+        for n in sorted(standard)
+        if n in strassen
+    ]
 
-    with path.open(encoding="utf-8") as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            n = int(row["n"])
-            standard_ms = float(row["standard_ms"])
-            strassen_ms = float(row["strassen_ms"])
-            rows.append((n, standard_ms, strassen_ms))
 
-    # сортируем по n на всякий случай
-    rows.sort(key=lambda x: x[0])
-    return rows
+def build_tuning_summary(profile):
+    """
+    Текст о пороге перехода, измеренном автонастройкой на этой машине.
+    None, если профиля нет или в нём нет данных для C++.
+    """
+    cutoff = profile_int("cpp_strassen_cutoff", profile=profile)
+    if cutoff is None:
+        return None
+
+    crossover = profile_int("cpp_crossover_n", profile=profile)
+    max_n = profile_int("cpp_max_tuned_n", profile=profile)
+    text = (
+        "Автонастройка на этой машине: рекурсия Штрассена выгодна до блоков "
+        f"{cutoff} x {cutoff}, меньшие блоки умножаются стандартным алгоритмом. "
+    )
+    if crossover is not None:
+        text += (
+            "С этим порогом алгоритм Штрассена быстрее стандартного "
+            f"при n ≥ {crossover}."
+        )
+    else:
+        limit = f" (n ≤ {max_n})" if max_n else ""
+        text += (
+            "Даже с этим порогом в исследованном диапазоне"
+            f"{limit} стандартный алгоритм не уступает Штрассену."
+        )
+    return text
 
 
-def build_practical_summary(rows):
+def build_practical_summary(rows, profile=None):
     """
     На основе экспериментальных данных формирует короткий текстовый вывод
     о практическом поведении алгоритмов.
+    Если есть профиль автонастройки, вывод строится по измеренному порогу.
     """
+    tuning_text = build_tuning_summary(profile or {})
+    if tuning_text:
+        return tuning_text
+
     if not rows:
         return (
             "Практические данные бенчмарка недоступны "
-            "(файл data/csv/timings.csv не найден)."
+            "(в хранилище data/store/results.sqlite нет замеров C++)."
         )
 
     max_n = rows[-1][0]
@@ -92,24 +126,54 @@ def build_practical_summary(rows):
     )
 
 
+# Алгоритмы, модели которых показываются первыми (остальные — по алфавиту)
+FIT_PRIORITY = ["standard", "strassen", "numpy", "strassen_numpy", "blocked", "winograd"]
+
+
+def build_fit_lines(fits, limit=6):
+    """
+    Строки об эмпирических моделях T(n) ≈ c · n^a: по одной на алгоритм
+    (не больше limit) и прогноз для самого большого размера.
+    """
+    def order(fit):
+        alg = fit["algorithm"]
+        return (FIT_PRIORITY.index(alg) if alg in FIT_PRIORITY else len(FIT_PRIORITY), alg)
+
+    lines = []
+    for fit in sorted(fits, key=order)[:limit]:
+        line = f"• {describe(fit)}"
+        if fit["predictions"]:
+            size = max(fit["predictions"])
+            ms, low, high = fit["predictions"][size]
+            line += f"; прогноз n = {size}: {format_ms(ms)} [{format_ms(low)}; {format_ms(high)}]"
+        lines.append(line)
+    return lines
+
+
 def main():
     DATA_DIR.mkdir(parents=True, exist_ok=True)
     CSV_DIR.mkdir(parents=True, exist_ok=True)
     PNG_DIR.mkdir(parents=True, exist_ok=True)
 
     rows = load_timings()
-    practical_text = build_practical_summary(rows)
+    profile = load_profile()
+    practical_text = build_practical_summary(rows, profile)
+    crossover = profile_int("cpp_crossover_n", profile=profile)
+    fit_lines = build_fit_lines([fit for fit in load_fits() if fit["dtype"] == "float64"])
 
     # Формулы для теоретической части
     alpha = math.log(7, 2)  # ≈ 2.807...
     alpha_str = f"{alpha:.3f}"
 
-    # Создаём фигуру под текст
-    fig, ax = plt.subplots(figsize=(10, 6))
+    # Создаём фигуру под текст; строки моделей добавляют высоту,
+    # а шаг по вертикали пересчитывается, чтобы остаться тем же в дюймах
+    height = 6 + (0.45 * (len(fit_lines) + 1.5) if fit_lines else 0)
+    fig, ax = plt.subplots(figsize=(10, height))
     ax.axis("off")
 
-    y = 0.94
-    dy = 0.075
+    scale = 6 / height
+    y = 1 - 0.06 * scale
+    dy = 0.075 * scale
 
     # Заголовок
     fig.text(
@@ -153,7 +217,16 @@ def main():
     fig.text(0.05, y, f"• {practical_text}", fontsize=10)
     y -= dy * 1.4
 
-    # Блок 3: краткий вывод
+    # Блок 3: модели, аппроксимированные по замерам (complexity_fit.py)
+    if fit_lines:
+        fig.text(0.03, y, "Эмпирическая сложность по замерам:", fontsize=12, fontweight="bold")
+        y -= dy
+        for line in fit_lines:
+            fig.text(0.05, y, line, fontsize=9)
+            y -= dy * 0.8
+        y -= dy * 0.4
+
+    # Блок 4: краткий вывод
     fig.text(0.03, y, "Вывод:", fontsize=12, fontweight="bold")
     y -= dy
 
@@ -166,6 +239,10 @@ def main():
         "• Использование алгоритма Штрассена оправдано при достаточно больших n, "
         "когда асимптотическое снижение степени роста компенсирует дополнительные накладные расходы."
     )
+    if crossover is not None:
+        conclusion += (
+            f"\n• На этой машине такой порог измерен автонастройкой: n ≥ {crossover}."
+        )
 
     # Разбиваем вывод по строкам вручную, чтобы не городить разметку:
     for line in conclusion.split("\n"):
@@ -3,27 +3,43 @@
 plot_timings.py
 Строит все графики времени и теоретических асимптот для ЛР по умножению матриц.
 
-Читает:
-  data/csv/timings.csv         — стандартный C++ и Штрассен
-  data/csv/timings_numpy.csv   — NumPy
+Читает хранилище результатов data/store/results.sqlite (results_store.py):
+  standard, strassen           — стандартный C++ и Штрассен
+  blocked                      — C++ с разбиением на блоки под кэш (если есть)
+  numpy, strassen_numpy        — NumPy (BLAS) и Штрассен на NumPy
 
 Сохраняет:
   data/png/timings_standard.png
   data/png/timings_strassen.png
+  data/png/timings_blocked.png
   data/png/timings_numpy.png
+  data/png/timings_strassen_numpy.png
   data/png/timings_all.png
   data/png/timings_all_loglog.png
   data/png/complexity_theory.png
   data/png/complexity_theory_loglog.png
   data/png/complexity_saving_bar.png
   data/png/complexity_ratio.png
+  data/png/gflops.png           — GFLOP/s от n (по модели работы roofline.py)
+  data/png/roofline.png         — roofline по пикам машины из профиля
+  data/png/numpy_scaling.png    — ускорение и эффективность NumPy от числа потоков BLAS
+                                  (если есть замеры benchmark_numpy.py --threads)
+
+Каждый график — самостоятельная задача отрисовки на объектном API
+matplotlib (Figure + Agg, без глобального состояния pyplot). Задачи
+выполняются в пуле процессов; matplotlib импортируется только внутри
+рабочих процессов. В конце печатается время отрисовки каждого графика.
 """
 
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-import csv
 import math
+import multiprocessing
+import os
+import time
 
-import matplotlib.pyplot as plt
+from results_store import STORE_PATH, ResultsStore, cutoff_of
+from roofline import machine_peaks, throughput
 
 
 # --- Пути к проекту и папкам data/csv и data/png ---
@@ -35,106 +51,212 @@ CSV_DIR = DATA_DIR / "csv"
 PNG_DIR = DATA_DIR / "png"
 
 
+def _aligned(series, n_values):
+    """Медианы для заданных n; нет замера (например, Штрассен для n != 2^k) -> NaN."""
+    return [series[n]["median_ms"] if n in series else math.nan for n in n_values]
+
+
 def read_timings():
-    """Читает timings.csv и timings_numpy.csv, возвращает общие данные."""
-    standard_n = []
-    standard_ms = []
-    strassen_ms = []
+    """Читает замеры из хранилища результатов, возвращает общие данные."""
+    with ResultsStore() as store:
+        standard = store.series("standard")
+        strassen = store.series("strassen")
+        blocked = store.series("blocked")
+        numpy_series = store.series("numpy")
+        strassen_numpy = store.series("strassen_numpy")
+
+    if not standard:
+        raise LookupError(
+            f"В хранилище {STORE_PATH} нет замеров C++. "
+            "Сначала запусти: python3 .py/results_store.py cpp"
+        )
 
     # Основные замеры C++: стандартный и Штрассен
-    with (CSV_DIR / "timings.csv").open(encoding="utf-8") as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            n = int(row["n"])
-            standard_n.append(n)
-            standard_ms.append(float(row["standard_ms"]))
-            strassen_ms.append(float(row["strassen_ms"]))
+    standard_n = sorted(standard)
+    standard_ms = _aligned(standard, standard_n)
+    strassen_ms = _aligned(strassen, standard_n)
+    blocked_ms = _aligned(blocked, standard_n) if blocked else []
 
     # Замеры NumPy (могут отсутствовать)
-    numpy_n = []
-    numpy_ms = []
-    numpy_path = CSV_DIR / "timings_numpy.csv"
-    if numpy_path.exists():
-        with numpy_path.open(encoding="utf-8") as f:
-            reader = csv.DictReader(f)
-            for row in reader:
-                numpy_n.append(int(row["n"]))
-                numpy_ms.append(float(row["numpy_ms"]))
-
-    # На всякий случай сортируем по n
-    zipped_std = sorted(
-        zip(standard_n, standard_ms, strassen_ms), key=lambda x: x[0]
-    )
-    standard_n = [z[0] for z in zipped_std]
-    standard_ms = [z[1] for z in zipped_std]
-    strassen_ms = [z[2] for z in zipped_std]
+    numpy_n = sorted(numpy_series)
+    numpy_ms = _aligned(numpy_series, numpy_n)
+    strassen_numpy_ms = _aligned(strassen_numpy, numpy_n) if strassen_numpy else []
+
+    return (standard_n, standard_ms, strassen_ms, numpy_n, numpy_ms, strassen_numpy_ms,
+            blocked_ms)
+
+
+def read_throughput():
+    """{алгоритм: (n, GFLOP/s, интенсивность)} для замеров float64."""
+    result = {}
+    with ResultsStore() as store:
+        for alg in store.algorithms():
+            points = [(n, throughput(alg, n, record["median_ms"], cutoff=cutoff_of(record)))
+                      for n, record in sorted(store.series(alg).items())]
+            points = [(n, t) for n, t in points if t is not None]
+            if points:
+                result[alg] = ([n for n, _ in points],
+                               [t["gflops"] for _, t in points],
+                               [t["intensity"] for _, t in points])
+    return result
+
+
+def read_scaling(algorithm="numpy"):
+    """
+    {n: ([потоки], [медиана мс])} для n, замеренных хотя бы при двух числах
+    потоков BLAS, одно из которых — 1 (база для ускорения). Берутся только
+    актуальные замеры (текущий код и сборка), чтобы не делить T(1) старого
+    кода на T(p) нового.
+    """
+    with ResultsStore() as store:
+        per_threads = {
+            t: {n: record for n, record in store.series(algorithm, threads=t).items()
+                if store.has(algorithm, n, "float64", t)}
+            for t in store.threads_of(algorithm) if t > 0
+        }
+    result = {}
+    for n in sorted({n for series in per_threads.values() for n in series}):
+        points = sorted((t, series[n]["median_ms"])
+                        for t, series in per_threads.items() if n in series)
+        if len(points) >= 2 and points[0][0] == 1:
+            result[n] = ([t for t, _ in points], [ms for _, ms in points])
+    return result
 
-    zipped_np = sorted(zip(numpy_n, numpy_ms), key=lambda x: x[0])
-    numpy_n = [z[0] for z in zipped_np]
-    numpy_ms = [z[1] for z in zipped_np]
 
-    return standard_n, standard_ms, strassen_ms, numpy_n, numpy_ms
+# --- Построение практических графиков времени ---
 
 
-# --- Построение практических графиков времени ---
+def _new_axes():
+    """Новая фигура на Agg без pyplot; matplotlib импортируется здесь, в рабочем процессе."""
+    from matplotlib.figure import Figure
 
+    fig = Figure()
+    return fig, fig.subplots()
 
-def plot_single(n_list, ms_list, title, filename, ylabel="Время, мс"):
-    """Простой график: n по оси X, время по оси Y."""
-    plt.figure()
-    plt.plot(n_list, ms_list, marker="o")
-    plt.xlabel("Размер матрицы n")
-    plt.ylabel(ylabel)
-    plt.title(title)
-    plt.grid(True, which="both", linestyle="--", linewidth=0.5)
 
+def _save(fig, filename):
     PNG_DIR.mkdir(parents=True, exist_ok=True)
     out_path = PNG_DIR / filename
-    plt.savefig(out_path, bbox_inches="tight")
-    plt.close()
-
+    fig.savefig(out_path, bbox_inches="tight")
+    return out_path
 
-def plot_all_linear(n, standard_ms, strassen_ms, numpy_n, numpy_ms):
-    """Сравнение всех трёх алгоритмов в линейном масштабе."""
-    plt.figure()
-    plt.plot(n, standard_ms, marker="o", label="Стандартный C++")
-    plt.plot(n, strassen_ms, marker="o", label="Штрассен C++")
-
-    # Для NumPy возможны немного другие n, поэтому строим отдельно
-    if numpy_n and numpy_ms:
-        plt.plot(numpy_n, numpy_ms, marker="o", label="NumPy (Python)")
 
-    plt.xlabel("Размер матрицы n")
-    plt.ylabel("Время, мс")
-    plt.title("Сравнение времени работы алгоритмов (линейный масштаб)")
-    plt.grid(True, which="both", linestyle="--", linewidth=0.5)
-    plt.legend()
+def _style(ax, xlabel, ylabel, title, legend=False):
+    ax.set_xlabel(xlabel)
+    ax.set_ylabel(ylabel)
+    ax.set_title(title)
+    ax.grid(True, which="both", linestyle="--", linewidth=0.5)
+    if legend:
+        ax.legend()
 
-    PNG_DIR.mkdir(parents=True, exist_ok=True)
-    plt.savefig(PNG_DIR / "timings_all.png", bbox_inches="tight")
-    plt.close()
 
+def plot_single(n_list, ms_list, title, filename, ylabel="Время, мс"):
+    """Простой график: n по оси X, время по оси Y."""
+    fig, ax = _new_axes()
+    ax.plot(n_list, ms_list, marker="o")
+    _style(ax, "Размер матрицы n", ylabel, title)
+    return _save(fig, filename)
 
-def plot_all_loglog(n, standard_ms, strassen_ms, numpy_n, numpy_ms):
-    """Сравнение всех трёх алгоритмов в логарифмическом масштабе (log–log)."""
-    plt.figure()
 
-    # Логарифмический масштаб остаётся, просто используем базу по умолчанию
-    plt.loglog(n, standard_ms, marker="o", label="Стандартный C++")
-    plt.loglog(n, strassen_ms, marker="o", label="Штрассен C++")
+def _plot_all(ax, plot, n, standard_ms, strassen_ms, numpy_n, numpy_ms, strassen_numpy_ms,
+              blocked_ms):
+    plot(n, standard_ms, marker="o", label="Стандартный C++")
+    plot(n, strassen_ms, marker="o", label="Штрассен C++")
+    if blocked_ms:
+        plot(n, blocked_ms, marker="o", label="Блочный C++ (i-k-j)")
 
+    # Для NumPy возможны немного другие n, поэтому строим отдельно
     if numpy_n and numpy_ms:
-        plt.loglog(numpy_n, numpy_ms, marker="o", label="NumPy (Python)")
-
-    plt.xlabel("log n")
-    plt.ylabel("log времени, мс")
-    plt.title("Сравнение времени работы алгоритмов (log–log)")
-    plt.grid(True, which="both", linestyle="--", linewidth=0.5)
-    plt.legend()
-
-    PNG_DIR.mkdir(parents=True, exist_ok=True)
-    plt.savefig(PNG_DIR / "timings_all_loglog.png", bbox_inches="tight")
-    plt.close()
+        plot(numpy_n, numpy_ms, marker="o", label="NumPy (Python)")
+    if numpy_n and strassen_numpy_ms:
+        plot(numpy_n, strassen_numpy_ms, marker="o", label="Штрассен NumPy")
+
+
+def plot_all_linear(n, standard_ms, strassen_ms, numpy_n, numpy_ms, strassen_numpy_ms=None,
+                    blocked_ms=None):
+    """Сравнение всех алгоритмов в линейном масштабе."""
+    fig, ax = _new_axes()
+    _plot_all(ax, ax.plot, n, standard_ms, strassen_ms, numpy_n, numpy_ms, strassen_numpy_ms,
+              blocked_ms)
+    _style(ax, "Размер матрицы n", "Время, мс",
+           "Сравнение времени работы алгоритмов (линейный масштаб)", legend=True)
+    return _save(fig, "timings_all.png")
+
+
+def plot_all_loglog(n, standard_ms, strassen_ms, numpy_n, numpy_ms, strassen_numpy_ms=None,
+                    blocked_ms=None):
+    """Сравнение всех алгоритмов в логарифмическом масштабе (log–log)."""
+    fig, ax = _new_axes()
+    _plot_all(ax, ax.loglog, n, standard_ms, strassen_ms, numpy_n, numpy_ms, strassen_numpy_ms,
+              blocked_ms)
+    _style(ax, "log n", "log времени, мс",
+           "Сравнение времени работы алгоритмов (log–log)", legend=True)
+    return _save(fig, "timings_all_loglog.png")
+
+
+def _legend_outside(ax):
+    """Легенда справа от осей: алгоритмов много, внутри она закрывает точки."""
+    ax.legend(fontsize="small", loc="upper left", bbox_to_anchor=(1.02, 1.0))
+
+
+def plot_gflops(series):
+    """Эффективная производительность (GFLOP/s) от n для всех алгоритмов."""
+    fig, ax = _new_axes()
+    for alg, (n_list, gflops, _) in series.items():
+        ax.loglog(n_list, gflops, marker="o", label=alg)
+    ax.set_xscale("log", base=2)
+    _style(ax, "Размер матрицы n", "GFLOP/s",
+           "Производительность (фактическое число операций / время)")
+    _legend_outside(ax)
+    return _save(fig, "gflops.png")
+
+
+def plot_roofline(series, peaks):
+    """
+    Roofline: интенсивность (операций на байт) по X, GFLOP/s по Y.
+    Крыша — min(пик, пропускная способность * интенсивность).
+    """
+    peak, bandwidth = peaks
+    intensities = [i for _, _, values in series.values() for i in values]
+    low = min(intensities + [peak / bandwidth]) / 2
+    high = max(intensities + [peak / bandwidth]) * 2
+
+    xs = [low * (high / low) ** (i / 200) for i in range(201)]
+    fig, ax = _new_axes()
+    ax.loglog(xs, [min(peak, bandwidth * x) for x in xs], color="black",
+              label=f"крыша: {peak:.1f} GFLOP/s, {bandwidth:.1f} ГБ/с")
+    for alg, (_, gflops, intensity) in series.items():
+        ax.loglog(intensity, gflops, marker="o", linestyle="", label=alg)
+    _style(ax, "Интенсивность, операций на байт", "GFLOP/s",
+           "Roofline (оценка объёма данных по модели)")
+    _legend_outside(ax)
+    return _save(fig, "roofline.png")
+
+
+def plot_scaling(scaling):
+    """
+    Сильное масштабирование NumPy: ускорение T(1) / T(p) и эффективность
+    T(1) / (p * T(p)) от числа потоков BLAS p для каждого n.
+    """
+    from matplotlib.figure import Figure
+
+    fig = Figure(figsize=(13, 5))
+    ax_speedup, ax_efficiency = fig.subplots(1, 2)
+    max_threads = max(t for threads, _ in scaling.values() for t in threads)
+    ax_speedup.plot([1, max_threads], [1, max_threads], "k--", linewidth=0.8,
+                    label="идеальное")
+    ax_efficiency.axhline(1.0, color="black", linestyle="--", linewidth=0.8)
+    for n, (threads, ms) in scaling.items():
+        speedup = [ms[0] / t_ms for t_ms in ms]
+        ax_speedup.plot(threads, speedup, marker="o", label=f"n = {n}")
+        ax_efficiency.plot(threads, [s / t for s, t in zip(speedup, threads)],
+                           marker="o", label=f"n = {n}")
+    _style(ax_speedup, "Потоков BLAS", "Ускорение T(1) / T(p)", "Ускорение NumPy")
+    _style(ax_efficiency, "Потоков BLAS", "Эффективность T(1) / (p · T(p))",
+           "Эффективность на поток")
+    ax_efficiency.set_ylim(0, 1.1)
+    _legend_outside(ax_efficiency)
+    return _save(fig, "numpy_scaling.png")
 
 
 # --- Теоретические графики асимптот ---
@@ -180,7 +302,7 @@ def plot_complexity_theory(n_list):
     norm_n3 = [v / max_n3 for v in values_n3]
     norm_str = [v / max_str for v in values_str]
 
-    fig, ax1 = plt.subplots()
+    fig, ax1 = _new_axes()
 
     ax1.plot(n_list, norm_n3, marker="o", label="O(n³) (норм.)")
     ax1.plot(n_list, norm_str, marker="o", label="O(n^{log₂7}) (норм.)")
@@ -204,44 +326,33 @@ def plot_complexity_theory(n_list):
     lines2, labels2 = ax2.get_legend_handles_labels()
     fig.legend(lines1 + lines2, labels1 + labels2, loc="upper left")
 
-    PNG_DIR.mkdir(parents=True, exist_ok=True)
-    plt.title("Теоретическая сложность: стандартный алгоритм vs Штрассена")
-    plt.savefig(PNG_DIR / "complexity_theory.png", bbox_inches="tight")
-    plt.close(fig)
+    ax2.set_title("Теоретическая сложность: стандартный алгоритм vs Штрассена")
+    return _save(fig, "complexity_theory.png")
 
 
 def plot_complexity_theory_loglog(n_list):
     """Строит теоретические O(n³) и O(n^{log2 7}) в логарифмическом масштабе."""
     values_n3, values_str, ratio, _ = build_theoretical_sequences(n_list)
 
-    plt.figure()
-    plt.loglog(n_list, values_n3, marker="o", label="O(n³)")
-    plt.loglog(n_list, values_str, marker="o", label="O(n^{log₂7})")
-    plt.xlabel("log n")
-    plt.ylabel("log числа операций (условно)")
-    plt.title("Теоретические асимптотики (log–log)")
-    plt.grid(True, which="both", linestyle="--", linewidth=0.5)
-    plt.legend()
-
-    PNG_DIR.mkdir(parents=True, exist_ok=True)
-    plt.savefig(PNG_DIR / "complexity_theory_loglog.png", bbox_inches="tight")
-    plt.close()
+    fig, ax = _new_axes()
+    ax.loglog(n_list, values_n3, marker="o", label="O(n³)")
+    ax.loglog(n_list, values_str, marker="o", label="O(n^{log₂7})")
+    _style(ax, "log n", "log числа операций (условно)",
+           "Теоретические асимптотики (log–log)", legend=True)
+    return _save(fig, "complexity_theory_loglog.png")
 
 
 def plot_complexity_saving_bar(n_list):
     """Строит столбчатую диаграмму теоретической экономии операций Штрассена."""
     _, _, _, saving_percent = build_theoretical_sequences(n_list)
 
-    plt.figure()
-    plt.bar([str(n) for n in n_list], saving_percent)
-    plt.xlabel("Размер матрицы n")
-    plt.ylabel("Экономия операций, %")
-    plt.title("Теоретическая экономия операций алгоритма Штрассена")
-    plt.grid(axis="y", linestyle="--", linewidth=0.5)
-
-    PNG_DIR.mkdir(parents=True, exist_ok=True)
-    plt.savefig(PNG_DIR / "complexity_saving_bar.png", bbox_inches="tight")
-    plt.close()
+    fig, ax = _new_axes()
+    ax.bar([str(n) for n in n_list], saving_percent)
+    ax.set_xlabel("Размер матрицы n")
+    ax.set_ylabel("Экономия операций, %")
+    ax.set_title("Теоретическая экономия операций алгоритма Штрассена")
+    ax.grid(axis="y", linestyle="--", linewidth=0.5)
+    return _save(fig, "complexity_saving_bar.png")
 
 
 def plot_complexity_ratio(n_list):
@@ -251,55 +362,115 @@ def plot_complexity_ratio(n_list):
     """
     _, _, ratio, _ = build_theoretical_sequences(n_list)
 
-    plt.figure()
-    plt.plot(n_list, ratio, marker="o")
-    plt.xlabel("Размер матрицы n")
-    plt.ylabel("Отношение n^3 / n^{log₂7}")
-    plt.title("Отношение теоретических сложностей алгоритмов")
-    plt.grid(True, which="both", linestyle="--", linewidth=0.5)
+    fig, ax = _new_axes()
+    ax.plot(n_list, ratio, marker="o")
+    _style(ax, "Размер матрицы n", "Отношение n^3 / n^{log₂7}",
+           "Отношение теоретических сложностей алгоритмов")
+    return _save(fig, "complexity_ratio.png")
 
-    PNG_DIR.mkdir(parents=True, exist_ok=True)
-    plt.savefig(PNG_DIR / "complexity_ratio.png", bbox_inches="tight")
-    plt.close()
 
+# --- Параллельная отрисовка ---
 
-def main():
-    DATA_DIR.mkdir(parents=True, exist_ok=True)
-    CSV_DIR.mkdir(parents=True, exist_ok=True)
-    PNG_DIR.mkdir(parents=True, exist_ok=True)
 
-    n, standard_ms, strassen_ms, numpy_n, numpy_ms = read_timings()
+def render(job):
+    """Выполняет одну задачу (функция, аргументы); возвращает (файл, время в с)."""
+    func, args = job
+    start = time.perf_counter()
+    out_path = func(*args)
+    return out_path.name, time.perf_counter() - start
 
-    # Практические графики
-    plot_single(
-        n,
-        standard_ms,
-        "Время работы стандартного алгоритма (C++)",
-        "timings_standard.png",
-    )
-    plot_single(
-        n,
-        strassen_ms,
-        "Время работы алгоритма Штрассена (C++)",
-        "timings_strassen.png",
-    )
+
+def build_jobs(n, standard_ms, strassen_ms, numpy_n, numpy_ms, strassen_numpy_ms,
+               blocked_ms=None, throughput_series=None, peaks=None, scaling=None):
+    """Список задач отрисовки: (функция, аргументы)."""
+    jobs = [
+        (plot_single, (n, standard_ms, "Время работы стандартного алгоритма (C++)",
+                       "timings_standard.png")),
+        (plot_single, (n, strassen_ms, "Время работы алгоритма Штрассена (C++)",
+                       "timings_strassen.png")),
+    ]
+    if blocked_ms:
+        jobs.append((plot_single, (n, blocked_ms, "Время работы блочного алгоритма (C++)",
+                                   "timings_blocked.png")))
     if numpy_n and numpy_ms:
-        plot_single(
-            numpy_n,
-            numpy_ms,
-            "Время работы NumPy (Python)",
-            "timings_numpy.png",
-        )
+        jobs.append((plot_single, (numpy_n, numpy_ms, "Время работы NumPy (Python)",
+                                   "timings_numpy.png")))
+    if numpy_n and strassen_numpy_ms:
+        jobs.append((plot_single, (numpy_n, strassen_numpy_ms,
+                                   "Время работы алгоритма Штрассена (NumPy)",
+                                   "timings_strassen_numpy.png")))
 
     # Сравнение практических данных
-    plot_all_linear(n, standard_ms, strassen_ms, numpy_n, numpy_ms)
-    plot_all_loglog(n, standard_ms, strassen_ms, numpy_n, numpy_ms)
-
-    # Теоретические графики асимптот (используем те же n, что и в timings.csv)
-    plot_complexity_theory(n)
-    plot_complexity_theory_loglog(n)
-    plot_complexity_saving_bar(n)
-    plot_complexity_ratio(n)
+    practical = (n, standard_ms, strassen_ms, numpy_n, numpy_ms, strassen_numpy_ms, blocked_ms)
+    jobs.append((plot_all_linear, practical))
+    jobs.append((plot_all_loglog, practical))
+
+    # Производительность и roofline (для roofline нужны пики машины)
+    if throughput_series:
+        jobs.append((plot_gflops, (throughput_series,)))
+        if peaks:
+            jobs.append((plot_roofline, (throughput_series, peaks)))
+
+    # Масштабирование NumPy по потокам BLAS (если был замер с --threads)
+    if scaling:
+        jobs.append((plot_scaling, (scaling,)))
+
+    # Теоретические графики асимптот (используем те же n, что и у замеров C++)
+    for func in (plot_complexity_theory, plot_complexity_theory_loglog,
+                 plot_complexity_saving_bar, plot_complexity_ratio):
+        jobs.append((func, (n,)))
+    return jobs
+
+
+def _pool(workers: int):
+    """
+    Пул для отрисовки. Через forkserver matplotlib импортируется один раз
+    в сервере, а рабочие процессы получают его уже загруженным.
+    """
+    if "forkserver" in multiprocessing.get_all_start_methods():
+        ctx = multiprocessing.get_context("forkserver")
+        ctx.set_forkserver_preload(["matplotlib.figure", "matplotlib.backends.backend_agg"])
+    else:
+        ctx = multiprocessing.get_context("spawn")
+    return ProcessPoolExecutor(max_workers=workers, mp_context=ctx)
+
+
+def render_all(jobs, workers=None):
+    """Рисует все графики в пуле процессов; возвращает [(файл, время в с)]."""
+    workers = min(workers or os.cpu_count() or 1, len(jobs))
+    with _pool(workers) as pool:
+        return list(pool.map(render, jobs))
+
+
+def print_render_report(timings, wall):
+    print("График                           Время, с")
+    for filename, seconds in sorted(timings, key=lambda t: -t[1]):
+        print(f"{filename:<32} {seconds:8.3f}")
+    total = sum(seconds for _, seconds in timings)
+    print(f"{'сумма по графикам':<32} {total:8.3f}")
+    print(f"{'стена (параллельно)':<32} {wall:8.3f}")
+
+
+def main(workers=None):
+    DATA_DIR.mkdir(parents=True, exist_ok=True)
+    CSV_DIR.mkdir(parents=True, exist_ok=True)
+    PNG_DIR.mkdir(parents=True, exist_ok=True)
+
+    try:
+        timings = read_timings()
+    except LookupError as e:
+        print(e)
+        return
+
+    peaks = machine_peaks()
+    if peaks is None:
+        print("Нет пиков машины для roofline. Запусти: python3 .py/roofline.py")
+
+    start = time.perf_counter()
+    jobs = build_jobs(*timings, throughput_series=read_throughput(), peaks=peaks,
+                      scaling=read_scaling())
+    results = render_all(jobs, workers)
+    print_render_report(results, time.perf_counter() - start)
 
     print("Графики сохранены в", PNG_DIR)
 
@@ -0,0 +1,297 @@
+#!/usr/bin/env python3
+"""
+regression.py
+Поиск регрессий производительности: сравнение замеров с базовой линией.
+
+Для каждой точки (алгоритм, n, dtype), которая есть и в текущих замерах,
+и в базовой линии, выборки повторов сравниваются критерием Манна–Уитни
+(двусторонним, с нормальным приближением и поправкой на связи). Точка —
+регрессия, если медиана выросла больше чем на --threshold процентов
+и различие значимо (p < --alpha); улучшение — то же в обратную сторону.
+Если медиана изменилась больше порога, а критерий не применим (меньше
+двух выборок с какой-либо стороны), точка помечается insufficient: такой
+результат не считается «без изменений».
+
+Базовая линия:
+  previous — предыдущий замер той же точки в хранилище (results_store.py
+             хранит историю: после правки ядра точка замеряется заново,
+             а старая запись остаётся);
+  <имя>    — снимок data/baselines/<имя>.json, сохранённый командой snapshot.
+
+  python3 .py/regression.py snapshot --name main    — сохранить текущие замеры
+  python3 .py/regression.py compare --baseline main — сравнить с ними
+  python3 .py/regression.py compare                 — сравнить с предыдущими замерами
+
+Результат: data/csv/regression_diff.csv и data/png/regression_diff.png.
+Код возврата 1, если найдена хотя бы одна регрессия; 3 — регрессий нет,
+но есть точки insufficient (изменение больше порога нечем проверить).
+"""
+
+import argparse
+import csv
+import json
+import math
+import sys
+
+import numpy as np
+
+from results_store import CSV_DIR, DATA_DIR, ResultsStore
+
+BASELINE_DIR = DATA_DIR / "baselines"
+DIFF_CSV = CSV_DIR / "regression_diff.csv"
+DIFF_PNG = DATA_DIR / "png" / "regression_diff.png"
+
+DEFAULT_THRESHOLD = 5.0  # %
+DEFAULT_ALPHA = 0.05
+
+STATUSES = ("regression", "improvement", "insufficient", "unchanged")
+
+DIFF_FIELDS = ["algorithm", "dtype", "n", "baseline_ms", "current_ms", "change_pct",
+               "p_value", "status"]
+
+
+# --- Статистика ---
+
+
+def _average_ranks(values):
+    """Ранги с 1; у равных значений — средний ранг."""
+    order = np.argsort(values, kind="mergesort")
+    sorted_values = values[order]
+    _, first, counts = np.unique(sorted_values, return_index=True, return_counts=True)
+    average = first + (counts + 1) / 2.0
+    ranks = np.empty(len(values))
+    ranks[order] = np.repeat(average, counts)
+    return ranks, counts
+
+
+def mann_whitney(x, y):
+    """
+    Двусторонний критерий Манна–Уитни: (U для x, p-значение).
+    Нормальное приближение с поправкой на связи и на непрерывность;
+    если выборки меньше двух элементов или все значения равны — p = nan.
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    n1, n2 = x.size, y.size
+    if n1 < 2 or n2 < 2:
+        return math.nan, math.nan
+
+    ranks, ties = _average_ranks(np.concatenate([x, y]))
+    u = ranks[:n1].sum() - n1 * (n1 + 1) / 2.0
+    n = n1 + n2
+    variance = n1 * n2 / 12.0 * ((n + 1) - (ties ** 3 - ties).sum() / (n * (n - 1)))
+    if variance <= 0:
+        return u, math.nan
+
+    mean = n1 * n2 / 2.0
+    z = (abs(u - mean) - 0.5) / math.sqrt(variance)
+    p = math.erfc(max(z, 0.0) / math.sqrt(2.0))
+    return u, min(p, 1.0)
+
+
+def classify(change_pct, p_value, threshold=DEFAULT_THRESHOLD, alpha=DEFAULT_ALPHA):
+    """
+    regression / improvement / unchanged; insufficient — медиана изменилась
+    больше порога, но критерий не применим (p = nan).
+    """
+    if math.isnan(p_value) and abs(change_pct) > threshold:
+        return "insufficient"
+    significant = not math.isnan(p_value) and p_value < alpha
+    if significant and change_pct > threshold:
+        return "regression"
+    if significant and change_pct < -threshold:
+        return "improvement"
+    return "unchanged"
+
+
+# --- Базовая линия ---
+
+
+def _snapshot_path(name):
+    return BASELINE_DIR / f"{name}.json"
+
+
+def save_snapshot(store, name):
+    """Сохраняет самые свежие выборки всех точек в data/baselines/<name>.json."""
+    points = []
+    for alg in store.algorithms():
+        for dtype in store.dtypes(alg):
+            for n, record in sorted(store.series(alg, dtype).items()):
+                points.append({"algorithm": alg, "dtype": dtype, "n": n,
+                               "median_ms": record["median_ms"],
+                               "samples": record["samples"]})
+    path = _snapshot_path(name)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps({"host": store.host, "points": points}), encoding="utf-8")
+    return path, len(points)
+
+
+def load_baseline(store, name):
+    """{(алгоритм, dtype, n): выборки} — снимок name или предыдущие замеры (previous)."""
+    if name == "previous":
+        return {
+            (alg, dtype, n): record["samples"]
+            for alg in store.algorithms() for dtype in store.dtypes(alg)
+            for n, record in store.previous_series(alg, dtype).items()
+        }
+
+    path = _snapshot_path(name)
+    if not path.exists():
+        raise FileNotFoundError(
+            f"Нет снимка {path}. Сохрани его: python3 .py/regression.py snapshot --name {name}"
+        )
+    data = json.loads(path.read_text(encoding="utf-8"))
+    if data.get("host") != store.host:
+        print(f"Внимание: снимок {path} снят на другой машине ({data.get('host')}).")
+    return {(p["algorithm"], p["dtype"], p["n"]): p["samples"] for p in data["points"]}
+
+
+def current_samples(store):
+    return {
+        (alg, dtype, n): record["samples"]
+        for alg in store.algorithms() for dtype in store.dtypes(alg)
+        for n, record in store.series(alg, dtype).items()
+    }
+
+
+# --- Сравнение ---
+
+
+def compare(current, baseline, threshold=DEFAULT_THRESHOLD, alpha=DEFAULT_ALPHA):
+    """Строки таблицы различий по точкам, которые есть в обоих наборах."""
+    rows = []
+    for key in sorted(current.keys() & baseline.keys()):
+        alg, dtype, n = key
+        cur = np.asarray(current[key], dtype=float)
+        base = np.asarray(baseline[key], dtype=float)
+        cur_ms, base_ms = float(np.median(cur)), float(np.median(base))
+        change = (cur_ms / base_ms - 1.0) * 100.0 if base_ms > 0 else math.nan
+        _, p = mann_whitney(cur, base)
+        rows.append({
+            "algorithm": alg, "dtype": dtype, "n": n,
+            "baseline_ms": base_ms, "current_ms": cur_ms,
+            "change_pct": change, "p_value": p,
+            "status": classify(change, p, threshold, alpha),
+        })
+    return rows
+
+
+def save_diff(rows, path=DIFF_CSV):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=DIFF_FIELDS)
+        writer.writeheader()
+        writer.writerows(rows)
+    return path
+
+
+def print_diff(rows, verbose=False):
+    """Таблица различий; без verbose — только регрессии, улучшения и insufficient."""
+    shown = [r for r in rows if verbose or r["status"] != "unchanged"]
+    if not shown:
+        return
+    print(f"{'алгоритм':<16}{'dtype':<9}{'n':>6}{'база, мс':>12}{'сейчас, мс':>12}"
+          f"{'изм., %':>9}{'p':>9}  статус")
+    for r in shown:
+        print(f"{r['algorithm']:<16}{r['dtype']:<9}{r['n']:>6}{r['baseline_ms']:>12.4g}"
+              f"{r['current_ms']:>12.4g}{r['change_pct']:>+9.1f}{r['p_value']:>9.3g}  "
+              f"{r['status']}")
+
+
+def plot_diff(rows, threshold, path=DIFF_PNG):
+    """Изменение медианы, %, от n для каждого алгоритма; значимые точки выделены."""
+    from matplotlib.figure import Figure
+
+    colors = {"regression": "tab:red", "improvement": "tab:green",
+              "insufficient": "tab:orange", "unchanged": "tab:gray"}
+    series = {}
+    for r in rows:
+        series.setdefault((r["algorithm"], r["dtype"]), []).append(r)
+
+    fig = Figure(figsize=(9, 6))
+    ax = fig.subplots()
+    for (alg, dtype), points in sorted(series.items()):
+        points.sort(key=lambda r: r["n"])
+        label = alg if dtype == "float64" else f"{alg} [{dtype}]"
+        ax.plot([r["n"] for r in points], [r["change_pct"] for r in points],
+                linewidth=0.8, label=label)
+        for r in points:
+            if r["status"] != "unchanged":
+                ax.plot(r["n"], r["change_pct"], marker="o", linestyle="",
+                        color=colors[r["status"]])
+    ax.axhspan(-threshold, threshold, color="tab:gray", alpha=0.15)
+    ax.axhline(0.0, color="black", linewidth=0.5)
+    ax.set_xscale("log", base=2)
+    ax.set_xlabel("Размер матрицы n")
+    ax.set_ylabel("Изменение медианы, %")
+    ax.set_title(f"Сравнение с базовой линией (порог ±{threshold:g}%, "
+                 "красный — регрессия, зелёный — улучшение,\n"
+                 "оранжевый — изменение больше порога, но мало выборок для проверки)")
+    ax.grid(True, which="both", linestyle="--", linewidth=0.5)
+    ax.legend(fontsize="small", loc="upper left", bbox_to_anchor=(1.02, 1.0))
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fig.savefig(path, bbox_inches="tight")
+    return path
+
+
+def run_compare(baseline="previous", threshold=DEFAULT_THRESHOLD, alpha=DEFAULT_ALPHA,
+                verbose=False) -> dict:
+    """Сравнение с выводом и файлами; возвращает {статус: число точек}."""
+    with ResultsStore() as store:
+        base = load_baseline(store, baseline)
+        current = current_samples(store)
+
+    rows = compare(current, base, threshold, alpha)
+    if not rows:
+        print(f"Нет общих точек с базовой линией {baseline!r}: сравнивать нечего.")
+        return {status: 0 for status in STATUSES}
+
+    print_diff(rows, verbose)
+    counts = {status: sum(r["status"] == status for r in rows) for status in STATUSES}
+    print(f"Базовая линия {baseline!r}: {len(rows)} точек, регрессий {counts['regression']}, "
+          f"улучшений {counts['improvement']}, без изменений {counts['unchanged']}, "
+          f"не проверено {counts['insufficient']} (порог {threshold:g}%, alpha {alpha:g}).")
+    if counts["insufficient"]:
+        print(f"ВНИМАНИЕ: у {counts['insufficient']} точек медиана изменилась больше чем на "
+              f"{threshold:g}%, но выборок меньше двух — критерий не применим. "
+              "Замерь их заново с --repeats >= 2.")
+    print(f"Таблица: {save_diff(rows)}, график: {plot_diff(rows, threshold)}")
+    return counts
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Поиск регрессий производительности")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    snapshot = sub.add_parser("snapshot", help="сохранить текущие замеры как базовую линию")
+    snapshot.add_argument("--name", default="baseline", help="имя снимка (по умолчанию baseline)")
+
+    cmp = sub.add_parser("compare", help="сравнить текущие замеры с базовой линией")
+    cmp.add_argument("--baseline", default="previous",
+                     help="previous (история хранилища) или имя снимка")
+    cmp.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                     help=f"порог изменения медианы, %% (по умолчанию {DEFAULT_THRESHOLD:g})")
+    cmp.add_argument("--alpha", type=float, default=DEFAULT_ALPHA,
+                     help=f"уровень значимости (по умолчанию {DEFAULT_ALPHA:g})")
+    cmp.add_argument("--verbose", action="store_true", help="показать и точки без изменений")
+    args = parser.parse_args(argv)
+
+    if args.command == "snapshot":
+        with ResultsStore() as store:
+            path, count = save_snapshot(store, args.name)
+        print(f"Снимок {path}: {count} точек")
+        return 0
+
+    try:
+        counts = run_compare(args.baseline, args.threshold, args.alpha, args.verbose)
+    except FileNotFoundError as e:
+        print(e)
+        return 2
+    if counts["regression"]:
+        return 1
+    return 3 if counts["insufficient"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,261 @@
+#!/usr/bin/env python3
+"""
+result_cache.py
+Кэш результатов умножения по содержимому операндов.
+
+Ключ — дайджест BLAKE2b (16 байт) от сырых буферов A и B вместе с формой
+и типом элементов, плюс имя движка. Хеширование — один проход по памяти
+(O(n^2)), умножение — O(n^3), поэтому с ростом n кэш окупается всё
+при меньшей доле повторных пар.
+
+Кэш — LRU, ограниченный суммарным размером результатов в байтах:
+при переполнении вытесняются давно не использованные. Счётчики:
+попадания, промахи, вытеснения. Результаты из кэша отдаются только
+для чтения (без копирования), чтобы вызывающий код не испортил
+сохранённое значение; если нужна изменяемая матрица — C.copy().
+
+  cache = ResultCache(max_bytes=256 << 20)
+  multiply = cache.wrap(lambda A, B: A @ B, "numpy")
+  engines = cached_engines(cache)   — numpy и C++-ядра (если собрана библиотека)
+
+Запуск как скрипт — где хеширование дешевле пересчёта:
+  python3 .py/result_cache.py --sizes 16:2048
+Результат: data/csv/cache_breakeven.csv и data/png/cache_breakeven.png
+"""
+
+import argparse
+import csv
+import hashlib
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+import cpp_kernels
+from bench_stats import measure, parse_sizes
+from tuning_profile import PROJECT_ROOT
+
+DATA_DIR = PROJECT_ROOT / "data"
+BREAKEVEN_CSV = DATA_DIR / "csv" / "cache_breakeven.csv"
+BREAKEVEN_PNG = DATA_DIR / "png" / "cache_breakeven.png"
+
+DEFAULT_MAX_BYTES = 256 << 20
+DIGEST_SIZE = 16
+
+BREAKEVEN_FIELDS = ["n", "engine", "hash_ms", "compute_ms", "hit_ms", "miss_ms",
+                    "min_hit_rate"]
+
+
+def digest(*arrays) -> bytes:
+    """Дайджест содержимого массивов: форма, тип и байты каждого."""
+    h = hashlib.blake2b(digest_size=DIGEST_SIZE)
+    for a in arrays:
+        a = np.ascontiguousarray(a)
+        h.update(f"{a.dtype.str}{a.shape}".encode())
+        h.update(a.data)
+    return h.digest()
+
+
+class ResultCache:
+    """LRU-кэш результатов, ограниченный суммарным размером в байтах (потокобезопасный)."""
+
+    def __init__(self, max_bytes=DEFAULT_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.nbytes = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key):
+        """Результат по ключу (и отметка «недавно использован») или None."""
+        with self._lock:
+            result = self._entries.get(key)
+            if result is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return result
+
+    def put(self, key, result):
+        """Сохраняет результат; больше max_bytes — не сохраняется вовсе."""
+        if result.nbytes > self.max_bytes:
+            return result
+        result.setflags(write=False)
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self.nbytes -= old.nbytes
+            self._entries[key] = result
+            self.nbytes += result.nbytes
+            while self.nbytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self.nbytes -= evicted.nbytes
+                self.evictions += 1
+        return result
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.nbytes = 0
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits, "misses": self.misses, "evictions": self.evictions,
+            "entries": len(self._entries), "bytes": self.nbytes, "max_bytes": self.max_bytes,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+    def wrap(self, multiply, name):
+        """multiply(A, B) с кэшем; name отличает движки с разными результатами."""
+        prefix = name.encode()
+
+        def cached(A, B):
+            key = prefix + digest(A, B)
+            result = self.get(key)
+            if result is None:
+                result = self.put(key, np.asarray(multiply(A, B)))
+            return result
+
+        cached.cache = self
+        return cached
+
+
+# --- Замер: когда хеширование дешевле пересчёта ---
+
+
+def engines() -> dict:
+    """Движки для замера: NumPy и, если собрана библиотека, C++ через ctypes."""
+    found = {"numpy": lambda A, B: A @ B}
+    if cpp_kernels.available():
+        found["cpp_standard"] = cpp_kernels.multiply_standard
+        found["cpp_strassen"] = cpp_kernels.strassen
+    return found
+
+
+def cached_engines(cache=None) -> dict:
+    """Те же движки с общим кэшем (по умолчанию — новым ResultCache())."""
+    cache = ResultCache() if cache is None else cache
+    return {name: cache.wrap(multiply, name) for name, multiply in engines().items()}
+
+
+def min_hit_rate(hash_ms, compute_ms, hit_ms):
+    """
+    Доля повторных пар, при которой кэш окупается. Промах стоит
+    hash + compute, попадание — hit, без кэша — compute:
+      p * hit + (1 - p) * (hash + compute) < compute  =>  p > hash / (hash + compute - hit).
+    """
+    gain = hash_ms + compute_ms - hit_ms
+    return min(1.0, hash_ms / gain) if gain > 0 else 1.0
+
+
+def measure_breakeven(sizes, repeats, max_compute_ms=2000.0):
+    """Время хеширования, умножения и попадания в кэш для каждого n и движка."""
+    rows = []
+    rng = np.random.default_rng(0)
+    slow = set()  # движки, которые на прошлом n уже считали дольше max_compute_ms
+    for n in sizes:
+        A, B = rng.random((n, n)), rng.random((n, n))
+        hash_stats, _ = measure(lambda: digest(A, B), repeats=repeats)
+        print(f"n = {n}: хеширование {hash_stats['median']:.4f} ms")
+
+        for name, multiply in engines().items():
+            if name in slow:
+                continue
+            compute, _ = measure(lambda: multiply(A, B), repeats=repeats)
+            cached = ResultCache().wrap(multiply, name)
+            cached(A, B)
+            hit, _ = measure(lambda: cached(A, B), repeats=repeats)
+            hash_ms, compute_ms, hit_ms = hash_stats["median"], compute["median"], hit["median"]
+            rows.append({
+                "n": n, "engine": name, "hash_ms": hash_ms, "compute_ms": compute_ms,
+                "hit_ms": hit_ms, "miss_ms": hash_ms + compute_ms,
+                "min_hit_rate": min_hit_rate(hash_ms, compute_ms, hit_ms),
+            })
+            print(f"  {name}: умножение {compute_ms:.4f} ms, попадание {hit_ms:.4f} ms, "
+                  f"окупается при доле повторов > {rows[-1]['min_hit_rate']:.1%}")
+            if compute_ms > max_compute_ms:
+                slow.add(name)
+    return rows
+
+
+def breakeven_n(rows, engine):
+    """Наименьшее n, с которого хеширование дешевле умножения (None — не нашлось)."""
+    for r in sorted((r for r in rows if r["engine"] == engine), key=lambda r: r["n"]):
+        if r["hash_ms"] < r["compute_ms"]:
+            return r["n"]
+    return None
+
+
+def save_breakeven(rows, path=BREAKEVEN_CSV):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=BREAKEVEN_FIELDS)
+        writer.writeheader()
+        writer.writerows(rows)
+    return path
+
+
+def plot_breakeven(rows, path=BREAKEVEN_PNG):
+    """Слева — время хеширования, умножения и попадания; справа — минимальная доля повторов."""
+    from matplotlib.figure import Figure
+
+    fig = Figure(figsize=(13, 5))
+    ax_time, ax_rate = fig.subplots(1, 2)
+    names = list(dict.fromkeys(r["engine"] for r in rows))
+
+    points = sorted({(r["n"], r["hash_ms"]) for r in rows})
+    ax_time.plot(*zip(*points), "k-", marker="o", markersize=3, label="хеширование A и B")
+    for i, name in enumerate(names):
+        series = sorted((r["n"], r["compute_ms"], r["hit_ms"], r["min_hit_rate"])
+                        for r in rows if r["engine"] == name)
+        n, compute, hit, rate = zip(*series)
+        ax_time.plot(n, compute, "-", marker="o", markersize=3, color=f"C{i}",
+                     label=f"{name}: умножение")
+        ax_time.plot(n, hit, ":", color=f"C{i}", label=f"{name}: попадание в кэш")
+        ax_rate.plot(n, rate, "-", marker="o", markersize=3, color=f"C{i}", label=name)
+        crossing = breakeven_n(rows, name)
+        if crossing is not None:
+            ax_time.axvline(crossing, color=f"C{i}", linestyle="--", linewidth=0.8)
+
+    for ax in (ax_time, ax_rate):
+        ax.set_xscale("log", base=2)
+        ax.set_xlabel("Размер матрицы n")
+        ax.grid(True, which="both", linestyle="--", linewidth=0.5)
+        ax.legend(fontsize="small")
+    ax_time.set_yscale("log")
+    ax_time.set_ylabel("Время, мс")
+    ax_time.set_title("Хеширование и умножение (пунктир — точка безубыточности)")
+    ax_rate.set_ylim(0, 1.05)
+    ax_rate.set_ylabel("Минимальная доля повторных пар")
+    ax_rate.set_title("При какой доле повторов кэш окупается")
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fig.savefig(path, bbox_inches="tight")
+    return path
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Точка безубыточности кэша результатов")
+    parser.add_argument("--sizes", default="16:2048", help="размеры n (по умолчанию 16:2048)")
+    parser.add_argument("--repeats", type=int, default=5, help="число выборок на точку")
+    args = parser.parse_args(argv)
+
+    rows = measure_breakeven(parse_sizes(args.sizes), args.repeats)
+    for name in dict.fromkeys(r["engine"] for r in rows):
+        crossing = breakeven_n(rows, name)
+        if crossing is None:
+            print(f"{name}: хеширование не дешевле умножения ни при одном n")
+        else:
+            print(f"{name}: хеширование дешевле умножения с n = {crossing}")
+    print(f"Таблица: {save_breakeven(rows)}, график: {plot_breakeven(rows)}")
+
+
+if __name__ == "__main__":
+    main()
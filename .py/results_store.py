@@ -0,0 +1,576 @@
+#!/usr/bin/env python3
+"""
+results_store.py
+Постоянное хранилище результатов бенчмарков: data/store/results.sqlite.
+
+Каждый замер хранится под ключом — хешем от
+  (алгоритм, n, dtype, флаги сборки, отпечаток машины, хеш исходников
+   и, для движков NumPy, число потоков BLAS).
+Если ни код ядра, ни флаги сборки, ни машина не менялись, ключ совпадает
+и точку не нужно замерять заново; после правки исходников ключ меняется,
+и точка считается устаревшей. Старые записи не удаляются (история).
+
+У замеров NumPy записаны число потоков BLAS (threads; 0 — не известно,
+нет threadpoolctl) и библиотека (blas); у C++ threads = 0. Основная серия
+точки — самый свежий замер с наибольшим числом потоков среди замеров
+последнего кода и сборки; остальные (benchmark_numpy.py --threads) —
+для графика масштабирования.
+
+Команды:
+  python3 .py/results_store.py cpp --sizes 2:512   — замерить C++ только для недостающих n
+  python3 .py/results_store.py cpp --dtypes float64,float32,int64 — то же для нескольких типов
+  python3 .py/results_store.py export             — выгрузить медианы и GFLOP/s в data/csv/*.csv,
+                                                     все выборки — в data/store/samples.mcol
+  python3 .py/results_store.py status             — что лежит в хранилище
+"""
+
+import argparse
+import csv
+import hashlib
+import json
+import sqlite3
+import subprocess
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+import columnar
+from bench_stats import parse_sizes, summarize
+from tuning_profile import PROJECT_ROOT, cpu_fingerprint, profile_int
+
+PY_DIR = PROJECT_ROOT / ".py"
+DATA_DIR = PROJECT_ROOT / "data"
+CSV_DIR = DATA_DIR / "csv"
+STORE_PATH = DATA_DIR / "store" / "results.sqlite"
+SAMPLES_PATH = DATA_DIR / "store" / "samples.mcol"
+BUILD_DIR = PROJECT_ROOT / "build"
+BENCHMARK_BIN = BUILD_DIR / "benchmark"
+
+# Алгоритмы, которые замеряет build/benchmark (колонки timings.csv)
+CPP_ALGORITHMS = [
+    "standard", "strassen", "standard_flat", "blocked",
+    "strassen_flat", "strassen_peel", "strassen_pad", "winograd",
+]
+
+# ... из них собраны только для double (остальные — для всех DTYPES)
+CPP_FLOAT64_ONLY = {"standard", "strassen", "winograd"}
+# Типы элементов, которые умеют замерять оба бенчмарка (имена dtype NumPy)
+DTYPES = ["float64", "float32", "int64"]
+
+# Размеры по умолчанию: степени двойки и несколько «неудобных» n для Штрассена
+DEFAULT_CPP_SIZES = "2:32,48,64,96,100,127,128"
+
+# Движки benchmark_numpy.py: имя -> файлы .py, от которых зависит результат
+NUMPY_ENGINE_SOURCES = {
+    "numpy": [],
+    "strassen_numpy": ["strassen_numpy.py"],
+}
+# C++-ядра, вызываемые из Python через ctypes (cpp_kernels.py)
+CPP_BINDING_ENGINES = {"cpp_standard", "cpp_strassen"}
+
+# Алгоритмы, результат которых зависит от порога Штрассена: порог входит
+# в ключ замера (winograd берёт его из getStrassenCutoff через WinogradWorkspace)
+CUTOFF_ALGORITHMS = {
+    "strassen", "strassen_flat", "strassen_peel", "strassen_pad", "winograd",
+    "cpp_strassen", "strassen_numpy",
+}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS measurements (
+    key         TEXT PRIMARY KEY,
+    algorithm   TEXT NOT NULL,
+    n           INTEGER NOT NULL,
+    dtype       TEXT NOT NULL,
+    build_flags TEXT NOT NULL,
+    host        TEXT NOT NULL,
+    source_hash TEXT NOT NULL,
+    median_ms   REAL NOT NULL,
+    min_ms      REAL NOT NULL,
+    p95_ms      REAL NOT NULL,
+    ci_low_ms   REAL NOT NULL,
+    ci_high_ms  REAL NOT NULL,
+    repeats     INTEGER NOT NULL,
+    samples     TEXT NOT NULL,
+    created     REAL NOT NULL,
+    threads     INTEGER NOT NULL DEFAULT 0,
+    blas        TEXT NOT NULL DEFAULT ''
+);
+CREATE INDEX IF NOT EXISTS measurements_series
+    ON measurements (host, algorithm, dtype, n, created);
+"""
+
+# Колонки, добавленные после первой версии схемы: в старых хранилищах
+# они дописываются ALTER TABLE при открытии
+ADDED_COLUMNS = {
+    "threads": "INTEGER NOT NULL DEFAULT 0",
+    "blas": "TEXT NOT NULL DEFAULT ''",
+}
+
+
+# --- Контекст замера: флаги сборки и хеш исходников ---
+
+
+def hash_files(paths, extra: str = "") -> str:
+    h = hashlib.sha256(extra.encode("utf-8"))
+    for path in sorted(Path(p) for p in paths):
+        h.update(path.name.encode("utf-8"))
+        h.update(path.read_bytes())
+    return h.hexdigest()[:16]
+
+
+def cpp_sources():
+    return (
+        sorted((PROJECT_ROOT / "include").glob("*.h"))
+        + sorted((PROJECT_ROOT / "src").glob("*.cpp"))
+        + [PROJECT_ROOT / "CMakeLists.txt"]
+    )
+
+
+def cpp_build_flags() -> str:
+    """Компилятор и флаги из build/CMakeCache.txt."""
+    cache_path = BUILD_DIR / "CMakeCache.txt"
+    if not cache_path.exists():
+        return "unbuilt"
+
+    cache = {}
+    for line in cache_path.read_text(encoding="utf-8", errors="replace").splitlines():
+        name, sep, value = line.partition("=")
+        if sep and ":" in name and not line.startswith(("#", "//")):
+            cache[name.split(":", 1)[0]] = value
+
+    build_type = cache.get("CMAKE_BUILD_TYPE", "")
+    parts = [
+        f"type={build_type}",
+        f"cxx={cache.get('CMAKE_CXX_COMPILER', '')}",
+        f"flags={cache.get('CMAKE_CXX_FLAGS', '')}",
+    ]
+    if build_type:
+        parts.append(f"flags_{build_type.lower()}="
+                     f"{cache.get('CMAKE_CXX_FLAGS_' + build_type.upper(), '')}")
+    return ";".join(parts)
+
+
+def cpp_cutoff() -> int:
+    """Порог Штрассена для C++ из профиля проекта: им и замеряем, и подписываем ключ."""
+    return profile_int("cpp_strassen_cutoff", 1)
+
+
+def context_for(algorithm: str) -> tuple[str, str]:
+    """(флаги сборки, хеш исходников) для алгоритма."""
+    if algorithm in NUMPY_ENGINE_SOURCES:
+        flags = f"numpy={np.__version__}"
+        if algorithm in CUTOFF_ALGORITHMS:
+            import strassen_numpy
+            flags += f";cutoff={strassen_numpy.DEFAULT_CUTOFF}"
+        sources = [PY_DIR / name for name in NUMPY_ENGINE_SOURCES[algorithm]]
+        return flags, hash_files(sources, extra=algorithm)
+
+    # C++: и бинарник benchmark, и библиотека для ctypes
+    flags = cpp_build_flags()
+    if algorithm in CUTOFF_ALGORITHMS:
+        flags += f";cutoff={cpp_cutoff()}"
+    return flags, hash_files(cpp_sources())
+
+
+def cutoff_of(record):
+    """Порог Штрассена, с которым сделан замер (из build_flags); None — не записан."""
+    for part in reversed(record["build_flags"].split(";")):  # порог дописан последним
+        name, sep, value = part.partition("=")
+        if sep and name == "cutoff" and value.isdigit():
+            return int(value)
+    return None
+
+
+def measurement_key(algorithm, n, dtype, build_flags, host, source_hash, threads=0) -> str:
+    parts = [algorithm, str(n), dtype, build_flags, host, source_hash]
+    if threads:
+        parts.append(f"threads={threads}")
+    text = "|".join(parts)
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+# --- Хранилище ---
+
+
+class ResultsStore:
+    def __init__(self, path=STORE_PATH):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(self.path)
+        self.conn.executescript(SCHEMA)
+        self._migrate()
+        self.host = cpu_fingerprint()
+        self._contexts = {}
+
+    def _migrate(self):
+        present = {row[1] for row in self.conn.execute("PRAGMA table_info(measurements)")}
+        for name, definition in ADDED_COLUMNS.items():
+            if name not in present:
+                self.conn.execute(f"ALTER TABLE measurements ADD COLUMN {name} {definition}")
+        self.conn.commit()
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def context(self, algorithm):
+        if algorithm not in self._contexts:
+            self._contexts[algorithm] = context_for(algorithm)
+        return self._contexts[algorithm]
+
+    def key(self, algorithm, n, dtype="float64", threads=0):
+        flags, source_hash = self.context(algorithm)
+        return measurement_key(algorithm, n, dtype, flags, self.host, source_hash, threads)
+
+    def has(self, algorithm, n, dtype="float64", threads=0) -> bool:
+        """Есть ли актуальный замер (тот же код, сборка, машина и число потоков)."""
+        row = self.conn.execute(
+            "SELECT 1 FROM measurements WHERE key = ?",
+            (self.key(algorithm, n, dtype, threads),),
+        ).fetchone()
+        return row is not None
+
+    def put(self, algorithm, n, samples, dtype="float64", threads=0, blas=""):
+        """
+        Сохраняет выборки замера (мс на вызов) вместе со статистикой.
+        threads и blas — число потоков и библиотека BLAS (для движков NumPy).
+        """
+        stats = summarize(samples)
+        flags, source_hash = self.context(algorithm)
+        self.conn.execute(
+            "INSERT OR REPLACE INTO measurements (key, algorithm, n, dtype, build_flags, "
+            "host, source_hash, median_ms, min_ms, p95_ms, ci_low_ms, ci_high_ms, repeats, "
+            "samples, created, threads, blas) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                self.key(algorithm, n, dtype, threads), algorithm, n, dtype, flags, self.host,
+                source_hash, stats["median"], stats["min"], stats["p95"],
+                stats["ci_low"], stats["ci_high"], stats["repeats"],
+                json.dumps([float(x) for x in samples]), time.time(), threads, blas,
+            ),
+        )
+        self.conn.commit()
+
+    def _history(self, algorithm, dtype, threads):
+        """{n: записи по времени} — все или только с числом потоков threads."""
+        where, params = ("", ()) if threads is None else (" AND threads = ?", (threads,))
+        cursor = self.conn.execute(
+            "SELECT * FROM measurements WHERE host = ? AND algorithm = ? AND dtype = ?"
+            f"{where} ORDER BY created",
+            (self.host, algorithm, dtype) + params,
+        )
+        names = [d[0] for d in cursor.description]
+        history = {}
+        for values in cursor:
+            record = dict(zip(names, values))
+            record["samples"] = json.loads(record["samples"])
+            history.setdefault(record["n"], []).append(record)
+        return history
+
+    @staticmethod
+    def _main_record(records):
+        """
+        Основная запись точки: среди замеров того же кода и сборки, что у
+        самого свежего, — самая свежая с наибольшим числом потоков. Старый
+        замер с большим числом потоков не перекрывает новый код.
+        """
+        newest = records[-1]
+        same = [r for r in records if (r["build_flags"], r["source_hash"])
+                == (newest["build_flags"], newest["source_hash"])]
+        top = max(r["threads"] for r in same)
+        return [r for r in same if r["threads"] == top][-1]
+
+    def series(self, algorithm, dtype="float64", threads=None) -> dict:
+        """
+        {n: запись} — самый свежий замер каждой точки на этой машине:
+        с числом потоков threads или (None) основной (см. _main_record).
+        Запись — словарь с колонками таблицы (samples — список чисел).
+        """
+        pick = self._main_record if threads is None else (lambda records: records[-1])
+        return {n: pick(records)
+                for n, records in self._history(algorithm, dtype, threads).items()}
+
+    def previous_series(self, algorithm, dtype="float64", threads=None) -> dict:
+        """
+        {n: запись} — замер каждой точки с тем же числом потоков, что у
+        записи из series, предшествующий ей (обычно — до последней правки
+        кода или сборки). Точки без истории не попадают.
+        """
+        latest = self.series(algorithm, dtype, threads)
+        previous = {}
+        for n, records in self._history(algorithm, dtype, threads).items():
+            earlier = [r for r in records if r["created"] < latest[n]["created"]
+                       and r["threads"] == latest[n]["threads"]]
+            if earlier:
+                previous[n] = earlier[-1]
+        return previous
+
+    def medians(self, algorithm, dtype="float64") -> tuple[list[int], list[float]]:
+        """Отсортированные по n списки (n, медиана мс) — для графиков."""
+        series = self.series(algorithm, dtype)
+        n_values = sorted(series)
+        return n_values, [series[n]["median_ms"] for n in n_values]
+
+    def dtypes(self, algorithm) -> list[str]:
+        """Типы элементов, для которых есть замеры алгоритма на этой машине."""
+        rows = self.conn.execute(
+            "SELECT DISTINCT dtype FROM measurements WHERE host = ? AND algorithm = ?",
+            (self.host, algorithm),
+        )
+        return sorted((r[0] for r in rows), key=DTYPES.index)
+
+    def threads_of(self, algorithm, dtype="float64") -> list[int]:
+        """Числа потоков BLAS, с которыми замерялся алгоритм на этой машине."""
+        rows = self.conn.execute(
+            "SELECT DISTINCT threads FROM measurements "
+            "WHERE host = ? AND algorithm = ? AND dtype = ? ORDER BY threads",
+            (self.host, algorithm, dtype),
+        )
+        return [r[0] for r in rows]
+
+    def algorithms(self):
+        rows = self.conn.execute(
+            "SELECT DISTINCT algorithm FROM measurements WHERE host = ? ORDER BY algorithm",
+            (self.host,),
+        )
+        return [r[0] for r in rows]
+
+
+# --- Запуск C++-бенчмарка только для недостающих точек ---
+
+
+def cpp_applicable(algorithm: str, dtype: str) -> bool:
+    return dtype == "float64" or algorithm not in CPP_FLOAT64_ONLY
+
+
+def missing_cpp_sizes(store: ResultsStore, sizes, dtypes=("float64",)) -> list[int]:
+    return [
+        n for n in sizes
+        if any(cpp_applicable(alg, dtype) and not store.has(alg, n, dtype)
+               for alg in CPP_ALGORITHMS for dtype in dtypes)
+    ]
+
+
+def ingest_cpp_samples(store: ResultsStore, samples_path) -> int:
+    """
+    Загружает выборки C++-бенчмарка (timings_samples.mcol: algorithm, n,
+    dtype, repeat, ms) в хранилище; недописанный последний блок пропускается.
+    """
+    columns = columnar.load(samples_path)
+    if not columns:
+        return 0
+    points = np.rec.fromarrays([columns["algorithm"], columns["n"], columns["dtype"]],
+                               names="algorithm,n,dtype")
+    unique, inverse = np.unique(points, return_inverse=True)
+    for i, (algorithm, n, dtype) in enumerate(unique):
+        store.put(str(algorithm), int(n), columns["ms"][inverse == i].tolist(), dtype=str(dtype))
+    return len(unique)
+
+
+# Параметры build/benchmark, которые можно передать через run_cpp: они меняют
+# только точность замера, а не то, что замеряется. Порог, потоки, блоки и
+# режимы (--cutoff, --threads, --block, ...) в ключ замера не входят —
+# такие замеры смешались бы в хранилище с обычными
+PASSTHROUGH_ARGS = {"--repeats", "--warmup", "--min-time"}
+
+
+def check_benchmark_args(extra_args):
+    """Проверяет, что extra_args — только параметры из PASSTHROUGH_ARGS со значениями."""
+    args = list(extra_args)
+    for i in range(0, len(args), 2):
+        if args[i] not in PASSTHROUGH_ARGS or i + 1 >= len(args):
+            raise ValueError(
+                f"Параметр build/benchmark {args[i]!r} не поддерживается при записи "
+                f"в хранилище; допустимы: {', '.join(sorted(PASSTHROUGH_ARGS))} со значением"
+            )
+
+
+def run_cpp(store: ResultsStore, sizes, force=False, extra_args=(), dtypes=("float64",)):
+    check_benchmark_args(extra_args)
+    if not BENCHMARK_BIN.exists():
+        raise FileNotFoundError(
+            f"Не найден {BENCHMARK_BIN}. Сначала собери проект: cmake -B build && cmake --build build"
+        )
+
+    todo = list(sizes) if force else missing_cpp_sizes(store, sizes, dtypes)
+    if not todo:
+        print("C++: все точки актуальны, замер не нужен.")
+        return
+
+    print(f"C++: замеряю n = {', '.join(map(str, todo))}")
+    with tempfile.TemporaryDirectory() as tmp:
+        out = Path(tmp) / "timings.csv"
+        # Порог передаётся явно — тот же, что в ключе замера (context_for);
+        # cwd — корень проекта, где бинарник ищет data/tuning
+        result = subprocess.run(
+            [str(BENCHMARK_BIN), "--sizes", ",".join(map(str, todo)), "--out", str(out),
+             "--dtypes", ",".join(dtypes), "--cutoff", str(cpp_cutoff()), *extra_args],
+            cwd=PROJECT_ROOT,
+        )
+        # Бенчмарк дописывает выборки после каждой точки: даже если он упал,
+        # уже замеренные n сохраняются
+        samples = Path(tmp) / "timings_samples.mcol"
+        count = ingest_cpp_samples(store, samples) if samples.exists() else 0
+    print(f"C++: сохранено точек: {count}")
+    if result.returncode != 0:
+        raise subprocess.CalledProcessError(result.returncode, result.args)
+
+
+def parse_dtypes(text: str) -> list[str]:
+    """"float64,float32" -> ["float64", "float32"] (проверяются по DTYPES)."""
+    dtypes = [x.strip() for x in text.split(",") if x.strip()]
+    unknown = [x for x in dtypes if x not in DTYPES]
+    if unknown or not dtypes:
+        raise ValueError(f"типы элементов: ожидались {', '.join(DTYPES)}, получено {text!r}")
+    return dtypes
+
+
+# --- Выгрузка в CSV для людей и отчёта ---
+
+
+def export_wide_csv(store: ResultsStore, algorithms, path):
+    """CSV вида n,dtype,<алгоритм>_ms,... по медианам из хранилища."""
+    series = {
+        (alg, dtype): store.series(alg, dtype)
+        for alg in algorithms for dtype in store.dtypes(alg)
+    }
+    rows = sorted(
+        {(n, dtype) for (_, dtype), s in series.items() for n in s},
+        key=lambda row: (row[0], DTYPES.index(row[1])),
+    )
+    if not rows:
+        return False
+
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(["n", "dtype"] + [f"{alg}_ms" for alg in algorithms])
+        for n, dtype in rows:
+            writer.writerow(
+                [n, dtype] + [series[alg, dtype][n]["median_ms"]
+                              if n in series.get((alg, dtype), {}) else ""
+                              for alg in algorithms]
+            )
+    return True
+
+
+def export_throughput(store: ResultsStore, path):
+    """
+    CSV algorithm,n,dtype,median_ms,gflops,gbytes_per_s,intensity —
+    производительность по модели работы из roofline.py.
+    """
+    from roofline import throughput
+
+    rows = []
+    for alg in store.algorithms():
+        for dtype in store.dtypes(alg):
+            for n, record in sorted(store.series(alg, dtype).items()):
+                t = throughput(alg, n, record["median_ms"], dtype, cutoff_of(record))
+                if t is not None:
+                    rows.append([alg, n, dtype, record["median_ms"], t["gflops"],
+                                 t["gbytes_per_s"], t["intensity"]])
+    if not rows:
+        return False
+
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(["algorithm", "n", "dtype", "median_ms", "gflops",
+                         "gbytes_per_s", "intensity"])
+        writer.writerows(rows)
+    return True
+
+
+def export_samples(store: ResultsStore, path=SAMPLES_PATH):
+    """
+    Все выборки хранилища (с историей и всеми машинами) в *.mcol: строка —
+    один повтор с метаданными замера. Читается одним вызовом columnar.load.
+    """
+    names = ["algorithm", "n", "dtype", "host", "build_flags", "source_hash",
+             "threads", "blas", "created"]
+    columns = {name: [] for name in names + ["repeat", "ms"]}
+    cursor = store.conn.execute(f"SELECT {', '.join(names)}, samples FROM measurements")
+    for *values, samples in cursor:
+        samples = json.loads(samples)
+        for name, value in zip(names, values):
+            columns[name].extend([value] * len(samples))
+        columns["repeat"].extend(range(len(samples)))
+        columns["ms"].extend(samples)
+    if not columns["ms"]:
+        return False
+    columnar.write(path, {name: np.asarray(values) for name, values in columns.items()})
+    return True
+
+
+def export_all(store: ResultsStore):
+    present = set(store.algorithms())
+    targets = [
+        (CSV_DIR / "timings.csv", CPP_ALGORITHMS),
+        (CSV_DIR / "timings_numpy.csv",
+         list(NUMPY_ENGINE_SOURCES) + sorted(CPP_BINDING_ENGINES)),
+    ]
+    for path, algorithms in targets:
+        algorithms = [alg for alg in algorithms if alg in present]
+        if algorithms and export_wide_csv(store, algorithms, path):
+            print(f"Выгружено: {path}")
+    if export_throughput(store, CSV_DIR / "throughput.csv"):
+        print(f"Выгружено: {CSV_DIR / 'throughput.csv'}")
+    if export_samples(store):
+        print(f"Выгружено: {SAMPLES_PATH}")
+
+
+def print_status(store: ResultsStore):
+    print(f"Хранилище: {store.path}, машина {store.host}")
+    for alg in store.algorithms():
+        for dtype in store.dtypes(alg):
+            series = store.series(alg, dtype)
+            fresh = sum(1 for n, record in series.items()
+                        if store.has(alg, n, dtype, record["threads"]))
+            threads = [t for t in store.threads_of(alg, dtype) if t > 0]
+            blas = f", потоков BLAS: {', '.join(map(str, threads))}" if threads else ""
+            print(f"  {alg} [{dtype}]: {len(series)} точек (актуальных {fresh}), "
+                  f"n = {', '.join(map(str, sorted(series)))}{blas}")
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Хранилище результатов бенчмарков")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    cpp = sub.add_parser("cpp", help="замерить C++ для недостающих n")
+    cpp.add_argument("--sizes", default=DEFAULT_CPP_SIZES)
+    cpp.add_argument("--dtypes", default="float64",
+                     help="типы элементов через запятую: " + ",".join(DTYPES))
+    cpp.add_argument("--force", action="store_true", help="замерить все n заново")
+    cpp.add_argument("benchmark_args", nargs="*",
+                     help="параметры build/benchmark после --: только "
+                     + ", ".join(sorted(PASSTHROUGH_ARGS)))
+
+    sub.add_parser("export", help="выгрузить медианы в data/csv/*.csv")
+    sub.add_parser("status", help="показать содержимое хранилища")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    with ResultsStore() as store:
+        if args.command == "cpp":
+            try:
+                run_cpp(store, parse_sizes(args.sizes), args.force, args.benchmark_args,
+                        parse_dtypes(args.dtypes))
+            except ValueError as e:
+                print(e)
+        elif args.command == "export":
+            export_all(store)
+        elif args.command == "status":
+            print_status(store)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,255 @@
+#!/usr/bin/env python3
+"""
+roofline.py
+Модель работы алгоритмов умножения и пики машины для графика roofline.
+
+Для каждого замеренного алгоритма оцениваются:
+  - число операций с плавающей точкой: 2 m k n для стандартного умножения
+    и BLAS, для Штрассена — фактическое число операций его рекурсии
+    (7 умножений блоков и 18 сложений на уровень, 15 у Винограда,
+    с учётом порога, отсечения и дополнения нулями);
+  - оценка объёма данных, прошедших через память: каждая матрица листа
+    читается/пишется один раз, каждое сложение блоков читает два блока
+    и пишет один.
+
+GFLOP/s = операции / время, интенсивность = операции / байты.
+
+Пики машины меряются небольшим тестом в духе STREAM (copy, scale, add,
+triad на массивах, которые не помещаются в кэш) и умножением A @ B
+на BLAS. Результат сохраняется в профиле машины (tuning_profile.py):
+  python3 .py/roofline.py           — замерить пики, если их нет в профиле
+  python3 .py/roofline.py --force   — замерить заново
+"""
+
+import argparse
+
+import numpy as np
+
+from bench_stats import measure
+from tuning_profile import load_profile, profile_int, save_profile
+
+# Стандартное умножение: 2 m k n операций
+CLASSIC = {"standard", "standard_flat", "blocked", "numpy", "cpp_standard"}
+
+# Ключи профиля с пиками машины
+PEAK_KEYS = ["peak_gflops", "stream_copy_gbps", "stream_scale_gbps",
+             "stream_add_gbps", "stream_triad_gbps"]
+
+STREAM_ELEMENTS = 1 << 23  # 64 МБ на массив float64 — заведомо больше кэша
+PEAK_SIZES = (512, 1024, 2048)
+
+
+# --- Модель работы: (операции, байты) ---
+
+
+def classic_work(m, k, n, itemsize):
+    return 2.0 * m * k * n, float(m * k + k * n + m * n) * itemsize
+
+
+def _add_bytes(elements, itemsize):
+    """Сложение блоков: два чтения и одна запись."""
+    return 3.0 * elements * itemsize
+
+
+def strassen_work(m, k, n, cutoff, itemsize, odd="auto"):
+    """
+    Штрассен на представлениях (strassenRec, strassen_numpy.strassen):
+    odd — "peel", "pad" или "auto" (как выберет модель стоимости).
+    """
+    from strassen_numpy import padded_shape, prefers_padding
+
+    if odd == "auto":
+        odd = "pad" if prefers_padding(m, k, n, cutoff) else "peel"
+    if odd == "pad":
+        mp, kp, np_ = padded_shape(m, k, n, cutoff)
+        if (mp, kp, np_) != (m, k, n):
+            flops, nbytes = _strassen_peel(mp, kp, np_, cutoff, itemsize)
+            # Копирование A и B в дополненные буферы и результата обратно
+            return flops, nbytes + 2.0 * (m * k + k * n + m * n) * itemsize
+    return _strassen_peel(m, k, n, cutoff, itemsize)
+
+
+def _strassen_peel(m, k, n, cutoff, itemsize):
+    if min(m, k, n) <= cutoff:
+        return classic_work(m, k, n, itemsize)
+
+    flops = nbytes = 0.0
+    if (m | k | n) & 1:
+        me, ke, ne = m & ~1, k & ~1, n & ~1
+        flops, nbytes = _strassen_peel(me, ke, ne, cutoff, itemsize)
+        if ke < k:
+            flops += 2.0 * me * ne
+            nbytes += (me + ne + 2.0 * me * ne) * itemsize
+        if ne < n:
+            fixup = classic_work(m, k, 1, itemsize)
+            flops, nbytes = flops + fixup[0], nbytes + fixup[1]
+        if me < m:
+            fixup = classic_work(1, k, ne, itemsize)
+            flops, nbytes = flops + fixup[0], nbytes + fixup[1]
+        return flops, nbytes
+
+    hm, hk, hn = m // 2, k // 2, n // 2
+    sub_flops, sub_bytes = _strassen_peel(hm, hk, hn, cutoff, itemsize)
+    adds = 5 * hm * hk + 5 * hk * hn + 8 * hm * hn
+    return 7 * sub_flops + adds, 7 * sub_bytes + _add_bytes(adds, itemsize)
+
+
+def matrix_strassen_work(n, cutoff, itemsize):
+    """
+    Штрассен на Matrix (вектор векторов): нечётный n дополняется до n + 1,
+    блоки копируются при разбиении и сборке.
+    """
+    if n <= cutoff:
+        return classic_work(n, n, n, itemsize)
+    if n & 1:
+        flops, nbytes = matrix_strassen_work(n + 1, cutoff, itemsize)
+        return flops, nbytes + 2.0 * (3 * n * n) * itemsize
+
+    h = n // 2
+    sub_flops, sub_bytes = matrix_strassen_work(h, cutoff, itemsize)
+    adds = 18 * h * h
+    copies = 2.0 * 3 * n * n  # splitMatrix(A), splitMatrix(B), joinMatrix
+    return 7 * sub_flops + adds, 7 * sub_bytes + _add_bytes(adds, itemsize) + copies * itemsize
+
+
+def winograd_work(n, cutoff, itemsize):
+    """Штрассен–Виноград: 15 сложений на уровень, нечётный n — сразу лист."""
+    if n <= cutoff or n & 1:
+        return classic_work(n, n, n, itemsize)
+    h = n // 2
+    sub_flops, sub_bytes = winograd_work(h, cutoff, itemsize)
+    adds = 15 * h * h
+    return 7 * sub_flops + adds, 7 * sub_bytes + _add_bytes(adds, itemsize)
+
+
+def work(algorithm, n, dtype="float64", cutoff=None):
+    """
+    (операции, байты) для умножения n x n; None, если модели для алгоритма нет.
+    cutoff — порог Штрассена, с которым сделан замер (results_store.cutoff_of);
+    None — текущий: из профиля для C++, DEFAULT_CUTOFF для strassen_numpy.
+    """
+    itemsize = np.dtype(dtype).itemsize
+    if algorithm in CLASSIC:
+        return classic_work(n, n, n, itemsize)
+    if algorithm == "strassen_numpy":
+        import strassen_numpy
+
+        return strassen_work(n, n, n, cutoff or strassen_numpy.DEFAULT_CUTOFF, itemsize)
+
+    cpp_cutoff = cutoff or profile_int("cpp_strassen_cutoff", 1)
+    if algorithm == "strassen":
+        return matrix_strassen_work(n, cpp_cutoff, itemsize)
+    if algorithm in ("strassen_flat", "cpp_strassen"):
+        return strassen_work(n, n, n, cpp_cutoff, itemsize)
+    if algorithm == "strassen_peel":
+        return strassen_work(n, n, n, cpp_cutoff, itemsize, odd="peel")
+    if algorithm == "strassen_pad":
+        return strassen_work(n, n, n, cpp_cutoff, itemsize, odd="pad")
+    if algorithm == "winograd":
+        return winograd_work(n, cpp_cutoff, itemsize)
+    return None
+
+
+def throughput(algorithm, n, median_ms, dtype="float64", cutoff=None):
+    """
+    {"flops", "bytes", "gflops", "gbytes_per_s", "intensity"} для замера;
+    None, если модели для алгоритма нет. cutoff — как в work().
+    """
+    result = work(algorithm, n, dtype, cutoff)
+    if result is None or median_ms <= 0:
+        return None
+    flops, nbytes = result
+    seconds = median_ms / 1000.0
+    return {
+        "flops": flops,
+        "bytes": nbytes,
+        "gflops": flops / seconds / 1e9,
+        "gbytes_per_s": nbytes / seconds / 1e9,
+        "intensity": flops / nbytes,
+    }
+
+
+# --- Пики машины ---
+
+
+def stream_probe(elements=STREAM_ELEMENTS, repeats=5):
+    """
+    Пропускная способность памяти, ГБ/с, по четырём ядрам STREAM.
+    Байты считаются, как в STREAM (без чтения перед записью); triad
+    в NumPy — два прохода (c = 3 b; c += a), поэтому у него 5 массивов.
+    """
+    a = np.full(elements, 1.0)
+    b = np.full(elements, 2.0)
+    c = np.zeros(elements)
+    size = a.nbytes
+
+    def triad():
+        np.multiply(b, 3.0, out=c)
+        np.add(c, a, out=c)
+
+    kernels = {
+        "copy": (lambda: np.copyto(c, a), 2 * size),
+        "scale": (lambda: np.multiply(a, 3.0, out=c), 2 * size),
+        "add": (lambda: np.add(a, b, out=c), 3 * size),
+        "triad": (triad, 5 * size),
+    }
+    result = {}
+    for name, (kernel, nbytes) in kernels.items():
+        stats, _ = measure(kernel, repeats=repeats, min_time_ms=20.0)
+        result[name] = nbytes / (stats["min"] / 1000.0) / 1e9
+    return result
+
+
+def peak_probe(sizes=PEAK_SIZES, repeats=3):
+    """Пиковая производительность, GFLOP/s: лучшее A @ B (BLAS, float64)."""
+    best = 0.0
+    for n in sizes:
+        A = np.random.rand(n, n)
+        B = np.random.rand(n, n)
+        stats, _ = measure(lambda: A @ B, repeats=repeats, min_time_ms=20.0)
+        best = max(best, 2.0 * n ** 3 / (stats["min"] / 1000.0) / 1e9)
+    return best
+
+
+def machine_peaks(profile=None):
+    """Пики из профиля: (GFLOP/s, лучшая пропускная способность ГБ/с) или None."""
+    if profile is None:
+        profile = load_profile()
+    try:
+        peak = float(profile["peak_gflops"])
+        bandwidth = max(float(profile[key]) for key in PEAK_KEYS[1:])
+    except (KeyError, ValueError):
+        return None
+    return peak, bandwidth
+
+
+def probe(force=False):
+    """Меряет пики и записывает их в профиль (если их там нет или force)."""
+    if not force and machine_peaks() is not None:
+        print("Пики машины уже есть в профиле (--force — замерить заново).")
+        return machine_peaks()
+
+    print("Замер пропускной способности памяти (STREAM) ...")
+    bandwidth = stream_probe()
+    for name, gbps in bandwidth.items():
+        print(f"  {name:<6} {gbps:8.2f} ГБ/с")
+    print("Замер пиковой производительности (A @ B, float64) ...")
+    peak = peak_probe()
+    print(f"  пик    {peak:8.2f} GFLOP/s")
+
+    values = {"peak_gflops": f"{peak:.3f}"}
+    values.update({f"stream_{name}_gbps": f"{gbps:.3f}" for name, gbps in bandwidth.items()})
+    path = save_profile(values)
+    print(f"Профиль обновлён: {path}")
+    return machine_peaks()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Пики машины для графика roofline")
+    parser.add_argument("--force", action="store_true", help="замерить заново")
+    args = parser.parse_args(argv)
+    probe(args.force)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,450 @@
+#!/usr/bin/env python3
+"""
+sparse_numpy.py
+Разреженное умножение на NumPy — пара к src/sparse.cpp.
+
+Форматы: CsrMatrix (по строкам: row_ptr, col_idx, values) и CscMatrix
+(по столбцам: col_ptr, row_idx, values); CSC матрицы B — это CSR матрицы B^T.
+
+  csr_dense — A разреженная, B плотная: для каждой непустой строки A —
+              одно умножение вектора ненулевых на выбранные строки B;
+  dense_csc — A плотная, B разреженная: то же для C^T = B^T A^T;
+  csr_csr   — обе разреженные, векторно: произведения всех пар ненулевых
+              A(i, k), B(k, j), затем сложение совпадающих (i, j);
+              чтобы не расходовать память, строки A идут порциями.
+
+multiply() оценивает плотность операндов выборкой и выбирает ядро так же,
+как multiplyAuto в C++: порог плотности, затем грубая модель стоимости.
+Порог берётся из профиля автонастройки (numpy_sparse_threshold).
+
+Запуск как скрипт — замер ядер по плотности (и C++: benchmark --densities):
+  python3 .py/sparse_numpy.py --sizes 256,512,1024 --densities 0.001,0.01,0.1,1
+  python3 .py/sparse_numpy.py --cpp --save   — то же с C++ и записью порогов в профиль
+Результат: data/csv/sparse_density_numpy.csv, data/csv/sparse_density_cpp.csv,
+data/png/sparse_density.png
+"""
+
+import argparse
+import csv
+import subprocess
+
+import numpy as np
+
+from bench_stats import measure, parse_sizes
+from tuning_profile import PROJECT_ROOT, profile_float, save_profile
+
+try:
+    import scipy.sparse as scipy_sparse
+except ImportError:  # scipy необязателен: без него нет эталонного движка scipy_csr
+    scipy_sparse = None
+
+DATA_DIR = PROJECT_ROOT / "data"
+NUMPY_CSV = DATA_DIR / "csv" / "sparse_density_numpy.csv"
+CPP_CSV = DATA_DIR / "csv" / "sparse_density_cpp.csv"
+DENSITY_PNG = DATA_DIR / "png" / "sparse_density.png"
+BENCHMARK_BIN = PROJECT_ROOT / "build" / "benchmark"
+
+# Операнд с плотностью ниже порога считается разреженным.
+# Берётся из профиля (подбирается этим скриптом с --save)
+DEFAULT_THRESHOLD = profile_float("numpy_sparse_threshold", 0.05)
+
+# Сколько произведений пар csr_csr обрабатывается за раз
+CHUNK_ELEMENTS = 1 << 22
+
+# Грубая модель стоимости в «умножениях-сложениях» вектора NumPy (~1 нс):
+# сжатие — np.nonzero по всей матрице; csr_dense и dense_csc — умножения
+# плюс вызов NumPy на каждую непустую строку; dense_csc ещё копирует A^T
+# и C^T (транспонирование с копией дорого); csr_csr — сортировка ключей
+# произведений пар и сборка плотного C
+CONVERT_PENALTY = 8.0
+AXPY_PENALTY = 1.0
+ROW_PENALTY = 5000.0
+TRANSPOSE_PENALTY = 15.0
+PRODUCT_PENALTY = 100.0
+COPY_PENALTY = 4.0
+
+SWEEP_FIELDS = ["n", "density", "algorithm", "ms", "min_ms", "p95_ms", "kernel"]
+
+
+class CsrMatrix:
+    """Разреженная матрица по строкам: строка i — values[row_ptr[i]:row_ptr[i + 1]]."""
+
+    def __init__(self, shape, row_ptr, col_idx, values):
+        self.shape = tuple(shape)
+        self.row_ptr = row_ptr
+        self.col_idx = col_idx
+        self.values = values
+
+    @property
+    def nnz(self) -> int:
+        return len(self.values)
+
+    @property
+    def dtype(self):
+        return self.values.dtype
+
+    def density(self) -> float:
+        size = self.shape[0] * self.shape[1]
+        return self.nnz / size if size else 0.0
+
+    def transpose(self) -> "CscMatrix":
+        """A^T в CSC — те же массивы, без копирования."""
+        return CscMatrix(self.shape[::-1], self.row_ptr, self.col_idx, self.values)
+
+    def to_dense(self, out=None):
+        C = np.zeros(self.shape, dtype=self.dtype) if out is None else out
+        if out is not None:
+            C[...] = 0
+        rows = np.repeat(np.arange(self.shape[0]), np.diff(self.row_ptr))
+        C[rows, self.col_idx] = self.values
+        return C
+
+
+class CscMatrix:
+    """Разреженная матрица по столбцам: столбец j — values[col_ptr[j]:col_ptr[j + 1]]."""
+
+    def __init__(self, shape, col_ptr, row_idx, values):
+        self.shape = tuple(shape)
+        self.col_ptr = col_ptr
+        self.row_idx = row_idx
+        self.values = values
+
+    @property
+    def nnz(self) -> int:
+        return len(self.values)
+
+    @property
+    def dtype(self):
+        return self.values.dtype
+
+    def density(self) -> float:
+        size = self.shape[0] * self.shape[1]
+        return self.nnz / size if size else 0.0
+
+    def transpose(self) -> CsrMatrix:
+        """A^T в CSR — те же массивы, без копирования."""
+        return CsrMatrix(self.shape[::-1], self.col_ptr, self.row_idx, self.values)
+
+
+def _pointers(index, length):
+    """row_ptr/col_ptr по отсортированным индексам строк/столбцов."""
+    ptr = np.zeros(length + 1, dtype=np.int64)
+    np.cumsum(np.bincount(index, minlength=length), out=ptr[1:])
+    return ptr
+
+
+def to_csr(A) -> CsrMatrix:
+    A = np.asarray(A)
+    rows, cols = np.nonzero(A)
+    return CsrMatrix(A.shape, _pointers(rows, A.shape[0]), cols, A[rows, cols])
+
+
+def to_csc(A) -> CscMatrix:
+    return to_csr(np.asarray(A).T).transpose()
+
+
+def csr_dense(A: CsrMatrix, B, out=None):
+    """C = A B, A — CSR, B — плотная. Строки без ненулевых остаются нулевыми."""
+    C = np.zeros((A.shape[0], B.shape[1]), dtype=np.result_type(A.dtype, B)) \
+        if out is None else out
+    if out is not None:
+        C[...] = 0
+
+    # Цикл по непустым строкам быстрее, чем один массив вкладов nnz x n
+    # с np.add.reduceat: тот упирается в память уже при nnz ~ n
+    row_ptr, col_idx, values = A.row_ptr, A.col_idx, A.values
+    for i in np.flatnonzero(np.diff(row_ptr)):
+        s, e = row_ptr[i], row_ptr[i + 1]
+        C[i] = values[s:e] @ B[col_idx[s:e]]
+    return C
+
+
+def dense_csc(A, B: CscMatrix, out=None):
+    """C = A B, B — CSC: C^T = B^T A^T, где B^T — CSR с теми же массивами."""
+    # A^T и C^T переводятся в непрерывные массивы: две копии n^2 дешевле,
+    # чем выборка столбцов A и запись столбцов C с шагом в каждой строке
+    Ct = csr_dense(B.transpose(), np.ascontiguousarray(np.asarray(A).T))
+    if out is None:
+        return np.ascontiguousarray(Ct.T)
+    out[...] = Ct.T
+    return out
+
+
+def csr_csr(A: CsrMatrix, B: CsrMatrix) -> CsrMatrix:
+    """C = A B, обе CSR: каждая пара A(i, k), B(k, j) даёт вклад в C(i, j)."""
+    m, n = A.shape[0], B.shape[1]
+    per_nnz = np.diff(B.row_ptr)[A.col_idx]           # вкладов от каждого ненулевого A
+    row_of = np.repeat(np.arange(m), np.diff(A.row_ptr))
+    done = np.concatenate([[0], np.cumsum(per_nnz)])  # вкладов до ненулевого p
+    keys_parts, value_parts = [], []
+
+    first = 0
+    while first < m:
+        # Порция строк A, в которой не больше CHUNK_ELEMENTS вкладов
+        target = done[A.row_ptr[first]] + CHUNK_ELEMENTS
+        last = int(np.searchsorted(done[A.row_ptr[1:]], target, side="right"))
+        last = min(m, max(first + 1, last))
+        s, e = A.row_ptr[first], A.row_ptr[last]
+        counts = per_nnz[s:e]
+        total = int(counts.sum())
+        first = last
+        if total == 0:
+            continue
+
+        offsets = np.arange(total) - np.repeat(np.cumsum(counts) - counts, counts)
+        pos = np.repeat(B.row_ptr[A.col_idx[s:e]], counts) + offsets
+        keys = np.repeat(row_of[s:e], counts) * n + B.col_idx[pos]
+        values = np.repeat(A.values[s:e], counts) * B.values[pos]
+
+        # Совпадающие (строка, столбец) складываются; порядок ключей — по строкам
+        order = np.argsort(keys, kind="stable")
+        keys, values = keys[order], values[order]
+        heads = np.flatnonzero(np.concatenate([[True], keys[1:] != keys[:-1]]))
+        keys_parts.append(keys[heads])
+        value_parts.append(np.add.reduceat(values, heads))
+
+    dtype = np.result_type(A.dtype, B.dtype)
+    keys = np.concatenate(keys_parts) if keys_parts else np.zeros(0, dtype=np.int64)
+    values = np.concatenate(value_parts) if value_parts else np.zeros(0, dtype=dtype)
+    return CsrMatrix((m, n), _pointers(keys // n, m), keys % n, values)
+
+
+def estimate_density(A, samples: int = 1024) -> float:
+    """Доля ненулевых по samples случайным позициям (фиксированное зерно)."""
+    A = np.asarray(A)
+    if A.size <= samples:
+        return np.count_nonzero(A) / A.size if A.size else 0.0
+    rng = np.random.default_rng(12345)
+    pos = rng.integers(0, A.size, samples)
+    rows, cols = np.divmod(pos, A.shape[1])
+    return np.count_nonzero(A[rows, cols]) / samples
+
+
+def choose_kernel(m, k, n, density_a, density_b, threshold=None) -> str:
+    """dense, csr_dense, dense_csc или csr_csr — как chooseKernel в src/sparse.cpp."""
+    threshold = DEFAULT_THRESHOLD if threshold is None else threshold
+    sparse_a, sparse_b = density_a < threshold, density_b < threshold
+    size_a, size_b, size_c = m * k, k * n, m * n
+    flops = size_a * n
+
+    costs = {}
+    if sparse_a:
+        costs["csr_dense"] = (CONVERT_PENALTY * size_a + AXPY_PENALTY * density_a * flops
+                              + ROW_PENALTY * m * min(1.0, density_a * k))
+    if sparse_b:
+        costs["dense_csc"] = (CONVERT_PENALTY * size_b + AXPY_PENALTY * density_b * flops
+                              + ROW_PENALTY * n * min(1.0, density_b * k)
+                              + TRANSPOSE_PENALTY * (size_a + size_c))
+    if sparse_a and sparse_b:
+        costs["csr_csr"] = (CONVERT_PENALTY * (size_a + size_b) + COPY_PENALTY * size_c
+                            + PRODUCT_PENALTY * density_a * density_b * flops)
+    return min(costs, key=costs.get) if costs else "dense"
+
+
+def select_kernel(A, B, threshold=None) -> str:
+    """Ядро, которое multiply() выберет для A и B."""
+    return choose_kernel(A.shape[0], A.shape[1], B.shape[1],
+                         estimate_density(A), estimate_density(B), threshold)
+
+
+def multiply(A, B, threshold=None):
+    """C = A B плотная; разреженные операнды сжимаются (время входит в вызов)."""
+    A, B = np.asarray(A), np.asarray(B)
+    kernel = select_kernel(A, B, threshold)
+    if kernel == "csr_dense":
+        return csr_dense(to_csr(A), B)
+    if kernel == "dense_csc":
+        return dense_csc(A, to_csc(B))
+    if kernel == "csr_csr":
+        return csr_csr(to_csr(A), to_csr(B)).to_dense()
+    return A @ B
+
+
+# --- Замер по плотности ---
+
+
+# Движки замера: плотный BLAS, три ядра (со сжатием операндов) и выбор ядра
+ENGINES = {
+    "dense": lambda A, B: A @ B,
+    "csr_dense": lambda A, B: csr_dense(to_csr(A), B),
+    "dense_csc": lambda A, B: dense_csc(A, to_csc(B)),
+    "csr_csr": lambda A, B: csr_csr(to_csr(A), to_csr(B)).to_dense(),
+    "auto": multiply,
+}
+if scipy_sparse is not None:
+    ENGINES["scipy_csr"] = lambda A, B: scipy_sparse.csr_matrix(A) @ B
+
+
+def sparse_operand(n, density, rng):
+    """n x n, каждый элемент с вероятностью density — из [1, 10), иначе 0."""
+    A = rng.uniform(1.0, 10.0, (n, n))
+    A[rng.random((n, n)) >= density] = 0.0
+    return A
+
+
+def sweep_numpy(sizes, densities, repeats):
+    rng = np.random.default_rng(0)
+    rows = []
+    for n in sizes:
+        for density in densities:
+            A, B = sparse_operand(n, density, rng), sparse_operand(n, density, rng)
+            print(f"n = {n}, плотность {density:g}")
+            for name, engine in ENGINES.items():
+                stats, _ = measure(lambda: engine(A, B), repeats=repeats)
+                kernel = select_kernel(A, B) if name == "auto" else name
+                rows.append({"n": n, "density": density, "algorithm": name,
+                             "ms": stats["median"], "min_ms": stats["min"],
+                             "p95_ms": stats["p95"], "kernel": kernel})
+                suffix = f" (ядро {kernel})" if name == "auto" else ""
+                print(f"  {name}: {stats['median']:.4f} ms{suffix}")
+    return rows
+
+
+def sweep_cpp(sizes, densities, repeats):
+    if not BENCHMARK_BIN.exists():
+        raise FileNotFoundError(
+            f"Не найден {BENCHMARK_BIN}. Сначала собери проект: cmake -B build && cmake --build build"
+        )
+    CPP_CSV.parent.mkdir(parents=True, exist_ok=True)
+    # cwd — корень проекта: бинарник читает порог разреженности и порог
+    # Штрассена из data/tuning относительно текущего каталога
+    subprocess.run(
+        [
+            str(BENCHMARK_BIN),
+            "--sizes", ",".join(map(str, sizes)),
+            "--densities", ",".join(map(str, densities)),
+            "--repeats", str(repeats),
+            "--out", str(CPP_CSV),
+        ],
+        check=True,
+        cwd=PROJECT_ROOT,
+    )
+    return read_sweep(CPP_CSV)
+
+
+def save_sweep(rows, path):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=SWEEP_FIELDS)
+        writer.writeheader()
+        writer.writerows(rows)
+    return path
+
+
+def read_sweep(path):
+    with open(path, encoding="utf-8") as f:
+        return [
+            {**row, "n": int(row["n"]), "density": float(row["density"]),
+             "ms": float(row["ms"]), "min_ms": float(row["min_ms"]),
+             "p95_ms": float(row["p95_ms"])}
+            for row in csv.DictReader(f)
+        ]
+
+
+def fit_threshold(rows, n, dense="dense", kernels=("csr_dense", "dense_csc", "csr_csr")):
+    """
+    Порог плотности по замеру для размера n: наибольшая плотность, до которой
+    (включительно) лучшее разреженное ядро быстрее плотного. Порог сравнивается
+    строго (density < threshold), поэтому берётся середина между этой
+    плотностью и следующей замеренной. None — разреженные ядра не выигрывают.
+    """
+    times = {(r["density"], r["algorithm"]): r["ms"] for r in rows if r["n"] == n}
+    densities = sorted({d for d, _ in times})
+
+    def sparse_wins(d):
+        best = min((times[(d, k)] for k in kernels if (d, k) in times), default=None)
+        return best is not None and (d, dense) in times and best < times[(d, dense)]
+
+    last = None
+    for i, d in enumerate(densities):
+        if not sparse_wins(d):
+            break
+        last = i
+    if last is None:
+        return None
+    if last + 1 < len(densities):
+        return (densities[last] + densities[last + 1]) / 2
+    return 1.0
+
+
+def plot_sweep(families, thresholds, path=DENSITY_PNG):
+    """Время от плотности: по графику на каждое n, NumPy — сплошные линии, C++ — пунктир."""
+    from matplotlib.figure import Figure
+
+    sizes = sorted({r["n"] for rows in families.values() for r in rows})
+    fig = Figure(figsize=(6 * len(sizes), 5))
+    axes = fig.subplots(1, len(sizes), squeeze=False)[0]
+    styles = {"numpy": "-", "cpp": "--"}
+
+    for ax, n in zip(axes, sizes):
+        for family, rows in families.items():
+            algorithms = list(dict.fromkeys(r["algorithm"] for r in rows))
+            for i, alg in enumerate(algorithms):
+                points = sorted((r["density"], r["ms"]) for r in rows
+                                if r["n"] == n and r["algorithm"] == alg)
+                if points:
+                    ax.plot(*zip(*points), styles[family], marker="o", markersize=3,
+                            color=f"C{i}", label=f"{family}: {alg}")
+            threshold = thresholds.get(family)
+            if threshold is not None:
+                ax.axvline(threshold, color="gray", linestyle=styles[family], linewidth=0.8)
+        ax.set_xscale("log")
+        ax.set_yscale("log")
+        ax.set_xlabel("Доля ненулевых элементов")
+        ax.set_ylabel("Время, мс")
+        ax.set_title(f"n = {n}")
+        ax.grid(True, which="both", linestyle="--", linewidth=0.5)
+    axes[-1].legend(fontsize="small", loc="upper left", bbox_to_anchor=(1.02, 1.0))
+    fig.suptitle("Плотные и разреженные ядра (серые линии — подобранный порог)")
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fig.savefig(path, bbox_inches="tight")
+    return path
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Замер разреженных ядер по плотности")
+    parser.add_argument("--sizes", default="256,512,1024", help="размеры n")
+    parser.add_argument("--densities", default="0.001,0.003,0.01,0.03,0.1,0.3,1",
+                        help="доли ненулевых через запятую")
+    parser.add_argument("--repeats", type=int, default=5, help="число выборок на точку")
+    parser.add_argument("--cpp", action="store_true",
+                        help="замерить и C++ (build/benchmark --densities)")
+    parser.add_argument("--save", action="store_true",
+                        help="записать подобранные пороги в профиль автонастройки")
+    args = parser.parse_args(argv)
+
+    sizes = parse_sizes(args.sizes)
+    densities = [float(x) for x in args.densities.split(",") if x]
+    if any(not 0.0 <= d <= 1.0 for d in densities):
+        parser.error("--densities: доли должны быть в [0, 1]")
+
+    families = {"numpy": sweep_numpy(sizes, densities, args.repeats)}
+    save_sweep(families["numpy"], NUMPY_CSV)
+    if args.cpp:
+        families["cpp"] = sweep_cpp(sizes, densities, args.repeats)
+
+    # В профиль идёт порог для наибольшего n: на малых матрицах плотное
+    # ядро и так быстрое, и ошибка выбора стоит немного
+    thresholds = {}
+    for family, rows in families.items():
+        for n in sorted(sizes):
+            found = fit_threshold(rows, n)
+            if found is None:
+                print(f"{family}, n = {n}: разреженные ядра не быстрее плотного")
+            else:
+                print(f"{family}, n = {n}: разреженные ядра быстрее плотного "
+                      f"при плотности < {found:g}")
+        thresholds[family] = found
+
+    if args.save:
+        values = {f"{family}_sparse_threshold": 0.0 if t is None else round(t, 6)
+                  for family, t in thresholds.items()}
+        print(f"Профиль автонастройки сохранён: {save_profile(values)}")
+
+    print(f"Таблицы: {', '.join(str(p) for p in [NUMPY_CSV] + ([CPP_CSV] if args.cpp else []))}")
+    print(f"График: {plot_sweep(families, thresholds)}")
+
+
+if __name__ == "__main__":
+    main()
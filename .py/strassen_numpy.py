@@ -0,0 +1,296 @@
+#!/usr/bin/env python3
+"""
+strassen_numpy.py
+Алгоритм Штрассена на NumPy — аналог strassenRec из src/strassen.cpp.
+
+Отличия от C++-версии:
+  - блоки A11..A22, B11..B22, C11..C22 — срезы (view), а не копии;
+  - ниже порога cutoff рекурсия останавливается и вызывается A @ B (BLAS);
+  - размеры любые (m x k на k x n): нечётные размеры обрабатываются
+    отсечением последней строки/столбца или дополнением нулями —
+    что дешевле по модели стоимости (prefers_padding);
+  - временные матрицы для сумм блоков и M1..M7 берутся из заранее
+    выделенных буферов (по одному набору на уровень рекурсии),
+    поэтому внутри рекурсии память не выделяется.
+"""
+
+import numpy as np
+
+from tuning_profile import profile_int
+
+# Размер блока, ниже которого считаем через A @ B.
+# Берётся из профиля автонастройки этой машины (.py/autotune.py), если он есть.
+DEFAULT_CUTOFF = profile_int("numpy_strassen_cutoff", 128)
+
+
+# Грубая модель стоимости для выбора между отсечением и дополнением
+# (как в src/strassen.cpp), в «умножениях-сложениях BLAS»: тонкое умножение
+# строки/столбца, сложение блоков и копирование обходятся примерно во столько
+# операций на элемент
+PEEL_PENALTY = 4.0
+ADD_PENALTY = 2.0
+COPY_PENALTY = 2.0
+
+
+def _next_level(m, k, n):
+    """Размеры на следующем уровне: чётная часть, делённая пополам."""
+    return m // 2, k // 2, n // 2
+
+
+class Workspace:
+    """
+    Набор буферов для всех уровней рекурсии (A: m x k, B: k x n).
+    На уровне с блоками h_m x h_k и h_k x h_n нужны три буфера:
+      ta — сумма/разность блоков A (h_m x h_k),
+      tb — сумма/разность блоков B (h_k x h_n),
+      m  — очередное произведение M1..M7 (h_m x h_n).
+    По умолчанию матрицы квадратные: inner = cols = n.
+    Буферы годятся только для тех же размеров, порога и типа (см. check).
+    """
+
+    def __init__(self, n: int, cutoff: int, dtype, inner: int = None, cols: int = None):
+        m, k, p = n, inner or n, cols or n
+        self.shape = (m, k, p)
+        self.cutoff = cutoff
+        self.dtype = np.dtype(dtype)
+        self.levels = []
+        while min(m, k, p) > cutoff:
+            m, k, p = _next_level(m, k, p)
+            self.levels.append(
+                (
+                    np.empty((m, k), dtype=dtype),
+                    np.empty((k, p), dtype=dtype),
+                    np.empty((m, p), dtype=dtype),
+                )
+            )
+
+    def nbytes(self) -> int:
+        return sum(buf.nbytes for level in self.levels for buf in level)
+
+    def check(self, shape, cutoff, dtype):
+        """ValueError, если буферы выделены под другие размеры, порог или тип."""
+        dtype = np.dtype(dtype)
+        if tuple(shape) != self.shape or cutoff != self.cutoff or dtype != self.dtype:
+            m, k, n = shape
+            wm, wk, wn = self.shape
+            raise ValueError(
+                f"workspace выделен для {wm} x {wk} на {wk} x {wn}, cutoff={self.cutoff}, "
+                f"{self.dtype}; нужен {m} x {k} на {k} x {n}, cutoff={cutoff}, {dtype} "
+                "(см. make_workspace)"
+            )
+
+
+def _peel(A, B, C, cutoff, workspace, level):
+    """
+    Динамическое отсечение: Штрассен для чётной части, затем
+      нечётное k — C[:me, :ne] += A[:me, k-1] B[k-1, :ne];
+      нечётное n — последний столбец C = A B[:, n-1];
+      нечётное m — последняя строка C[m-1, :ne] = A[m-1, :] B[:, :ne].
+    """
+    m, k = A.shape
+    n = B.shape[1]
+    me, ke, ne = m & ~1, k & ~1, n & ~1
+
+    _strassen_into(A[:me, :ke], B[:ke, :ne], C[:me, :ne], cutoff, workspace, level)
+    _peel_edges(A, B, C)
+
+
+def _peel_edges(A, B, C):
+    """Вклад отсечённых строки/столбца после Штрассена для чётной части (см. _peel)."""
+    m, k = A.shape
+    n = B.shape[1]
+    me, ke, ne = m & ~1, k & ~1, n & ~1
+
+    if ke < k:
+        C[:me, :ne] += np.outer(A[:me, k - 1], B[k - 1, :ne])
+    if ne < n:
+        np.matmul(A, B[:, n - 1:], out=C[:, n - 1:])
+    if me < m:
+        np.matmul(A[m - 1:], B[:, :ne], out=C[m - 1:, :ne])
+
+
+def _strassen_into(A, B, C, cutoff, workspace, level):
+    """Считает C = A @ B, записывая результат в C (C может быть срезом)."""
+    m, k = A.shape
+    n = B.shape[1]
+
+    # Базовый случай: маленький блок — считаем через BLAS
+    if min(m, k, n) <= cutoff:
+        np.matmul(A, B, out=C)
+        return
+
+    # Нечётный размер — отсекаем последнюю строку/столбец
+    if (m | k | n) & 1:
+        _peel(A, B, C, cutoff, workspace, level)
+        return
+
+    hm, hk, hn = m // 2, k // 2, n // 2
+    ta, tb, mbuf = workspace.levels[level]
+
+    A11, A12, A21, A22 = A[:hm, :hk], A[:hm, hk:], A[hm:, :hk], A[hm:, hk:]
+    B11, B12, B21, B22 = B[:hk, :hn], B[:hk, hn:], B[hk:, :hn], B[hk:, hn:]
+    C11, C12, C21, C22 = C[:hm, :hn], C[:hm, hn:], C[hm:, :hn], C[hm:, hn:]
+
+    # M1 = (A11 + A22)(B11 + B22) -> C11, C22
+    np.add(A11, A22, out=ta)
+    np.add(B11, B22, out=tb)
+    _strassen_into(ta, tb, mbuf, cutoff, workspace, level + 1)
+    C11[...] = mbuf
+    C22[...] = mbuf
+
+    # M2 = (A21 + A22) B11 -> C21, -C22
+    np.add(A21, A22, out=ta)
+    _strassen_into(ta, B11, mbuf, cutoff, workspace, level + 1)
+    C21[...] = mbuf
+    C22 -= mbuf
+
+    # M3 = A11 (B12 - B22) -> C12, C22
+    np.subtract(B12, B22, out=tb)
+    _strassen_into(A11, tb, mbuf, cutoff, workspace, level + 1)
+    C12[...] = mbuf
+    C22 += mbuf
+
+    # M4 = A22 (B21 - B11) -> C11, C21
+    np.subtract(B21, B11, out=tb)
+    _strassen_into(A22, tb, mbuf, cutoff, workspace, level + 1)
+    C11 += mbuf
+    C21 += mbuf
+
+    # M5 = (A11 + A12) B22 -> -C11, C12
+    np.add(A11, A12, out=ta)
+    _strassen_into(ta, B22, mbuf, cutoff, workspace, level + 1)
+    C11 -= mbuf
+    C12 += mbuf
+
+    # M6 = (A21 - A11)(B11 + B12) -> C22
+    np.subtract(A21, A11, out=ta)
+    np.add(B11, B12, out=tb)
+    _strassen_into(ta, tb, mbuf, cutoff, workspace, level + 1)
+    C22 += mbuf
+
+    # M7 = (A12 - A22)(B21 + B22) -> C11
+    np.subtract(A12, A22, out=ta)
+    np.add(B21, B22, out=tb)
+    _strassen_into(ta, tb, mbuf, cutoff, workspace, level + 1)
+    C11 += mbuf
+
+
+
+def _levels(m, k, n, cutoff) -> int:
+    """Сколько уровней рекурсии до порога (размеры округляются вверх)."""
+    levels = 0
+    while min(m, k, n) > cutoff:
+        m, k, n = (m + 1) // 2, (k + 1) // 2, (n + 1) // 2
+        levels += 1
+    return levels
+
+
+def _round_up(value, unit):
+    return (value + unit - 1) // unit * unit
+
+
+def padded_shape(m, k, n, cutoff):
+    """Размеры, дополненные до кратного 2^уровней: на всех уровнях чётные."""
+    unit = 1 << _levels(m, k, n, cutoff)
+    return _round_up(m, unit), _round_up(k, unit), _round_up(n, unit)
+
+
+def strassen_cost(m, k, n, cutoff) -> float:
+    """
+    Оценка стоимости Штрассена с отсечением для m x k на k x n:
+    7^l подзадач на уровне l, у каждой 18 сложений блоков и тонкие
+    умножения для нечётных размеров; в листьях — m k n.
+    """
+    cost, subproblems = 0.0, 1
+    while min(m, k, n) > cutoff:
+        hm, hk, hn = _next_level(m, k, n)
+        level = ADD_PENALTY * (5 * hm * hk + 5 * hk * hn + 8 * hm * hn)
+        if k & 1:
+            level += PEEL_PENALTY * (m & ~1) * (n & ~1)
+        if n & 1:
+            level += PEEL_PENALTY * m * k
+        if m & 1:
+            level += PEEL_PENALTY * k * (n & ~1)
+        cost += subproblems * level
+        subproblems *= 7
+        m, k, n = hm, hk, hn
+    return cost + subproblems * m * k * n
+
+
+def prefers_padding(m, k, n, cutoff) -> bool:
+    """True, если для m x k на k x n дополнение по модели дешевле отсечения."""
+    mp, kp, np_ = padded_shape(m, k, n, cutoff)
+    pad = strassen_cost(mp, kp, np_, cutoff) + COPY_PENALTY * (mp * kp + kp * np_ + mp * np_)
+    return pad < strassen_cost(m, k, n, cutoff)
+
+
+def _choose_odd(m, k, n, cutoff, odd):
+    if odd not in ("auto", "peel", "pad"):
+        raise ValueError(f"odd: ожидалось auto, peel или pad, получено {odd!r}")
+    if odd == "auto":
+        return "pad" if prefers_padding(m, k, n, cutoff) else "peel"
+    return odd
+
+
+def make_workspace(m, k, n, cutoff: int = None, dtype=np.float64, odd: str = "auto"):
+    """Workspace для strassen() с теми же m, k, n, cutoff и odd (с учётом дополнения)."""
+    if cutoff is None:
+        cutoff = DEFAULT_CUTOFF
+    if _choose_odd(m, k, n, cutoff, odd) == "pad":
+        m, k, n = padded_shape(m, k, n, cutoff)
+    return Workspace(m, cutoff, dtype, k, n)
+
+
+def strassen(A, B, cutoff: int = None, out=None, workspace=None, odd: str = "auto"):
+    """
+    Умножение матриц m x k на k x n алгоритмом Штрассена (размеры любые).
+
+    cutoff    — если хотя бы один размер блока не больше cutoff, считаем через A @ B;
+    out       — готовая матрица для результата (иначе выделяется новая);
+    workspace — буферы Workspace, чтобы переиспользовать их между вызовами
+                (для odd="pad" — под дополненные размеры; проще всего взять
+                make_workspace с теми же аргументами). Чужие размеры, порог
+                или тип элементов — ValueError;
+    odd       — что делать с нечётными размерами:
+                "peel" — отсекать последнюю строку/столбец на каждом уровне,
+                "pad"  — один раз дополнить нулями до кратного 2^уровней,
+                "auto" — выбрать по модели стоимости (prefers_padding).
+    """
+    if cutoff is None:
+        cutoff = DEFAULT_CUTOFF
+    if cutoff < 1:
+        raise ValueError("cutoff должен быть положительным")
+
+    A = np.asarray(A)
+    B = np.asarray(B)
+    if A.ndim != 2 or B.ndim != 2 or A.shape[1] != B.shape[0]:
+        raise ValueError(f"несогласованные размеры матриц: {A.shape} и {B.shape}")
+
+    m, k = A.shape
+    n = B.shape[1]
+    dtype = np.result_type(A, B)
+    if out is None:
+        out = np.empty((m, n), dtype=dtype)
+
+    odd = _choose_odd(m, k, n, cutoff, odd)
+    shape = padded_shape(m, k, n, cutoff) if odd == "pad" else (m, k, n)
+    if workspace is not None:
+        workspace.check(shape, cutoff, dtype)
+
+    if shape != (m, k, n):
+        mp, kp, np_ = shape
+        PA = np.zeros((mp, kp), dtype=dtype)
+        PB = np.zeros((kp, np_), dtype=dtype)
+        PA[:m, :k] = A
+        PB[:k, :n] = B
+        PC = np.empty((mp, np_), dtype=dtype)
+        if workspace is None:
+            workspace = Workspace(mp, cutoff, dtype, kp, np_)
+        _strassen_into(PA, PB, PC, cutoff, workspace, 0)
+        out[...] = PC[:m, :n]
+        return out
+
+    if workspace is None:
+        workspace = Workspace(m, cutoff, dtype, k, n)
+    _strassen_into(A, B, out, cutoff, workspace, 0)
+    return out
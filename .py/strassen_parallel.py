@@ -0,0 +1,339 @@
+#!/usr/bin/env python3
+"""
+strassen_parallel.py
+Параллельный Штрассен: верхние depth уровней рекурсии раскрываются
+в 7^depth независимых произведений M_i, которые считаются в пуле процессов
+(ProcessPoolExecutor), каждое — через strassen_numpy.strassen.
+
+Операнды и результаты M_i лежат в multiprocessing.shared_memory:
+процессы-работники подключаются к сегментам один раз при старте,
+а в задачах передаются только номера слотов — матрицы не сериализуются.
+
+Запуск как скрипт — отчёт об ускорении в зависимости от числа процессов.
+Работники считают BLAS в один поток, поэтому база для ускорения —
+тот же пул с одним процессом (а не последовательный вызов в родителе,
+где BLAS многопоточный):
+  python3 .py/strassen_parallel.py --n 2048 --depth 1 --workers 1,2,4,8
+Результат: data/csv/timings_parallel.csv
+"""
+
+import argparse
+import csv
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from bench_stats import DEFAULT_REPEATS, measure
+import strassen_numpy
+from strassen_numpy import make_workspace, strassen
+
+DATA_DIR = "data"
+CSV_DIR = os.path.join(DATA_DIR, "csv")
+
+# Блоки матрицы нумеруются так: 0 — X11, 1 — X12, 2 — X21, 3 — X22.
+# Для каждого M1..M7: какие блоки A и B (и с каким знаком) складываются.
+A_TERMS = [
+    [(0, 1), (3, 1)],   # M1 = (A11 + A22)(B11 + B22)
+    [(2, 1), (3, 1)],   # M2 = (A21 + A22) B11
+    [(0, 1)],           # M3 = A11 (B12 - B22)
+    [(3, 1)],           # M4 = A22 (B21 - B11)
+    [(0, 1), (1, 1)],   # M5 = (A11 + A12) B22
+    [(2, 1), (0, -1)],  # M6 = (A21 - A11)(B11 + B12)
+    [(1, 1), (3, -1)],  # M7 = (A12 - A22)(B21 + B22)
+]
+B_TERMS = [
+    [(0, 1), (3, 1)],
+    [(0, 1)],
+    [(1, 1), (3, -1)],
+    [(2, 1), (0, -1)],
+    [(3, 1)],
+    [(0, 1), (1, 1)],
+    [(2, 1), (3, 1)],
+]
+# Блоки C11..C22 как комбинации M1..M7 (индексы с нуля)
+C_TERMS = [
+    [(0, 1), (3, 1), (4, -1), (6, 1)],  # C11 = M1 + M4 - M5 + M7
+    [(2, 1), (4, 1)],                   # C12 = M3 + M5
+    [(1, 1), (3, 1)],                   # C21 = M2 + M4
+    [(0, 1), (1, -1), (2, 1), (5, 1)],  # C22 = M1 - M2 + M3 + M6
+]
+
+# BLAS внутри работников — однопоточный, иначе процессы мешают друг другу
+_BLAS_THREAD_VARS = ("OMP_NUM_THREADS", "OPENBLAS_NUM_THREADS", "MKL_NUM_THREADS")
+
+
+def _blocks(X):
+    k = X.shape[0] // 2
+    return X[:k, :k], X[:k, k:], X[k:, :k], X[k:, k:]
+
+
+def _combine_terms(parts, terms, out):
+    """out = Σ sign · parts[idx] без лишних временных массивов."""
+    idx, sign = terms[0]
+    if sign > 0:
+        out[...] = parts[idx]
+    else:
+        np.negative(parts[idx], out=out)
+    for idx, sign in terms[1:]:
+        if sign > 0:
+            out += parts[idx]
+        else:
+            out -= parts[idx]
+    return out
+
+
+def expand_operands(A, B, depth, slots_a, slots_b):
+    """
+    Раскрывает depth уровней Штрассена: записывает в slots_a[i], slots_b[i]
+    операнды всех 7^depth произведений нижнего уровня.
+    """
+    if depth == 0:
+        slots_a[0][...] = A
+        slots_b[0][...] = B
+        return
+
+    a_blocks = _blocks(A)
+    b_blocks = _blocks(B)
+    step = 7 ** (depth - 1)
+    k = A.shape[0] // 2
+
+    for i in range(7):
+        sa = slots_a[i * step:(i + 1) * step]
+        sb = slots_b[i * step:(i + 1) * step]
+        if depth == 1:
+            # Последний уровень — пишем суммы блоков сразу в общую память
+            _combine_terms(a_blocks, A_TERMS[i], sa[0])
+            _combine_terms(b_blocks, B_TERMS[i], sb[0])
+        else:
+            ta = _combine_terms(a_blocks, A_TERMS[i], np.empty((k, k), dtype=A.dtype))
+            tb = _combine_terms(b_blocks, B_TERMS[i], np.empty((k, k), dtype=B.dtype))
+            expand_operands(ta, tb, depth - 1, sa, sb)
+
+
+def combine_products(M, depth, out):
+    """Собирает C из 7^depth произведений M (обратный ход к expand_operands)."""
+    if depth == 0:
+        out[...] = M[0]
+        return out
+
+    step = 7 ** (depth - 1)
+    if depth == 1:
+        parts = [M[i] for i in range(7)]
+    else:
+        k = out.shape[0] // 2
+        parts = [
+            combine_products(M[i * step:(i + 1) * step], depth - 1,
+                             np.empty((k, k), dtype=out.dtype))
+            for i in range(7)
+        ]
+
+    for block, terms in zip(_blocks(out), C_TERMS):
+        _combine_terms(parts, terms, block)
+    return out
+
+
+# --- Код процесса-работника ---
+
+_worker = {}
+
+
+def _init_worker(operands_name, results_name, count, h, dtype, cutoff):
+    # Работники запущены из родителя и делят с ним resource_tracker,
+    # поэтому подключение не приводит к удалению сегментов при их выходе
+    ops_shm = shared_memory.SharedMemory(name=operands_name)
+    res_shm = shared_memory.SharedMemory(name=results_name)
+    _worker["shm"] = (ops_shm, res_shm)
+    _worker["operands"] = np.ndarray((count, 2, h, h), dtype=dtype, buffer=ops_shm.buf)
+    _worker["results"] = np.ndarray((count, h, h), dtype=dtype, buffer=res_shm.buf)
+    _worker["cutoff"] = cutoff
+    _worker["workspace"] = make_workspace(h, h, h, cutoff, dtype)
+
+
+def _multiply_slot(i):
+    ops = _worker["operands"]
+    strassen(
+        ops[i, 0],
+        ops[i, 1],
+        cutoff=_worker["cutoff"],
+        out=_worker["results"][i],
+        workspace=_worker["workspace"],
+    )
+    return i
+
+
+def _ping(_):
+    return os.getpid()
+
+
+class ParallelStrassen:
+    """
+    Пул процессов и общая память для умножения матриц n x n.
+    Создаётся один раз и переиспользуется для многих умножений:
+
+        with ParallelStrassen(2048, depth=1, workers=4) as ps:
+            C = ps.multiply(A, B)
+    """
+
+    def __init__(self, n, depth=1, workers=None, cutoff=None, dtype=np.float64):
+        if depth < 1:
+            raise ValueError("depth должен быть >= 1")
+        if n % (2 ** depth) != 0:
+            raise ValueError(f"n = {n} не делится на 2^{depth}")
+
+        self.n = n
+        self.depth = depth
+        self.dtype = np.dtype(dtype)
+        self.count = 7 ** depth
+        self.h = n // (2 ** depth)
+        self.workers = workers or os.cpu_count() or 1
+        self.cutoff = cutoff or strassen_numpy.DEFAULT_CUTOFF
+
+        block_bytes = self.h * self.h * self.dtype.itemsize
+        self._ops_shm = shared_memory.SharedMemory(create=True, size=2 * self.count * block_bytes)
+        self._res_shm = shared_memory.SharedMemory(create=True, size=self.count * block_bytes)
+        self.operands = np.ndarray((self.count, 2, self.h, self.h), dtype=self.dtype,
+                                   buffer=self._ops_shm.buf)
+        self.results = np.ndarray((self.count, self.h, self.h), dtype=self.dtype,
+                                  buffer=self._res_shm.buf)
+
+        saved_env = {var: os.environ.get(var) for var in _BLAS_THREAD_VARS}
+        try:
+            for var in _BLAS_THREAD_VARS:
+                os.environ[var] = "1"
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+                initargs=(self._ops_shm.name, self._res_shm.name, self.count,
+                          self.h, self.dtype.str, self.cutoff),
+            )
+            # Запускаем все процессы сразу, пока выставлены переменные окружения
+            list(self._executor.map(_ping, range(self.workers * 2)))
+        except BaseException:
+            self._release_shm()
+            raise
+        finally:
+            for var, value in saved_env.items():
+                if value is None:
+                    os.environ.pop(var, None)
+                else:
+                    os.environ[var] = value
+
+    def multiply(self, A, B, out=None):
+        if A.shape != (self.n, self.n) or B.shape != (self.n, self.n):
+            raise ValueError(f"ожидались матрицы {self.n} x {self.n}")
+        if out is None:
+            out = np.empty((self.n, self.n), dtype=self.dtype)
+
+        expand_operands(A, B, self.depth, self.operands[:, 0], self.operands[:, 1])
+        for _ in self._executor.map(_multiply_slot, range(self.count)):
+            pass
+        return combine_products(self.results, self.depth, out)
+
+    def _release_shm(self):
+        # Сначала отпускаем numpy-представления, иначе close() падает на живом буфере
+        self.operands = None
+        self.results = None
+        for shm in (self._ops_shm, self._res_shm):
+            shm.close()
+            shm.unlink()
+
+    def close(self):
+        self._executor.shutdown()
+        self._release_shm()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def strassen_parallel(A, B, depth=1, workers=None, cutoff=None):
+    """Разовое умножение (пул создаётся и закрывается внутри вызова)."""
+    with ParallelStrassen(A.shape[0], depth, workers, cutoff, np.result_type(A, B)) as ps:
+        return ps.multiply(A, B)
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Ускорение параллельного Штрассена")
+    parser.add_argument("--n", type=int, default=2048, help="размер матриц n x n")
+    parser.add_argument("--depth", type=int, default=1,
+                        help="сколько верхних уровней раздавать процессам (7^depth задач)")
+    parser.add_argument("--workers", default=None,
+                        help="список числа процессов, например 1,2,4,8 "
+                        "(по умолчанию 1,2,4,... до os.cpu_count())")
+    parser.add_argument("--cutoff", type=int, default=None, help="порог листа Штрассена")
+    parser.add_argument("--repeats", type=int, default=DEFAULT_REPEATS)
+    return parser.parse_args()
+
+
+def default_worker_counts():
+    cpus = os.cpu_count() or 1
+    counts = []
+    w = 1
+    while w < cpus:
+        counts.append(w)
+        w *= 2
+    counts.append(cpus)
+    return counts
+
+
+def main():
+    args = parse_args()
+    os.makedirs(CSV_DIR, exist_ok=True)
+
+    if args.workers:
+        worker_counts = [int(x) for x in args.workers.split(",") if x]
+    else:
+        worker_counts = default_worker_counts()
+    # База ускорения — пул из одного процесса: он замеряется первым
+    worker_counts = [1] + sorted(set(worker_counts) - {1})
+
+    n = args.n
+    A = np.random.rand(n, n)
+    B = np.random.rand(n, n)
+    expected = A @ B
+
+    cutoff = args.cutoff or strassen_numpy.DEFAULT_CUTOFF
+    print(f"n = {n}, depth = {args.depth}, cutoff = {cutoff}")
+
+    out_filename = os.path.join(CSV_DIR, "timings_parallel.csv")
+    with open(out_filename, "w", newline="") as f:
+        writer = csv.DictWriter(
+            f, fieldnames=["n", "depth", "workers", "parallel_ms", "one_worker_ms",
+                           "speedup", "efficiency"]
+        )
+        writer.writeheader()
+
+        baseline = None
+        for workers in worker_counts:
+            with ParallelStrassen(n, args.depth, workers, cutoff) as ps:
+                C = ps.multiply(A, B)
+                if not np.allclose(C, expected):
+                    raise RuntimeError("результат параллельного Штрассена не совпал с A @ B")
+                stats, _ = measure(lambda: ps.multiply(A, B, out=C), repeats=args.repeats)
+
+            if baseline is None:
+                baseline = stats["median"]
+            speedup = baseline / stats["median"]
+            writer.writerow({
+                "n": n,
+                "depth": args.depth,
+                "workers": workers,
+                "parallel_ms": stats["median"],
+                "one_worker_ms": baseline,
+                "speedup": speedup,
+                "efficiency": speedup / workers,
+            })
+            print(f"  workers = {workers:3d}: {stats['median']:.2f} ms, "
+                  f"ускорение {speedup:.2f}x, эффективность {speedup / workers:.0%}")
+
+    print(f"Готово. Данные записаны в {out_filename}")
+
+
+if __name__ == "__main__":
+    main()
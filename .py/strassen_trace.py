@@ -0,0 +1,266 @@
+#!/usr/bin/env python3
+"""
+strassen_trace.py
+Трассировка рекурсии Штрассена на NumPy (strassen_numpy) — пара к цели
+strassen_trace в C++ (src/trace.cpp).
+
+Для каждого уровня рекурсии записываются время (полное и собственное,
+без вложенных областей), пик дополнительной памяти по tracemalloc
+и объём скопированных данных. Результат — файл в формате Chrome trace
+(chrome://tracing, ui.perfetto.dev) и сводка по уровням.
+
+Трассировка включается только внутри `with tracing(tracer):` — на это
+время функции strassen_numpy подменяются обёртками, после выхода
+возвращаются исходные, так что обычные вызовы ничего не платят.
+
+Области: strassenRec — уровень рекурсии (собственное время — сложения
+блоков и копирования M_i в C), multiply — лист (A @ B), peel — отсечение
+нечётных строки/столбца, strassen — верхний вызов (рабочая область
+и дополнение нулями).
+
+  python3 .py/strassen_trace.py --n 1024 --cutoff 64
+  python3 .py/strassen_trace.py --n 1000 --odd pad --depth 2
+Результат: data/trace/strassen_numpy_<odd>_<n>.json и *_levels.csv
+"""
+
+import argparse
+import csv
+import json
+import os
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+import numpy as np
+
+import strassen_numpy
+from tuning_profile import PROJECT_ROOT
+
+TRACE_DIR = PROJECT_ROOT / "data" / "trace"
+
+SUMMARY_FIELDS = ["level", "name", "calls", "total_ms", "self_ms",
+                  "peak_alloc_bytes", "bytes_copied"]
+
+
+class _Frame:
+    __slots__ = ("name", "level", "start", "mem0", "mem_max", "child_s", "self_bytes", "child_bytes")
+
+    def __init__(self, name, level, start, mem0):
+        self.name = name
+        self.level = level
+        self.start = start
+        self.mem0 = mem0
+        self.mem_max = mem0
+        self.child_s = 0.0
+        self.self_bytes = 0
+        self.child_bytes = 0
+
+
+class Tracer:
+    """
+    Сбор областей трассировки. В файл трассы попадают только области
+    уровней < event_depth, сводка считается по всем уровням.
+    memory=False — без tracemalloc: пик памяти не считается, зато
+    времена не искажены его накладными расходами.
+    """
+
+    def __init__(self, event_depth=3, memory=True):
+        self.event_depth = event_depth
+        self.memory = memory
+        self.events = []
+        self.stats = {}
+        self._stack = []
+        self._origin = time.perf_counter()
+
+    def begin(self, name, level=None):
+        """Открыть область; level=None — уровень родителя."""
+        if level is None:
+            level = self._stack[-1].level if self._stack else 0
+        # Пик tracemalloc сбрасывается на каждой области: пик родителя
+        # до этого момента сохраняется в его mem_max
+        current = 0
+        if self.memory:
+            current, peak = tracemalloc.get_traced_memory()
+            if self._stack:
+                parent = self._stack[-1]
+                parent.mem_max = max(parent.mem_max, peak)
+            tracemalloc.reset_peak()
+        self._stack.append(_Frame(name, level, time.perf_counter(), current))
+
+    def end(self):
+        end = time.perf_counter()
+        frame = self._stack.pop()
+        if self.memory:
+            frame.mem_max = max(frame.mem_max, tracemalloc.get_traced_memory()[1])
+
+        duration = end - frame.start
+        total_bytes = frame.self_bytes + frame.child_bytes
+        if self._stack:
+            parent = self._stack[-1]
+            parent.child_s += duration
+            parent.child_bytes += total_bytes
+            parent.mem_max = max(parent.mem_max, frame.mem_max)
+
+        peak = frame.mem_max - frame.mem0
+        key = (frame.level, frame.name)
+        s = self.stats.setdefault(key, {
+            "level": frame.level, "name": frame.name, "calls": 0, "total_ms": 0.0,
+            "self_ms": 0.0, "peak_alloc_bytes": 0, "bytes_copied": 0,
+        })
+        s["calls"] += 1
+        s["total_ms"] += duration * 1000.0
+        s["self_ms"] += (duration - frame.child_s) * 1000.0
+        s["peak_alloc_bytes"] = max(s["peak_alloc_bytes"], peak)
+        s["bytes_copied"] += frame.self_bytes
+
+        if frame.level < self.event_depth:
+            self.events.append({
+                "name": frame.name, "cat": "strassen", "ph": "X", "pid": 1, "tid": 0,
+                "ts": (frame.start - self._origin) * 1e6, "dur": duration * 1e6,
+                "args": {"level": frame.level, "peak_alloc_bytes": peak,
+                         "bytes_copied": total_bytes},
+            })
+
+    def copied(self, nbytes):
+        """Учесть скопированные байты в текущей области."""
+        if self._stack:
+            self._stack[-1].self_bytes += nbytes
+
+    def in_level(self, level):
+        """Открыт ли уже уровень рекурсии level (отсечение вызывает его ещё раз)."""
+        for frame in reversed(self._stack):
+            if frame.name == "strassenRec":
+                return frame.level == level
+        return False
+
+    def summary(self):
+        return [self.stats[key] for key in sorted(self.stats)]
+
+    def write_chrome_trace(self, path):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path, "w") as f:
+            json.dump({"displayTimeUnit": "ms", "traceEvents": self.events}, f)
+
+    def write_summary_csv(self, path):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path, "w", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=SUMMARY_FIELDS)
+            writer.writeheader()
+            writer.writerows(self.summary())
+
+    def print_summary(self):
+        print(f"{'level':<6}{'name':<14}{'calls':>10}{'total_ms':>12}{'self_ms':>12}"
+              f"{'peak_MB':>12}{'copied_MB':>12}")
+        for s in self.summary():
+            print(f"{s['level']:<6}{s['name']:<14}{s['calls']:>10}{s['total_ms']:>12.3f}"
+                  f"{s['self_ms']:>12.3f}{s['peak_alloc_bytes'] / 1e6:>12.3f}"
+                  f"{s['bytes_copied'] / 1e6:>12.3f}")
+
+
+@contextmanager
+def tracing(tracer):
+    """Подменяет функции strassen_numpy обёртками, пишущими в tracer."""
+    original_into = strassen_numpy._strassen_into
+    original_edges = strassen_numpy._peel_edges
+    original_strassen = strassen_numpy.strassen
+
+    def traced_into(A, B, C, cutoff, workspace, level):
+        opened = not tracer.in_level(level)
+        if opened:
+            tracer.begin("strassenRec", level)
+        try:
+            m, k = A.shape
+            n = B.shape[1]
+            if min(m, k, n) <= cutoff:
+                tracer.begin("multiply")
+                try:
+                    original_into(A, B, C, cutoff, workspace, level)
+                finally:
+                    tracer.end()
+                return
+            if not (m | k | n) & 1:
+                # M_i копируются в четыре блока C: C11, C22, C21, C12
+                tracer.copied(4 * (m // 2) * (n // 2) * C.itemsize)
+            original_into(A, B, C, cutoff, workspace, level)
+        finally:
+            if opened:
+                tracer.end()
+
+    def traced_edges(A, B, C):
+        tracer.begin("peel")
+        try:
+            original_edges(A, B, C)
+        finally:
+            tracer.end()
+
+    def traced_strassen(A, B, cutoff=None, out=None, workspace=None, odd="auto"):
+        tracer.begin("strassen", 0)
+        try:
+            A, B = np.asarray(A), np.asarray(B)
+            c = strassen_numpy.DEFAULT_CUTOFF if cutoff is None else cutoff
+            if A.ndim == 2 and B.ndim == 2 and c >= 1:
+                m, k = A.shape
+                n = B.shape[1]
+                if odd == "auto":
+                    odd_mode = "pad" if strassen_numpy.prefers_padding(m, k, n, c) else "peel"
+                else:
+                    odd_mode = odd
+                if odd_mode == "pad" and strassen_numpy.padded_shape(m, k, n, c) != (m, k, n):
+                    # A и B копируются в дополненные буферы, результат — обратно
+                    tracer.copied((m * k + k * n + m * n) * np.result_type(A, B).itemsize)
+            return original_strassen(A, B, cutoff, out, workspace, odd)
+        finally:
+            tracer.end()
+
+    started = tracer.memory and not tracemalloc.is_tracing()
+    if started:
+        tracemalloc.start()
+    strassen_numpy._strassen_into = traced_into
+    strassen_numpy._peel_edges = traced_edges
+    strassen_numpy.strassen = traced_strassen
+    try:
+        yield tracer
+    finally:
+        strassen_numpy._strassen_into = original_into
+        strassen_numpy._peel_edges = original_edges
+        strassen_numpy.strassen = original_strassen
+        if started:
+            tracemalloc.stop()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Трассировка рекурсии Штрассена на NumPy")
+    parser.add_argument("--n", type=int, default=1024, help="размер матриц (по умолчанию 1024)")
+    parser.add_argument("--cutoff", type=int, default=None,
+                        help=f"порог (по умолчанию {strassen_numpy.DEFAULT_CUTOFF}, из профиля)")
+    parser.add_argument("--odd", choices=["auto", "peel", "pad"], default="auto",
+                        help="нечётные размеры: отсечение, дополнение или выбор по модели")
+    parser.add_argument("--dtype", default="float64", help="тип элементов (по умолчанию float64)")
+    parser.add_argument("--depth", type=int, default=3,
+                        help="в файл трассы попадают уровни < depth (сводка — по всем)")
+    parser.add_argument("--no-memory", action="store_true",
+                        help="без tracemalloc: точнее времена, но без пика памяти")
+    parser.add_argument("--out", default=None,
+                        help="файл трассы (по умолчанию data/trace/strassen_numpy_<odd>_<n>.json)")
+    args = parser.parse_args(argv)
+
+    out = args.out or os.path.join(TRACE_DIR, f"strassen_numpy_{args.odd}_{args.n}.json")
+    A = np.random.rand(args.n, args.n).astype(args.dtype)
+    B = np.random.rand(args.n, args.n).astype(args.dtype)
+
+    # Прогрев без трассировки, затем один прогон с ней
+    strassen_numpy.strassen(A, B, args.cutoff, odd=args.odd)
+    tracer = Tracer(args.depth, memory=not args.no_memory)
+    with tracing(tracer):
+        strassen_numpy.strassen(A, B, args.cutoff, odd=args.odd)
+
+    tracer.print_summary()
+    summary = os.path.splitext(out)[0] + "_levels.csv"
+    tracer.write_chrome_trace(out)
+    tracer.write_summary_csv(summary)
+    print(f"Трасса: {out} (chrome://tracing, ui.perfetto.dev)")
+    print(f"Сводка по уровням: {summary}")
+
+
+if __name__ == "__main__":
+    main()
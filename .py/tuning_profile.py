@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+tuning_profile.py
+Профиль автонастройки для текущей машины.
+
+Профиль — текстовый файл data/tuning/<fingerprint>.cfg со строками
+"ключ=значение", его читают и Python (strassen_numpy.py), и C++ (src/tuning.cpp).
+Отпечаток процессора считается одинаково в обоих языках:
+FNV-1a (64 бита) от строки "модель процессора|архитектура|число логических ядер".
+"""
+
+import os
+import platform
+import subprocess
+from pathlib import Path
+
+PY_DIR = Path(__file__).resolve().parent
+PROJECT_ROOT = PY_DIR.parent
+TUNING_DIR = PROJECT_ROOT / "data" / "tuning"
+
+
+def _cpu_brand() -> str:
+    """Название модели процессора (как cpuBrand() в src/tuning.cpp)."""
+    if platform.system() == "Darwin":
+        try:
+            out = subprocess.run(
+                ["sysctl", "-n", "machdep.cpu.brand_string"],
+                capture_output=True, text=True, check=True,
+            )
+            return out.stdout.strip()
+        except (OSError, subprocess.CalledProcessError):
+            return "unknown"
+
+    try:
+        with open("/proc/cpuinfo", encoding="utf-8") as f:
+            for line in f:
+                key, sep, value = line.partition(":")
+                if sep and key.strip() == "model name":
+                    return value.strip()
+    except OSError:
+        pass
+    return "unknown"
+
+
+def _fnv1a64(text: str) -> str:
+    h = 14695981039346656037
+    for byte in text.encode("utf-8"):
+        h ^= byte
+        h = (h * 1099511628211) & 0xFFFFFFFFFFFFFFFF
+    return f"{h:016x}"
+
+
+def cpu_description() -> str:
+    return f"{_cpu_brand()}|{os.uname().machine}|{os.cpu_count() or 0}"
+
+
+def cpu_fingerprint() -> str:
+    return _fnv1a64(cpu_description())
+
+
+def profile_path() -> Path:
+    return TUNING_DIR / f"{cpu_fingerprint()}.cfg"
+
+
+def load_profile(path=None) -> dict:
+    """Профиль текущей машины в виде словаря строк; {} если профиля нет."""
+    path = Path(path) if path else profile_path()
+    values = {}
+    if not path.exists():
+        return values
+    for line in path.read_text(encoding="utf-8").splitlines():
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+        key, sep, value = line.partition("=")
+        if sep:
+            values[key.strip()] = value.strip()
+    return values
+
+
+def profile_int(key: str, default=None, profile=None):
+    """Целое значение из профиля (None/default, если ключа нет или там "none")."""
+    if profile is None:
+        profile = load_profile()
+    value = profile.get(key)
+    if value is None or value == "none":
+        return default
+    try:
+        return int(value)
+    except ValueError:
+        return default
+
+
+def profile_float(key: str, default=None, profile=None):
+    """Вещественное значение из профиля (как profile_int)."""
+    if profile is None:
+        profile = load_profile()
+    value = profile.get(key)
+    if value is None or value == "none":
+        return default
+    try:
+        return float(value)
+    except ValueError:
+        return default
+
+
+def save_profile(values: dict, path=None) -> Path:
+    """Записывает профиль; ключи, которых нет в values, сохраняются из старого файла."""
+    path = Path(path) if path else profile_path()
+    merged = load_profile(path)
+    merged.update({k: str(v) for k, v in values.items()})
+    merged["fingerprint"] = cpu_fingerprint()
+    merged["cpu"] = cpu_description()
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    lines = ["# Профиль автонастройки (.py/autotune.py)"]
+    lines += [f"{key}={merged[key]}" for key in sorted(merged)]
+    path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    return path
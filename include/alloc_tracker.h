@@ -0,0 +1,25 @@
+#ifndef ALLOC_TRACKER_H
+#define ALLOC_TRACKER_H
+
+#include <cstddef>
+
+// Учёт динамической памяти для бенчмарка: src/alloc_tracker.cpp заменяет
+// глобальные operator new/delete и считает выделенные байты.
+// Подключается только к benchmark, на app и библиотеку не влияет.
+
+struct AllocStats {
+    size_t peakBytes = 0;   // пик занятой памяти сверх уровня на момент сброса
+    size_t allocations = 0; // число вызовов operator new
+};
+
+// Начать новый замер: пик отсчитывается от текущего объёма
+void resetAllocStats();
+
+// Статистика с момента последнего resetAllocStats()
+AllocStats allocStats();
+
+// Число вызовов operator new в текущем потоке с его запуска (сбросом
+// не обнуляется): для трассировки, где области открываются в разных потоках
+size_t threadAllocations();
+
+#endif // ALLOC_TRACKER_H
@@ -0,0 +1,36 @@
+#ifndef BENCH_STATS_H
+#define BENCH_STATS_H
+
+#include <functional>
+#include <string>
+#include <vector>
+
+// Настройки одного замера
+struct BenchConfig {
+    int warmup = 1;          // число прогревочных запусков (не учитываются)
+    int repeats = 7;         // число выборок (samples) на точку
+    double minTimeMs = 50.0; // минимальная длительность одной выборки, мс
+};
+
+// Статистика по выборкам (время одного вызова, мс)
+struct BenchStats {
+    double min = 0.0;
+    double median = 0.0;
+    double p95 = 0.0;
+    double ciLow = 0.0;   // 95% доверительный интервал медианы
+    double ciHigh = 0.0;
+    int repeats = 0;      // число выборок
+    long long number = 0; // число вызовов внутри одной выборки
+    std::vector<double> samples;
+};
+
+// Прогрев, калибровка числа вызовов (как timeit.autorange) и сбор выборок
+BenchStats measure(const std::function<void()> &fn, const BenchConfig &cfg);
+
+// Статистика по готовым выборкам
+BenchStats summarize(std::vector<double> samples);
+
+// Разбор списка размеров: "64,128,300" или диапазон степеней двойки "64:4096"
+std::vector<int> parseSizes(const std::string &text);
+
+#endif // BENCH_STATS_H
@@ -0,0 +1,42 @@
+#ifndef CAPI_H
+#define CAPI_H
+
+// C-интерфейс к ядрам умножения для загрузки из Python (ctypes, .py/cpp_kernels.py).
+// Матрицы передаются как указатели на непрерывные буферы (row-major),
+// например данные C-contiguous массивов NumPy: A — m x k, B — k x n, C — m x n.
+// Функции без суффикса работают с double (float64), _f32 — с float,
+// _i64 — с int64_t.
+// Коды возврата: 0 — успех, MATMUL_EBADSIZE — недопустимый размер,
+// MATMUL_ENOMEM — не хватило памяти, MATMUL_EINTERNAL — другое исключение C++.
+// Исключения не выходят за границу C-интерфейса.
+
+#include <stdint.h>
+
+#ifdef __cplusplus
+extern "C" {
+#endif
+
+#define MATMUL_OK 0
+#define MATMUL_EBADSIZE 1
+#define MATMUL_ENOMEM 2
+#define MATMUL_EINTERNAL 3
+
+// C = A * B, стандартный алгоритм
+int matmul_standard(const double *a, const double *b, double *c, int m, int k, int n);
+int matmul_standard_f32(const float *a, const float *b, float *c, int m, int k, int n);
+int matmul_standard_i64(const int64_t *a, const int64_t *b, int64_t *c, int m, int k, int n);
+
+// C = A * B, алгоритм Штрассена (нечётные размеры — отсечением или дополнением)
+int matmul_strassen(const double *a, const double *b, double *c, int m, int k, int n);
+int matmul_strassen_f32(const float *a, const float *b, float *c, int m, int k, int n);
+int matmul_strassen_i64(const int64_t *a, const int64_t *b, int64_t *c, int m, int k, int n);
+
+// Порог рекурсии Штрассена (см. setStrassenCutoff)
+int matmul_set_strassen_cutoff(int cutoff);
+int matmul_get_strassen_cutoff(void);
+
+#ifdef __cplusplus
+}
+#endif
+
+#endif // CAPI_H
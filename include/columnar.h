@@ -0,0 +1,65 @@
+#ifndef COLUMNAR_H
+#define COLUMNAR_H
+
+#include <cstdint>
+#include <fstream>
+#include <string>
+#include <vector>
+
+// ---------------------------------------------------------------------------
+// Двоичный столбцовый формат для сырых выборок замеров (*.mcol).
+// Читается в Python одним вызовом: .py/columnar.py, load(path).
+//
+// Файл — заголовок "MCOL" + версия (uint32) и последовательность блоков.
+// Блок — "CHNK", число строк (uint32), число столбцов (uint32), размер
+// данных (uint64) и данные: для каждого столбца имя (uint8 длина + байты),
+// тип (uint8) и значения подряд:
+//   1 — float64, 2 — int64: rows * 8 байт;
+//   3 — строки: словарь (uint32 размер, строки uint16 длина + байты)
+//       и коды rows * uint32.
+// Числа little-endian (порядок байт x86 и ARM).
+//
+// Блоки только дописываются в конец. Если процесс упал посреди записи,
+// недописанный последний блок при чтении отбрасывается, а все предыдущие
+// целы — частичный замер не теряется.
+// ---------------------------------------------------------------------------
+
+// Один блок: столбцы одинаковой длины
+class ColumnarChunk {
+public:
+    void addFloat64(const std::string &name, const std::vector<double> &values);
+    void addInt64(const std::string &name, const std::vector<int64_t> &values);
+    void addStrings(const std::string &name, const std::vector<std::string> &values);
+
+    // Число строк; 0 — столбцов нет
+    size_t rows() const { return rows_; }
+    // Длины всех столбцов совпадают
+    bool consistent() const { return consistent_; }
+
+    // Блок целиком: заголовок "CHNK" и данные столбцов
+    std::string encode() const;
+
+private:
+    void addColumn(const std::string &name, uint8_t type, size_t rows, std::string data);
+
+    std::vector<std::string> columns_; // имя, тип и значения, уже закодированные
+    size_t rows_ = 0;
+    bool consistent_ = true;
+};
+
+class ColumnarWriter {
+public:
+    // Открывает файл для дописывания (truncate — начать заново) и пишет
+    // заголовок, если файл пуст. Недописанный хвост от упавшей записи
+    // отрезается. false — файл не открылся, это не *.mcol или блок повреждён
+    bool open(const std::string &path, bool truncate = false);
+
+    // Дописывает блок и сбрасывает буфер на диск; false — ошибка записи
+    // или столбцы разной длины
+    bool append(const ColumnarChunk &chunk);
+
+private:
+    std::ofstream out_;
+};
+
+#endif // COLUMNAR_H
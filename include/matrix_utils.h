@@ -1,6 +1,7 @@
 #ifndef MATRIX_UTILS_H
 #define MATRIX_UTILS_H
 
+#include <cstdint>
 #include <vector>
 #include <string>
 
@@ -28,10 +29,152 @@ void splitMatrix(const Matrix &A,
 Matrix joinMatrix(const Matrix &C11, const Matrix &C12,
                   const Matrix &C21, const Matrix &C22);
 
-// Стандартное умножение матриц O(n^3)
+// Стандартное умножение матриц O(n^3).
+// Панели строк делятся между потоками (setThreadCount в parallel.h)
 Matrix multiplyStandard(const Matrix &A, const Matrix &B);
 
+// Дополнение квадратной матрицы нулями до size x size
+Matrix padMatrix(const Matrix &A, int size);
+
+// Левый верхний блок n x n
+Matrix cropMatrix(const Matrix &A, int n);
+
 // Проверка: является ли n степенью двойки
 bool isPowerOfTwo(int n);
 
+// ---------------------------------------------------------------------------
+// Непрерывное хранение матриц и блоки-представления (views).
+//
+// FlatMatrix хранит все элементы в одном буфере (по строкам). Блок матрицы
+// описывается MatrixView: указатель на первый элемент, размеры и шаг строки
+// (stride) исходного буфера. Взятие блока — O(1), без выделения памяти.
+//
+// Матрицы и ядра на представлениях параметризованы типом элемента T.
+// Ядра собраны для float, double и int64_t (явные инстанцирования в .cpp);
+// FlatMatrix, MatrixView, ConstMatrixView — их варианты для double.
+// ---------------------------------------------------------------------------
+
+template <typename T>
+struct BasicMatrixView {
+    T *data = nullptr;
+    int rows = 0;
+    int cols = 0;
+    int stride = 0; // расстояние между началами соседних строк, в элементах
+
+    BasicMatrixView() = default;
+    BasicMatrixView(T *data_, int rows_, int cols_, int stride_)
+        : data(data_), rows(rows_), cols(cols_), stride(stride_) {}
+
+    // Неизменяемое представление можно получить из изменяемого
+    template <typename U>
+    BasicMatrixView(const BasicMatrixView<U> &other)
+        : data(other.data), rows(other.rows), cols(other.cols), stride(other.stride) {}
+
+    T &operator()(int i, int j) const {
+        return data[(size_t)i * stride + j];
+    }
+
+    T *row(int i) const {
+        return data + (size_t)i * stride;
+    }
+
+    // Блок nr x nc, начинающийся с элемента (r0, c0)
+    BasicMatrixView block(int r0, int c0, int nr, int nc) const {
+        return BasicMatrixView(data + (size_t)r0 * stride + c0, nr, nc, stride);
+    }
+};
+
+// Тип элемента в ядрах выводится только из изменяемого аргумента (C):
+// на месте A и B можно передавать и BasicMatrixView<T>, и BasicMatrixView<const T>
+template <typename T>
+struct NonDeduced {
+    typedef T type;
+};
+
+template <typename T>
+using BasicConstView = BasicMatrixView<const typename NonDeduced<T>::type>;
+
+typedef BasicMatrixView<double> MatrixView;
+typedef BasicMatrixView<const double> ConstMatrixView;
+
+template <typename T>
+class BasicFlatMatrix {
+public:
+    BasicFlatMatrix() = default;
+    BasicFlatMatrix(int rows, int cols) : rows_(rows), cols_(cols), buf_((size_t)rows * cols, T(0)) {}
+    explicit BasicFlatMatrix(int n) : BasicFlatMatrix(n, n) {}
+
+    int rows() const { return rows_; }
+    int cols() const { return cols_; }
+    T *data() { return buf_.data(); }
+    const T *data() const { return buf_.data(); }
+
+    BasicMatrixView<T> view() { return BasicMatrixView<T>(buf_.data(), rows_, cols_, cols_); }
+    BasicMatrixView<const T> view() const {
+        return BasicMatrixView<const T>(buf_.data(), rows_, cols_, cols_);
+    }
+
+    T &operator()(int i, int j) { return buf_[(size_t)i * cols_ + j]; }
+    T operator()(int i, int j) const { return buf_[(size_t)i * cols_ + j]; }
+
+private:
+    int rows_ = 0;
+    int cols_ = 0;
+    std::vector<T> buf_;
+};
+
+typedef BasicFlatMatrix<double> FlatMatrix;
+
+// Преобразование между Matrix и FlatMatrix
+FlatMatrix toFlat(const Matrix &m);
+Matrix fromFlat(ConstMatrixView v);
+
+// Матрица Matrix с элементами, приведёнными к типу T
+template <typename T>
+BasicFlatMatrix<T> toFlatAs(const Matrix &m);
+
+// Четыре блока матрицы с чётным числом строк и столбцов — O(1), без копирования
+// (T может быть и const-типом)
+template <typename T>
+void splitView(BasicMatrixView<T> A,
+               BasicMatrixView<T> &A11, BasicMatrixView<T> &A12,
+               BasicMatrixView<T> &A21, BasicMatrixView<T> &A22);
+
+// Поэлементные операции над блоками одинакового размера:
+// C = A + B, C = A - B, C = A, C += A, C -= A
+template <typename T>
+void addInto(BasicConstView<T> A, BasicConstView<T> B, BasicMatrixView<T> C);
+template <typename T>
+void subInto(BasicConstView<T> A, BasicConstView<T> B, BasicMatrixView<T> C);
+template <typename T>
+void copyInto(BasicConstView<T> A, BasicMatrixView<T> C);
+template <typename T>
+void addTo(BasicMatrixView<T> C, BasicConstView<T> A);
+template <typename T>
+void subFrom(BasicMatrixView<T> C, BasicConstView<T> A);
+
+// Стандартное умножение C = A * B на представлениях (C не должна пересекаться с A, B).
+// Как и версия для Matrix, делит панели строк между потоками
+template <typename T>
+void multiplyStandard(BasicConstView<T> A, BasicConstView<T> B, BasicMatrixView<T> C);
+
+// Размеры блоков для multiplyBlocked (в элементах):
+// rows x inner — блок A, inner x cols — блок B, rows x cols — блок C.
+// По умолчанию блок B (64 x 256 double = 128 КБ) помещается в L2,
+// а строка блока C (256 double = 2 КБ) — в L1 (для float — вдвое меньше).
+struct BlockSizes {
+    int rows = 64;
+    int inner = 64;
+    int cols = 256;
+};
+void setBlockSizes(const BlockSizes &sizes);
+BlockSizes getBlockSizes();
+
+// Стандартное умножение с учётом кэша: порядок i-k-j (B и C читаются
+// по строкам), разбиение на блоки под L1/L2; внутренний цикл — axpy по
+// непрерывной строке, его векторизует компилятор. Панели блоков строк
+// делятся между потоками. Используется как базовый случай Штрассена
+template <typename T>
+void multiplyBlocked(BasicConstView<T> A, BasicConstView<T> B, BasicMatrixView<T> C);
+
 #endif // MATRIX_UTILS_H
@@ -0,0 +1,48 @@
+#ifndef PARALLEL_H
+#define PARALLEL_H
+
+#include <functional>
+
+// Число потоков для multiplyStandard и strassenRec.
+// По умолчанию 1 — однопоточный режим, как раньше.
+void setThreadCount(int threads);
+int getThreadCount();
+
+// Глубина рекурсии Штрассена, до которой M1..M7 считаются параллельными
+// задачами (0 — без задач, только параллельные панели в стандартном умножении)
+void setStrassenTaskDepth(int depth);
+int getStrassenTaskDepth();
+
+// Сколько потоков доступно текущему потоку. Внутри задачи это её доля
+// от общего числа потоков, чтобы вложенный параллелизм не создавал
+// больше потоков, чем задано setThreadCount.
+int currentThreadBudget();
+
+// Выполняет task(0) .. task(count - 1) на min(бюджет, count) потоках
+// (один из них — текущий). Каждая задача получает бюджет / число потоков.
+// Исключение из задачи пробрасывается в вызывающий поток.
+void runTasks(int count, const std::function<void(int)> &task);
+
+// На сколько частей parallelFor делит диапазон длины count
+int parallelParts(int count, int minChunk);
+
+// Делит диапазон [0, count) на непрерывные части не короче minChunk
+// и выполняет body(begin, end) для каждой части параллельно.
+// Шаблон, чтобы в однопоточном случае не выделять память под std::function
+// (ядра вызываются в листьях рекурсии Штрассена).
+template <typename Body>
+void parallelFor(int count, int minChunk, const Body &body) {
+    int parts = parallelParts(count, minChunk);
+    if (parts <= 1) {
+        body(0, count);
+        return;
+    }
+
+    runTasks(parts, [&](int p) {
+        int begin = (int)((long long)count * p / parts);
+        int end = (int)((long long)count * (p + 1) / parts);
+        body(begin, end);
+    });
+}
+
+#endif // PARALLEL_H
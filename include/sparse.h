@@ -0,0 +1,107 @@
+#ifndef SPARSE_H
+#define SPARSE_H
+
+#include <cstddef>
+#include <vector>
+
+#include "matrix_utils.h"
+
+// ---------------------------------------------------------------------------
+// Разреженные матрицы: хранятся только ненулевые элементы.
+//
+// CSR (по строкам): для строки i ненулевые элементы лежат в
+// values[rowPtr[i] .. rowPtr[i + 1]), их столбцы — в colIdx.
+// CSC (по столбцам) — то же для столбцов: colPtr, rowIdx, values.
+//
+// CSR удобен для левого множителя (строка A умножается на строки B),
+// CSC — для правого (столбец B собирает элементы строки A).
+// Собрано для float, double и int64_t, как и плотные ядра.
+// ---------------------------------------------------------------------------
+
+template <typename T>
+struct BasicCsrMatrix {
+    int rows = 0;
+    int cols = 0;
+    std::vector<int> rowPtr; // rows + 1 элементов
+    std::vector<int> colIdx;
+    std::vector<T> values;
+
+    size_t nnz() const { return values.size(); }
+    double density() const {
+        return rows && cols ? (double)nnz() / ((double)rows * cols) : 0.0;
+    }
+};
+
+template <typename T>
+struct BasicCscMatrix {
+    int rows = 0;
+    int cols = 0;
+    std::vector<int> colPtr; // cols + 1 элементов
+    std::vector<int> rowIdx;
+    std::vector<T> values;
+
+    size_t nnz() const { return values.size(); }
+    double density() const {
+        return rows && cols ? (double)nnz() / ((double)rows * cols) : 0.0;
+    }
+};
+
+typedef BasicCsrMatrix<double> CsrMatrix;
+typedef BasicCscMatrix<double> CscMatrix;
+
+// Сжатие плотной матрицы (нули отбрасываются) и обратное преобразование.
+// Тип элемента не выводится из представления, его задают явно: toCsr<double>(A)
+template <typename T>
+BasicCsrMatrix<T> toCsr(BasicConstView<T> A);
+template <typename T>
+BasicCscMatrix<T> toCsc(BasicConstView<T> A);
+template <typename T>
+void toDense(const BasicCsrMatrix<T> &A, BasicMatrixView<T> C);
+
+// C = A * B, A разреженная (CSR), B и C плотные: каждый ненулевой A(i, k)
+// добавляет строку B(k, :) к строке C(i, :). Работа ~ nnz(A) * B.cols
+template <typename T>
+void multiplySparseDense(const BasicCsrMatrix<T> &A, BasicConstView<T> B,
+                         BasicMatrixView<T> C);
+
+// C = A * B, B разреженная (CSC): C(i, j) — скалярное произведение строки A
+// на ненулевые элементы столбца j. Работа ~ A.rows * nnz(B)
+template <typename T>
+void multiplyDenseSparse(BasicConstView<T> A, const BasicCscMatrix<T> &B,
+                         BasicMatrixView<T> C);
+
+// C = A * B, обе разреженные (алгоритм Густавсона): строка C собирается
+// в плотном накопителе длины B.cols. Работа ~ сумма по ненулевым A(i, k)
+// числа ненулевых в строке k матрицы B
+template <typename T>
+BasicCsrMatrix<T> multiplySparse(const BasicCsrMatrix<T> &A, const BasicCsrMatrix<T> &B);
+
+// Оценка доли ненулевых элементов по samples случайным позициям
+// (фиксированное зерно — выбор ядра воспроизводим); маленькие матрицы
+// просматриваются целиком. Тип элемента задаётся явно, как у toCsr
+template <typename T>
+double estimateDensity(BasicConstView<T> A, int samples = 1024);
+
+// Порог плотности: операнд с оценкой плотности ниже порога считается
+// разреженным. По умолчанию 0.05; подбирается замером
+// (benchmark --densities, .py/sparse_numpy.py) и читается из профиля
+void setSparseThreshold(double threshold);
+double getSparseThreshold();
+
+// Ядро, которое выбирает multiplyAuto
+enum class MultiplyKernel { Dense, SparseDense, DenseSparse, SparseSparse };
+const char *kernelName(MultiplyKernel kernel);
+
+// Выбор ядра для m x k на k x n. Операнд с плотностью ниже порога
+// считается разреженным; из ядер, доступных для разреженных операндов,
+// берётся самое дешёвое по грубой модели стоимости (сжатие, умножения,
+// сборка результата). Если разреженных операндов нет — Dense
+MultiplyKernel chooseKernel(int m, int k, int n, double densityA, double densityB);
+
+// C = A * B с выбором ядра: плотности A и B оцениваются выборкой,
+// разреженные операнды сжимаются (время сжатия входит в вызов),
+// плотный случай — multiplyBlocked. Возвращает выбранное ядро
+template <typename T>
+MultiplyKernel multiplyAuto(BasicConstView<T> A, BasicConstView<T> B, BasicMatrixView<T> C);
+
+#endif // SPARSE_H
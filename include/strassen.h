@@ -3,11 +3,46 @@
 
 #include "matrix_utils.h"
 
-// Рекурсивная реализация алгоритма Штрассена (без вывода промежуточных матриц)
+// Порог рекурсии: блоки размером n <= cutoff умножаются стандартным алгоритмом.
+// По умолчанию 1 (рекурсия до 1x1); подбирается автонастройкой (.py/autotune.py)
+void setStrassenCutoff(int cutoff);
+int getStrassenCutoff();
+
+// Рекурсивная реализация алгоритма Штрассена (без вывода промежуточных матриц).
+// Нечётный n на любом уровне дополняется нулями до n + 1.
+// Если потоков больше одного (parallel.h), на первых getStrassenTaskDepth()
+// уровнях рекурсии семь произведений M1..M7 считаются параллельными задачами
 Matrix strassenRec(const Matrix &A, const Matrix &B);
 
+// Штрассен на непрерывных матрицах: C = A * B, A — m x k, B — k x n (любые размеры).
+// Блоки — представления без копий; промежуточные суммы и M1..M7 накапливаются
+// прямо в блоках C. Блоки, у которых хотя бы один размер не больше порога,
+// считаются multiplyBlocked. На уровнях с параллельными задачами у каждого
+// M1..M7 свои буферы, а блоки C собираются после завершения всех задач.
+//
+// Нечётные размеры обрабатываются одним из двух способов — выбирается тот,
+// что дешевле по модели стоимости (strassenPrefersPadding):
+//   - отсечение (peeling) на каждом уровне: чётная часть — Штрассеном,
+//     последние строка/столбец — отдельными тонкими умножениями;
+//   - дополнение нулями один раз сверху до кратного 2^уровней.
+//
+// Собрано для float, double и int64_t (для целых результат точный,
+// пока нет переполнения: суммы блоков растут на каждом уровне).
+template <typename T>
+void strassenRec(BasicConstView<T> A, BasicConstView<T> B, BasicMatrixView<T> C);
+
+// То же с принудительным выбором способа (для сравнения в benchmark)
+template <typename T>
+void strassenPeeled(BasicConstView<T> A, BasicConstView<T> B, BasicMatrixView<T> C);
+template <typename T>
+void strassenPadded(BasicConstView<T> A, BasicConstView<T> B, BasicMatrixView<T> C);
+
+// true, если для m x k на k x n дополнение по модели дешевле отсечения
+bool strassenPrefersPadding(int m, int k, int n);
+
 // Реализация Штрассена для верхнего уровня:
 // считает те же шаги, но печатает M1..M7 и блоки C11..C22
+// (нечётный n дополняется нулями до n + 1)
 Matrix strassenWithPrint(const Matrix &A, const Matrix &B);
 
 #endif // STRASSEN_H
@@ -0,0 +1,78 @@
+#ifndef TRACE_H
+#define TRACE_H
+
+// ---------------------------------------------------------------------------
+// Трассировка рекурсии Штрассена: время, число выделений памяти и объём
+// скопированных данных по уровням рекурсии.
+//
+// Собирается только с макросом MATMUL_TRACE (цель strassen_trace в CMake).
+// В обычной сборке TRACE_LEVEL, TRACE_SCOPE и TRACE_COPIED раскрываются
+// в пустоту, поэтому ядра ничего не платят за трассировку.
+//
+// Области вложены: TRACE_LEVEL(depth) открывает уровень рекурсии,
+// TRACE_SCOPE("add") внутри него — часть работы этого уровня (сложения,
+// копирования, лист). У каждой области считаются полное и собственное
+// время (без вложенных областей), собственные выделения и копирования.
+// ---------------------------------------------------------------------------
+
+#ifdef MATMUL_TRACE
+
+#include <cstddef>
+#include <ostream>
+#include <string>
+#include <vector>
+
+// Сводка по области одного уровня
+struct TraceLevelStats {
+    int level = 0;
+    std::string name;
+    long long calls = 0;
+    double totalMs = 0.0;     // вместе с вложенными областями
+    double selfMs = 0.0;      // без вложенных областей
+    size_t allocations = 0;   // собственные выделения памяти
+    size_t bytesCopied = 0;   // собственные копирования
+};
+
+// Начать сбор (старые данные стираются). В файл трассы попадают только
+// области уровней < eventDepth, сводка считается по всем уровням.
+void traceStart(int eventDepth);
+void traceStop();
+
+// Записать события в формате Chrome trace (chrome://tracing, Perfetto)
+bool writeChromeTrace(const std::string &path);
+
+// Сводка по уровням (level, name) и её вывод таблицей / в CSV
+std::vector<TraceLevelStats> traceSummary();
+void printTraceSummary(std::ostream &out);
+bool writeTraceSummaryCsv(const std::string &path);
+
+// Учесть скопированные байты в текущей области
+void traceCopied(size_t bytes);
+
+class TraceScope {
+public:
+    // level < 0 — уровень родительской области
+    TraceScope(const char *name, int level);
+    ~TraceScope();
+    TraceScope(const TraceScope &) = delete;
+    TraceScope &operator=(const TraceScope &) = delete;
+
+private:
+    bool active_;
+};
+
+#define TRACE_CONCAT_(a, b) a##b
+#define TRACE_CONCAT(a, b) TRACE_CONCAT_(a, b)
+#define TRACE_LEVEL(depth) TraceScope TRACE_CONCAT(traceScope_, __LINE__)("strassenRec", (depth))
+#define TRACE_SCOPE(name) TraceScope TRACE_CONCAT(traceScope_, __LINE__)((name), -1)
+#define TRACE_COPIED(bytes) traceCopied(bytes)
+
+#else
+
+#define TRACE_LEVEL(depth) ((void)0)
+#define TRACE_SCOPE(name) ((void)0)
+#define TRACE_COPIED(bytes) ((void)0)
+
+#endif // MATMUL_TRACE
+
+#endif // TRACE_H
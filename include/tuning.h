@@ -0,0 +1,26 @@
+#ifndef TUNING_H
+#define TUNING_H
+
+#include <map>
+#include <string>
+
+// Каталог с профилями автонастройки (относительно текущей папки)
+extern const char *const TUNING_DIR;
+
+// Отпечаток процессора: FNV-1a от строки "модель|архитектура|число ядер".
+// Совпадает с .py/tuning_profile.py: cpu_fingerprint()
+std::string cpuFingerprint();
+
+// Путь к профилю текущей машины: data/tuning/<fingerprint>.cfg
+std::string tuningProfilePath();
+
+// Чтение профиля "ключ=значение"; false, если файла нет
+bool readTuningProfile(const std::string &path,
+                       std::map<std::string, std::string> &values);
+
+// Загрузка профиля текущей машины и настройка порога Штрассена
+// (и порога плотности multiplyAuto, если он есть в профиле).
+// Возвращает true, если профиль найден и порог Штрассена применён.
+bool loadTuningProfile();
+
+#endif // TUNING_H
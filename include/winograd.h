@@ -0,0 +1,53 @@
+#ifndef WINOGRAD_H
+#define WINOGRAD_H
+
+#include <cstddef>
+#include <vector>
+
+#include "matrix_utils.h"
+
+// ---------------------------------------------------------------------------
+// Вариант Штрассена–Винограда: 7 умножений и 15 сложений блоков на уровень
+// (у классического Штрассена — 18 сложений).
+//
+// Промежуточные суммы хранятся в двух буферах k x k на уровень (X и Y),
+// произведения пишутся прямо в блоки C. Все буферы всех уровней берутся
+// из одной рабочей области, выделенной заранее, поэтому внутри рекурсии
+// память не выделяется.
+// ---------------------------------------------------------------------------
+
+class WinogradWorkspace {
+public:
+    // Рабочая область для матриц n x n при пороге cutoff (0 — текущий порог Штрассена)
+    explicit WinogradWorkspace(int n, int cutoff = 0);
+
+    // Представления указывают в buf_, поэтому копировать нельзя (перемещать можно)
+    WinogradWorkspace(const WinogradWorkspace &) = delete;
+    WinogradWorkspace &operator=(const WinogradWorkspace &) = delete;
+    WinogradWorkspace(WinogradWorkspace &&) = default;
+    WinogradWorkspace &operator=(WinogradWorkspace &&) = default;
+
+    int size() const { return n_; }
+    int cutoff() const { return cutoff_; }
+    // Сколько уровней рекурсии обслуживает область
+    int levels() const { return (int)x_.size(); }
+    size_t bytes() const { return buf_.size() * sizeof(double); }
+
+    MatrixView x(int level) const { return x_[level]; }
+    MatrixView y(int level) const { return y_[level]; }
+
+private:
+    int n_ = 0;
+    int cutoff_ = 1;
+    std::vector<double> buf_;
+    std::vector<MatrixView> x_, y_;
+};
+
+// C = A * B по схеме Винограда с готовой рабочей областью (ws.size() == n)
+void strassenWinograd(ConstMatrixView A, ConstMatrixView B, MatrixView C,
+                      const WinogradWorkspace &ws);
+
+// То же, рабочая область выделяется одним блоком перед рекурсией
+void strassenWinograd(ConstMatrixView A, ConstMatrixView B, MatrixView C);
+
+#endif // WINOGRAD_H
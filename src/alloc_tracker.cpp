@@ -0,0 +1,85 @@
+#include "alloc_tracker.h"
+
+#include <atomic>
+#include <cstdlib>
+#include <new>
+
+namespace {
+std::atomic<size_t> g_current(0);
+std::atomic<size_t> g_peak(0);
+std::atomic<size_t> g_base(0);
+std::atomic<size_t> g_allocations(0);
+thread_local size_t t_allocations = 0;
+
+// Перед блоком храним его размер; заголовок кратен выравниванию malloc
+constexpr size_t HEADER = alignof(std::max_align_t);
+
+void *trackedAlloc(size_t size) {
+    void *raw = std::malloc(size + HEADER);
+    if (!raw) {
+        throw std::bad_alloc();
+    }
+    *static_cast<size_t *>(raw) = size;
+
+    size_t now = g_current.fetch_add(size) + size;
+    size_t peak = g_peak.load();
+    while (now > peak && !g_peak.compare_exchange_weak(peak, now)) {
+    }
+    g_allocations.fetch_add(1);
+    ++t_allocations;
+    return static_cast<char *>(raw) + HEADER;
+}
+
+void trackedFree(void *ptr) {
+    if (!ptr) {
+        return;
+    }
+    void *raw = static_cast<char *>(ptr) - HEADER;
+    g_current.fetch_sub(*static_cast<size_t *>(raw));
+    std::free(raw);
+}
+}
+
+void resetAllocStats() {
+    size_t now = g_current.load();
+    g_base.store(now);
+    g_peak.store(now);
+    g_allocations.store(0);
+}
+
+AllocStats allocStats() {
+    AllocStats s;
+    size_t peak = g_peak.load();
+    size_t base = g_base.load();
+    s.peakBytes = peak > base ? peak - base : 0;
+    s.allocations = g_allocations.load();
+    return s;
+}
+
+size_t threadAllocations() {
+    return t_allocations;
+}
+
+void *operator new(size_t size) {
+    return trackedAlloc(size);
+}
+
+void *operator new[](size_t size) {
+    return trackedAlloc(size);
+}
+
+void operator delete(void *ptr) noexcept {
+    trackedFree(ptr);
+}
+
+void operator delete[](void *ptr) noexcept {
+    trackedFree(ptr);
+}
+
+void operator delete(void *ptr, size_t) noexcept {
+    trackedFree(ptr);
+}
+
+void operator delete[](void *ptr, size_t) noexcept {
+    trackedFree(ptr);
+}
@@ -0,0 +1,113 @@
+#include "bench_stats.h"
+
+#include <algorithm>
+#include <chrono>
+#include <cmath>
+#include <sstream>
+#include <stdexcept>
+
+namespace {
+
+double elapsedMs(const std::function<void()> &fn, long long number) {
+    auto start = std::chrono::steady_clock::now();
+    for (long long i = 0; i < number; ++i) {
+        fn();
+    }
+    auto end = std::chrono::steady_clock::now();
+    std::chrono::duration<double, std::milli> ms = end - start;
+    return ms.count();
+}
+
+// Перцентиль с линейной интерполяцией (как numpy.percentile по умолчанию)
+double percentile(const std::vector<double> &sorted, double p) {
+    double pos = p * (double)(sorted.size() - 1);
+    size_t lo = (size_t)std::floor(pos);
+    size_t hi = (size_t)std::ceil(pos);
+    double frac = pos - (double)lo;
+    return sorted[lo] + (sorted[hi] - sorted[lo]) * frac;
+}
+
+} // namespace
+
+BenchStats summarize(std::vector<double> samples) {
+    if (samples.empty()) {
+        throw std::invalid_argument("summarize: пустой список выборок");
+    }
+
+    BenchStats s;
+    s.samples = samples;
+    std::sort(samples.begin(), samples.end());
+
+    int n = (int)samples.size();
+    s.repeats = n;
+    s.min = samples.front();
+    s.median = percentile(samples, 0.5);
+    s.p95 = percentile(samples, 0.95);
+
+    // Непараметрический 95% ДИ медианы по порядковым статистикам
+    double half = 1.96 * std::sqrt((double)n) / 2.0;
+    int lo = (int)std::floor(n / 2.0 - half);       // 1-based
+    int hi = (int)std::ceil(1.0 + n / 2.0 + half);  // 1-based
+    lo = std::max(lo, 1);
+    hi = std::min(hi, n);
+    s.ciLow = samples[lo - 1];
+    s.ciHigh = samples[hi - 1];
+
+    return s;
+}
+
+BenchStats measure(const std::function<void()> &fn, const BenchConfig &cfg) {
+    for (int i = 0; i < cfg.warmup; ++i) {
+        fn();
+    }
+
+    // Калибровка: удваиваем число вызовов, пока выборка не станет >= minTimeMs
+    long long number = 1;
+    while (elapsedMs(fn, number) < cfg.minTimeMs) {
+        number *= 2;
+    }
+
+    std::vector<double> samples;
+    samples.reserve(cfg.repeats);
+    for (int r = 0; r < cfg.repeats; ++r) {
+        samples.push_back(elapsedMs(fn, number) / (double)number);
+    }
+
+    BenchStats s = summarize(samples);
+    s.number = number;
+    return s;
+}
+
+std::vector<int> parseSizes(const std::string &text) {
+    std::vector<int> sizes;
+    std::stringstream ss(text);
+    std::string item;
+
+    while (std::getline(ss, item, ',')) {
+        if (item.empty()) {
+            continue;
+        }
+        size_t colon = item.find(':');
+        if (colon == std::string::npos) {
+            sizes.push_back(std::stoi(item));
+            continue;
+        }
+
+        // Диапазон a:b — степени двойки, начиная с a
+        int from = std::stoi(item.substr(0, colon));
+        int to = std::stoi(item.substr(colon + 1));
+        if (from <= 0 || to < from) {
+            throw std::invalid_argument("некорректный диапазон размеров: " + item);
+        }
+        for (long long n = from; n <= to; n *= 2) {
+            sizes.push_back((int)n);
+        }
+    }
+
+    for (int n : sizes) {
+        if (n <= 0) {
+            throw std::invalid_argument("размер матрицы должен быть положительным");
+        }
+    }
+    return sizes;
+}
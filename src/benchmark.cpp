@@ -1,12 +1,22 @@
 #include <iostream>
 #include <fstream>
+#include <string>
 #include <vector>
 #include <cstdlib>
 #include <ctime>
-#include <chrono>
+#include <functional>
+#include <stdexcept>
+#include <utility>
 
+#include "alloc_tracker.h"
 #include "matrix_utils.h"
+#include "parallel.h"
+#include "sparse.h"
 #include "strassen.h"
+#include "winograd.h"
+#include "bench_stats.h"
+#include "columnar.h"
+#include "tuning.h"
 
 // Заполнение матрицы случайными числами 0..9
 void fillRandom(Matrix &m) {
@@ -18,61 +28,606 @@ void fillRandom(Matrix &m) {
     }
 }
 
-// Замер времени стандартного алгоритма
-double measureStandard(const Matrix &A, const Matrix &B) {
-    auto start = std::chrono::high_resolution_clock::now();
-    Matrix C = multiplyStandard(A, B);
-    auto end = std::chrono::high_resolution_clock::now();
-    std::chrono::duration<double, std::milli> ms = end - start;
-    return ms.count();
+// Разреженная матрица: каждый элемент с вероятностью density — случайное 1..9, иначе 0
+void fillSparse(FlatMatrix &m, double density) {
+    for (int i = 0; i < m.rows(); ++i) {
+        for (int j = 0; j < m.cols(); ++j) {
+            bool nonzero = std::rand() / (RAND_MAX + 1.0) < density;
+            m(i, j) = nonzero ? 1 + std::rand() % 9 : 0.0;
+        }
+    }
 }
 
-// Замер времени алгоритма Штрассена (без печати M1..M7)
-double measureStrassen(const Matrix &A, const Matrix &B) {
-    auto start = std::chrono::high_resolution_clock::now();
-    Matrix C = strassenRec(A, B);
-    auto end = std::chrono::high_resolution_clock::now();
-    std::chrono::duration<double, std::milli> ms = end - start;
-    return ms.count();
+// Чтобы компилятор не выбросил вычисления, результат «используется» здесь
+volatile double g_sink = 0.0;
+
+// Типы элементов, которые можно замерить (имена как у dtype в NumPy)
+const std::vector<std::string> DTYPES = {"float64", "float32", "int64"};
+
+std::vector<std::string> parseDtypes(const std::string &text) {
+    std::vector<std::string> dtypes;
+    size_t start = 0;
+    while (start <= text.size()) {
+        size_t end = text.find(',', start);
+        if (end == std::string::npos) {
+            end = text.size();
+        }
+        std::string item = text.substr(start, end - start);
+        if (!item.empty()) {
+            bool known = false;
+            for (const std::string &d : DTYPES) {
+                known = known || d == item;
+            }
+            if (!known) {
+                throw std::invalid_argument("неизвестный тип элементов: " + item);
+            }
+            dtypes.push_back(item);
+        }
+        start = end + 1;
+    }
+    if (dtypes.empty()) {
+        throw std::invalid_argument("--dtypes: пустой список");
+    }
+    return dtypes;
 }
 
-int main() {
-    std::srand((unsigned int)std::time(nullptr));
+// Список плотностей через запятую: "0.001,0.01,0.1,1"
+std::vector<double> parseDensities(const std::string &text) {
+    std::vector<double> densities;
+    size_t start = 0;
+    while (start <= text.size()) {
+        size_t end = text.find(',', start);
+        if (end == std::string::npos) {
+            end = text.size();
+        }
+        std::string item = text.substr(start, end - start);
+        if (!item.empty()) {
+            double d = std::stod(item);
+            if (!(d >= 0.0 && d <= 1.0)) {
+                throw std::invalid_argument("плотность должна быть в [0, 1]: " + item);
+            }
+            densities.push_back(d);
+        }
+        start = end + 1;
+    }
+    if (densities.empty()) {
+        throw std::invalid_argument("--densities: пустой список");
+    }
+    return densities;
+}
 
-    // Размеры матриц, для которых будем мерить время
-    std::vector<int> sizes = {2, 4, 8, 16, 32};
+// Параметры командной строки
+struct Options {
+    // Степени двойки и несколько размеров, где Штрассену нужны отсечение/дополнение
+    std::vector<int> sizes = {2, 4, 8, 16, 32, 48, 64, 96, 100, 127, 128};
+    BenchConfig bench;
+    std::string out = "timings.csv";
+    int cutoff = 0;              // 0 — порог из профиля автонастройки
+    std::vector<int> cutoffs;    // режим автонастройки: перебор порогов
+    int threads = 1;             // число потоков для обычного режима
+    int taskDepth = -1;          // глубина задач Штрассена (-1 — по умолчанию)
+    std::vector<int> threadSweep; // режим масштабирования: перебор числа потоков
+    BlockSizes blocks;           // блоки для multiplyBlocked
+    std::vector<std::string> dtypes = {"float64"}; // типы элементов
+    std::vector<double> densities; // режим плотности: перебор доли ненулевых
+};
 
-    std::ofstream fout("timings.csv");
-    if (!fout.is_open()) {
-        std::cout << "Не удалось открыть файл timings.csv для записи." << std::endl;
-        return 1;
+void printUsage() {
+    std::cout << "Использование: benchmark [--sizes 2:4096|64,100,128] [--repeats N]\n"
+                 "                         [--warmup N] [--min-time MS] [--out timings.csv]\n"
+                 "                         [--cutoff N] [--cutoffs 8:256]\n"
+                 "                         [--threads N] [--task-depth D] [--thread-sweep 1,2,4]\n"
+                 "                         [--block ROWS,INNER,COLS] [--dtypes float64,float32,int64]\n"
+                 "                         [--densities 0.001,0.01,0.1,1]\n"
+                 "  --cutoff  порог Штрассена (по умолчанию — из профиля data/tuning)\n"
+                 "  --cutoffs режим автонастройки: замер Штрассена для каждого порога,\n"
+                 "            в --out пишутся строки n,cutoff,strassen_ms,standard_ms\n"
+                 "  --threads      число потоков (по умолчанию 1)\n"
+                 "  --task-depth   до какой глубины рекурсии M1..M7 считаются задачами\n"
+                 "  --thread-sweep режим масштабирования: замер для каждого числа потоков,\n"
+                 "                в --out пишутся строки\n"
+                 "                n,algorithm,threads,ms,speedup,efficiency\n"
+                 "  --block        размеры блоков multiplyBlocked (по умолчанию 64,64,256)\n"
+                 "  --dtypes       типы элементов (по умолчанию float64); standard, strassen\n"
+                 "                 и winograd собраны только для float64\n"
+                 "  --densities    режим плотности: плотные и разреженные ядра на матрицах\n"
+                 "                 с заданной долей ненулевых (float64), в --out пишутся строки\n"
+                 "                 n,density,algorithm,ms,min_ms,p95_ms,kernel\n";
+}
+
+bool parseOptions(int argc, char **argv, Options &opt) {
+    for (int i = 1; i < argc; ++i) {
+        std::string arg = argv[i];
+        if (arg == "--help" || arg == "-h") {
+            printUsage();
+            return false;
+        }
+        if (i + 1 >= argc) {
+            std::cout << "Не задано значение для " << arg << std::endl;
+            printUsage();
+            return false;
+        }
+        std::string value = argv[++i];
+        if (arg == "--sizes") {
+            opt.sizes = parseSizes(value);
+        } else if (arg == "--repeats") {
+            opt.bench.repeats = std::stoi(value);
+        } else if (arg == "--warmup") {
+            opt.bench.warmup = std::stoi(value);
+        } else if (arg == "--min-time") {
+            opt.bench.minTimeMs = std::stod(value);
+        } else if (arg == "--out") {
+            opt.out = value;
+        } else if (arg == "--cutoff") {
+            opt.cutoff = std::stoi(value);
+        } else if (arg == "--cutoffs") {
+            opt.cutoffs = parseSizes(value);
+        } else if (arg == "--threads") {
+            opt.threads = std::stoi(value);
+        } else if (arg == "--task-depth") {
+            opt.taskDepth = std::stoi(value);
+        } else if (arg == "--thread-sweep") {
+            opt.threadSweep = parseSizes(value);
+        } else if (arg == "--densities") {
+            opt.densities = parseDensities(value);
+        } else if (arg == "--dtypes") {
+            opt.dtypes = parseDtypes(value);
+        } else if (arg == "--block") {
+            std::vector<int> b = parseSizes(value);
+            if (b.size() != 3) {
+                throw std::invalid_argument("--block: нужны три числа ROWS,INNER,COLS");
+            }
+            opt.blocks.rows = b[0];
+            opt.blocks.inner = b[1];
+            opt.blocks.cols = b[2];
+        } else {
+            std::cout << "Неизвестный параметр: " << arg << std::endl;
+            printUsage();
+            return false;
+        }
+    }
+    if (opt.bench.repeats < 1) {
+        throw std::invalid_argument("--repeats должен быть >= 1");
+    }
+    if (opt.threads < 1) {
+        throw std::invalid_argument("--threads должен быть >= 1");
+    }
+    if (opt.taskDepth < -1) {
+        throw std::invalid_argument("--task-depth должен быть >= 0");
     }
+    return true;
+}
 
-    // Заголовок CSV
-    fout << "n,standard_ms,strassen_ms\n";
+// Замеряемый алгоритм: имя (префикс колонок CSV), для каких n применим, сам замер
+struct Algorithm {
+    std::string name;
+    bool (*applicable)(int n); // nullptr — для любых n
+    bool float64Only;          // Matrix и Виноград собраны только для double
+    std::function<void()> run;
+};
 
-    std::cout << "Запуск бенчмарка..." << std::endl;
+// Непрерывные матрицы с элементами типа T
+template <typename T>
+struct FlatOperands {
+    BasicFlatMatrix<T> A, B, C;
 
-    for (int n : sizes) {
-        std::cout << "Размер n = " << n << std::endl;
+    void reset(const Matrix &a, const Matrix &b) {
+        A = toFlatAs<T>(a);
+        B = toFlatAs<T>(b);
+        C = BasicFlatMatrix<T>((int)a.size());
+    }
+};
 
+// Матрицы, на которых замеряются алгоритмы: старый формат (double)
+// и непрерывный для каждого типа элементов
+struct Operands {
+    Matrix A, B;
+    FlatOperands<double> f64;
+    FlatOperands<float> f32;
+    FlatOperands<int64_t> i64;
+
+    void reset(int n, const std::string &dtype) {
+        A = createMatrix(n);
+        B = createMatrix(n);
+        fillRandom(A);
+        fillRandom(B);
+        if (dtype == "float32") {
+            f32.reset(A, B);
+        } else if (dtype == "int64") {
+            i64.reset(A, B);
+        } else {
+            f64.reset(A, B);
+        }
+    }
+};
+
+// Список алгоритмов одинаков для всех типов (это колонки CSV);
+// алгоритмы только для double замеряются лишь при T = double
+template <typename T>
+std::vector<Algorithm> makeAlgorithms(Operands &ops, FlatOperands<T> &f) {
+    return {
+        {"standard", nullptr, true, [&ops]() {
+            Matrix C = multiplyStandard(ops.A, ops.B);
+            g_sink = g_sink + C[0][0];
+        }},
+        {"strassen", nullptr, true, [&ops]() {
+            Matrix C = strassenRec(ops.A, ops.B);
+            g_sink = g_sink + C[0][0];
+        }},
+        {"standard_flat", nullptr, false, [&f]() {
+            multiplyStandard(f.A.view(), f.B.view(), f.C.view());
+            g_sink = g_sink + (double)f.C(0, 0);
+        }},
+        // i-k-j с разбиением на блоки под кэш
+        {"blocked", nullptr, false, [&f]() {
+            multiplyBlocked(f.A.view(), f.B.view(), f.C.view());
+            g_sink = g_sink + (double)f.C(0, 0);
+        }},
+        {"strassen_flat", nullptr, false, [&f]() {
+            strassenRec(f.A.view(), f.B.view(), f.C.view());
+            g_sink = g_sink + (double)f.C(0, 0);
+        }},
+        // Нечётные размеры: только отсечение или только дополнение нулями
+        {"strassen_peel", nullptr, false, [&f]() {
+            strassenPeeled(f.A.view(), f.B.view(), f.C.view());
+            g_sink = g_sink + (double)f.C(0, 0);
+        }},
+        {"strassen_pad", nullptr, false, [&f]() {
+            strassenPadded(f.A.view(), f.B.view(), f.C.view());
+            g_sink = g_sink + (double)f.C(0, 0);
+        }},
+        // Штрассен–Виноград: рабочая область выделяется при каждом вызове,
+        // чтобы пик памяти сравнивался честно
+        {"winograd", nullptr, true, [&ops]() {
+            strassenWinograd(ops.f64.A.view(), ops.f64.B.view(), ops.f64.C.view());
+            g_sink = g_sink + ops.f64.C(0, 0);
+        }},
+    };
+}
+
+std::vector<Algorithm> makeAlgorithms(Operands &ops, const std::string &dtype) {
+    if (dtype == "float32") {
+        return makeAlgorithms(ops, ops.f32);
+    }
+    if (dtype == "int64") {
+        return makeAlgorithms(ops, ops.i64);
+    }
+    return makeAlgorithms(ops, ops.f64);
+}
+
+// Замеряется ли алгоритм для n и типа элементов
+bool runsFor(const Algorithm &alg, int n, const std::string &dtype) {
+    if (alg.float64Only && dtype != "float64") {
+        return false;
+    }
+    return !alg.applicable || alg.applicable(n);
+}
+
+// timings.csv -> timings_samples.mcol (сырые выборки, .py/columnar.py)
+std::string samplesPath(const std::string &out) {
+    std::string base = out;
+    if (base.size() > 4 && base.substr(base.size() - 4) == ".csv") {
+        base = base.substr(0, base.size() - 4);
+    }
+    return base + "_samples.mcol";
+}
+
+void writeStatsColumns(std::ofstream &fout, const BenchStats &s, const AllocStats &mem) {
+    fout << "," << s.min << "," << s.p95 << "," << s.ciLow << "," << s.ciHigh
+         << "," << s.repeats << "," << mem.peakBytes << "," << mem.allocations;
+}
+
+// Пик динамической памяти и число выделений за один вызов (отдельный прогон)
+AllocStats measureMemory(const std::function<void()> &fn) {
+    resetAllocStats();
+    fn();
+    return allocStats();
+}
+
+// Выборки одной пары (n, dtype) по всем алгоритмам — один блок *.mcol
+struct SampleColumns {
+    std::vector<std::string> algorithm;
+    std::vector<int64_t> n;
+    std::vector<std::string> dtype;
+    std::vector<int64_t> repeat;
+    std::vector<double> ms;
+
+    void add(const std::string &alg, int size, const std::string &type, const BenchStats &s) {
+        for (size_t r = 0; r < s.samples.size(); ++r) {
+            algorithm.push_back(alg);
+            n.push_back(size);
+            dtype.push_back(type);
+            repeat.push_back((int64_t)r);
+            ms.push_back(s.samples[r]);
+        }
+    }
+
+    ColumnarChunk chunk() const {
+        ColumnarChunk c;
+        c.addStrings("algorithm", algorithm);
+        c.addInt64("n", n);
+        c.addStrings("dtype", dtype);
+        c.addInt64("repeat", repeat);
+        c.addFloat64("ms", ms);
+        // Потоки C++-ядер (--threads), не BLAS
+        c.addInt64("threads", std::vector<int64_t>(ms.size(), getThreadCount()));
+        return c;
+    }
+};
+
+void printStats(const std::string &name, const BenchStats &s, const AllocStats &mem) {
+    std::cout << "  " << name << ": median " << s.median << " ms"
+              << " (min " << s.min << ", p95 " << s.p95
+              << ", 95% ДИ [" << s.ciLow << "; " << s.ciHigh << "]"
+              << ", " << s.repeats << " x " << s.number << " вызовов)"
+              << ", пик памяти " << mem.peakBytes / 1024.0 << " КБ"
+              << " за " << mem.allocations << " выделений\n";
+}
+
+// Режим автонастройки: для каждого n и каждого порога — время Штрассена.
+// Стандартный алгоритм замеряется один раз на n для сравнения.
+int runCutoffSweep(const Options &opt) {
+    std::ofstream fout(opt.out);
+    if (!fout.is_open()) {
+        std::cout << "Не удалось открыть файл " << opt.out << " для записи." << std::endl;
+        return 1;
+    }
+    fout << "n,cutoff,strassen_ms,standard_ms\n";
+
+    for (int n : opt.sizes) {
         Matrix A = createMatrix(n);
         Matrix B = createMatrix(n);
-
         fillRandom(A);
         fillRandom(B);
 
-        double t_std = measureStandard(A, B);
-        double t_strassen = measureStrassen(A, B);
+        BenchStats standard = measure([&]() {
+            Matrix C = multiplyStandard(A, B);
+            g_sink = g_sink + C[0][0];
+        }, opt.bench);
+        std::cout << "n = " << n << ", standard: " << standard.median << " ms" << std::endl;
 
-        fout << n << "," << t_std << "," << t_strassen << "\n";
+        for (int cutoff : opt.cutoffs) {
+            setStrassenCutoff(cutoff);
+            BenchStats strassen = measure([&]() {
+                Matrix C = strassenRec(A, B);
+                g_sink = g_sink + C[0][0];
+            }, opt.bench);
+            fout << n << "," << cutoff << "," << strassen.median << ","
+                 << standard.median << "\n";
+            fout.flush();
+            std::cout << "  cutoff = " << cutoff << ": " << strassen.median << " ms" << std::endl;
+        }
+    }
+
+    std::cout << "Готово. Данные автонастройки записаны в " << opt.out << std::endl;
+    return 0;
+}
+
+// Режим масштабирования: для каждого n, алгоритма и числа потоков — медиана.
+// Ускорение и эффективность считаются относительно первого значения в списке
+// (обычно 1 поток): speedup = T(p0) / T(p), efficiency = speedup * p0 / p.
+int runThreadSweep(const Options &opt) {
+    std::ofstream fout(opt.out);
+    if (!fout.is_open()) {
+        std::cout << "Не удалось открыть файл " << opt.out << " для записи." << std::endl;
+        return 1;
+    }
+    fout << "n,algorithm,threads,ms,speedup,efficiency\n";
+
+    // Масштабирование замеряется на float64
+    Operands ops;
+    std::vector<Algorithm> algorithms = makeAlgorithms(ops, "float64");
+    int baseThreads = opt.threadSweep.front();
+
+    for (int n : opt.sizes) {
+        std::cout << "Размер n = " << n << std::endl;
+        ops.reset(n, "float64");
+
+        for (const Algorithm &alg : algorithms) {
+            if (!runsFor(alg, n, "float64")) {
+                continue;
+            }
+            double baseMs = 0.0;
+            for (int threads : opt.threadSweep) {
+                setThreadCount(threads);
+                BenchStats s = measure(alg.run, opt.bench);
+                if (threads == baseThreads) {
+                    baseMs = s.median;
+                }
+                double speedup = baseMs / s.median;
+                double efficiency = speedup * baseThreads / threads;
+                fout << n << "," << alg.name << "," << threads << "," << s.median << ","
+                     << speedup << "," << efficiency << "\n";
+                fout.flush();
+                std::cout << "  " << alg.name << ", потоков " << threads << ": "
+                          << s.median << " ms (ускорение " << speedup
+                          << ", эффективность " << efficiency << ")" << std::endl;
+            }
+        }
+    }
+
+    std::cout << "Готово. Данные масштабирования записаны в " << opt.out << std::endl;
+    return 0;
+}
+
+// Режим плотности: для каждого n и плотности — плотное ядро, три разреженных
+// и multiplyAuto. Сжатие в CSR/CSC входит в замер: так же платит multiplyAuto,
+// когда операнды приходят плотными. kernel — ядро, которое выбрал multiplyAuto.
+int runDensitySweep(const Options &opt) {
+    std::ofstream fout(opt.out);
+    if (!fout.is_open()) {
+        std::cout << "Не удалось открыть файл " << opt.out << " для записи." << std::endl;
+        return 1;
+    }
+    fout << "n,density,algorithm,ms,min_ms,p95_ms,kernel\n";
+    std::cout << "Порог плотности: " << getSparseThreshold() << std::endl;
+
+    for (int n : opt.sizes) {
+        FlatMatrix A(n), B(n), C(n);
+        for (double density : opt.densities) {
+            fillSparse(A, density);
+            fillSparse(B, density);
+            std::cout << "n = " << n << ", плотность " << density << std::endl;
+
+            MultiplyKernel chosen = MultiplyKernel::Dense;
+            std::vector<std::pair<std::string, std::function<void()> > > algorithms = {
+                {"dense", [&]() { multiplyBlocked(A.view(), B.view(), C.view()); }},
+                {"csr_dense", [&]() { multiplySparseDense(toCsr<double>(A.view()), B.view(), C.view()); }},
+                {"dense_csc", [&]() { multiplyDenseSparse(A.view(), toCsc<double>(B.view()), C.view()); }},
+                {"csr_csr", [&]() {
+                    toDense(multiplySparse(toCsr<double>(A.view()), toCsr<double>(B.view())), C.view());
+                }},
+                {"auto", [&]() { chosen = multiplyAuto(A.view(), B.view(), C.view()); }},
+            };
+
+            for (const auto &alg : algorithms) {
+                BenchStats s = measure([&]() {
+                    alg.second();
+                    g_sink = g_sink + C(0, 0);
+                }, opt.bench);
+                std::string kernel = alg.first == "auto" ? kernelName(chosen) : alg.first;
+                fout << n << "," << density << "," << alg.first << "," << s.median << ","
+                     << s.min << "," << s.p95 << "," << kernel << "\n";
+                fout.flush();
+                std::cout << "  " << alg.first << ": " << s.median << " ms";
+                if (alg.first == "auto") {
+                    std::cout << " (ядро " << kernel << ")";
+                }
+                std::cout << std::endl;
+            }
+        }
+    }
+
+    std::cout << "Готово. Данные по плотности записаны в " << opt.out << std::endl;
+    return 0;
+}
+
+int main(int argc, char **argv) {
+    Options opt;
+    try {
+        if (!parseOptions(argc, argv, opt)) {
+            return 1;
+        }
+    } catch (const std::exception &e) {
+        std::cout << "Ошибка в параметрах: " << e.what() << std::endl;
+        return 1;
+    }
+
+    std::srand((unsigned int)std::time(nullptr));
+
+    if (!opt.cutoffs.empty()) {
+        return runCutoffSweep(opt);
+    }
+
+    if (opt.cutoff > 0) {
+        setStrassenCutoff(opt.cutoff);
+    } else {
+        loadTuningProfile();
+    }
+    std::cout << "Порог Штрассена: " << getStrassenCutoff() << std::endl;
+
+    if (opt.taskDepth >= 0) {
+        setStrassenTaskDepth(opt.taskDepth);
+    }
+    setBlockSizes(opt.blocks);
+    if (!opt.threadSweep.empty()) {
+        return runThreadSweep(opt);
+    }
+    setThreadCount(opt.threads);
+    std::cout << "Потоков: " << getThreadCount()
+              << ", глубина задач Штрассена: " << getStrassenTaskDepth() << std::endl;
+    if (!opt.densities.empty()) {
+        return runDensitySweep(opt);
+    }
 
-        std::cout << "  standard: " << t_std << " ms\n";
-        std::cout << "  strassen: " << t_strassen << " ms\n";
+    std::ofstream fout(opt.out);
+    if (!fout.is_open()) {
+        std::cout << "Не удалось открыть файл " << opt.out << " для записи." << std::endl;
+        return 1;
+    }
+    std::string samplesOut = samplesPath(opt.out);
+    ColumnarWriter fsamples;
+    if (!fsamples.open(samplesOut, true)) {
+        std::cout << "Не удалось открыть файл " << samplesOut << " для записи." << std::endl;
+        return 1;
+    }
+
+    std::cout << "Запуск бенчмарка..." << std::endl;
+
+    // Матрицы для текущего n: старый формат (вектор векторов) и непрерывный
+    Operands ops;
+    std::vector<Algorithm> algorithms = makeAlgorithms(ops, "float64");
+
+    // Заголовок CSV: медианы идут первыми, как и раньше; строка — пара (n, dtype)
+    fout << "n,dtype";
+    for (const Algorithm &alg : algorithms) {
+        fout << "," << alg.name << "_ms";
+    }
+    for (const Algorithm &alg : algorithms) {
+        fout << "," << alg.name << "_min_ms," << alg.name << "_p95_ms,"
+             << alg.name << "_ci_low_ms," << alg.name << "_ci_high_ms,"
+             << alg.name << "_repeats," << alg.name << "_peak_bytes,"
+             << alg.name << "_allocs";
+    }
+    fout << "\n";
+
+    for (int n : opt.sizes) {
+        std::cout << "Размер n = " << n << std::endl;
+        if (!isPowerOfTwo(n)) {
+            std::cout << "  Штрассен для нечётных блоков: "
+                      << (strassenPrefersPadding(n, n, n) ? "дополнение нулями" : "отсечение")
+                      << std::endl;
+        }
+
+        for (const std::string &dtype : opt.dtypes) {
+            if (opt.dtypes.size() > 1) {
+                std::cout << "  Тип элементов: " << dtype << std::endl;
+            }
+            ops.reset(n, dtype);
+            algorithms = makeAlgorithms(ops, dtype);
+
+            std::vector<BenchStats> results(algorithms.size());
+            std::vector<AllocStats> memory(algorithms.size());
+            std::vector<bool> measured(algorithms.size(), false);
+            SampleColumns samples;
+            for (size_t a = 0; a < algorithms.size(); ++a) {
+                const Algorithm &alg = algorithms[a];
+                if (!runsFor(alg, n, dtype)) {
+                    continue;
+                }
+                results[a] = measure(alg.run, opt.bench);
+                memory[a] = measureMemory(alg.run);
+                measured[a] = true;
+                samples.add(alg.name, n, dtype, results[a]);
+                printStats(alg.name, results[a], memory[a]);
+            }
+
+            fout << n << "," << dtype;
+            for (size_t a = 0; a < algorithms.size(); ++a) {
+                fout << ",";
+                if (measured[a]) {
+                    fout << results[a].median;
+                }
+            }
+            for (size_t a = 0; a < algorithms.size(); ++a) {
+                if (measured[a]) {
+                    writeStatsColumns(fout, results[a], memory[a]);
+                } else {
+                    fout << ",,,,,,,";
+                }
+            }
+            fout << "\n";
+            fout.flush();
+            // Блок пишется сразу: если бенчмарк упадёт, готовые n сохранятся
+            if (!fsamples.append(samples.chunk())) {
+                std::cout << "Не удалось записать выборки в " << samplesOut << std::endl;
+                return 1;
+            }
+        }
     }
 
-    fout.close();
-    std::cout << "Готово. Данные записаны в timings.csv" << std::endl;
+    std::cout << "Готово. Данные записаны в " << opt.out
+              << " и " << samplesOut << std::endl;
 
     return 0;
 }
@@ -0,0 +1,97 @@
+#include "capi.h"
+#include "matrix_utils.h"
+#include "strassen.h"
+
+#include <new>
+
+namespace {
+
+// Буферы вызывающей стороны оборачиваются в представления без копирования
+template <typename T>
+BasicMatrixView<const T> inView(const T *data, int rows, int cols) {
+    return BasicMatrixView<const T>(data, rows, cols, cols);
+}
+
+template <typename T>
+BasicMatrixView<T> outView(T *data, int rows, int cols) {
+    return BasicMatrixView<T>(data, rows, cols, cols);
+}
+
+bool validSizes(int m, int k, int n) {
+    return m > 0 && k > 0 && n > 0;
+}
+
+template <typename T>
+int standardCall(const T *a, const T *b, T *c, int m, int k, int n) {
+    if (!validSizes(m, k, n)) {
+        return MATMUL_EBADSIZE;
+    }
+    // bad_alloc, system_error от потоков и т.п. не должны пройти через extern "C"
+    try {
+        multiplyStandard(inView(a, m, k), inView(b, k, n), outView(c, m, n));
+    } catch (const std::bad_alloc &) {
+        return MATMUL_ENOMEM;
+    } catch (...) {
+        return MATMUL_EINTERNAL;
+    }
+    return MATMUL_OK;
+}
+
+template <typename T>
+int strassenCall(const T *a, const T *b, T *c, int m, int k, int n) {
+    if (!validSizes(m, k, n)) {
+        return MATMUL_EBADSIZE;
+    }
+    try {
+        strassenRec(inView(a, m, k), inView(b, k, n), outView(c, m, n));
+    } catch (const std::bad_alloc &) {
+        return MATMUL_ENOMEM;
+    } catch (...) {
+        return MATMUL_EINTERNAL;
+    }
+    return MATMUL_OK;
+}
+
+} // namespace
+
+extern "C" int matmul_standard(const double *a, const double *b, double *c,
+                               int m, int k, int n) {
+    return standardCall(a, b, c, m, k, n);
+}
+
+extern "C" int matmul_standard_f32(const float *a, const float *b, float *c,
+                                   int m, int k, int n) {
+    return standardCall(a, b, c, m, k, n);
+}
+
+extern "C" int matmul_standard_i64(const int64_t *a, const int64_t *b, int64_t *c,
+                                   int m, int k, int n) {
+    return standardCall(a, b, c, m, k, n);
+}
+
+extern "C" int matmul_strassen(const double *a, const double *b, double *c,
+                               int m, int k, int n) {
+    return strassenCall(a, b, c, m, k, n);
+}
+
+extern "C" int matmul_strassen_f32(const float *a, const float *b, float *c,
+                                   int m, int k, int n) {
+    return strassenCall(a, b, c, m, k, n);
+}
+
+extern "C" int matmul_strassen_i64(const int64_t *a, const int64_t *b, int64_t *c,
+                                   int m, int k, int n) {
+    return strassenCall(a, b, c, m, k, n);
+}
+
+extern "C" int matmul_set_strassen_cutoff(int cutoff) {
+    if (cutoff < 1) {
+        return MATMUL_EBADSIZE;
+    }
+    setStrassenCutoff(cutoff);
+    return MATMUL_OK;
+}
+
+extern "C" int matmul_get_strassen_cutoff(void) {
+    return getStrassenCutoff();
+}
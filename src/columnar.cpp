@@ -0,0 +1,192 @@
+#include "columnar.h"
+
+#include <cstring>
+#include <filesystem>
+#include <map>
+
+namespace {
+
+const char MAGIC[4] = {'M', 'C', 'O', 'L'};
+const char CHUNK_MAGIC[4] = {'C', 'H', 'N', 'K'};
+const uint32_t VERSION = 1;
+
+const uint8_t TYPE_FLOAT64 = 1;
+const uint8_t TYPE_INT64 = 2;
+const uint8_t TYPE_STRING = 3;
+
+// Значение как есть (little-endian на поддерживаемых платформах)
+template <typename T>
+void put(std::string &out, T value) {
+    char bytes[sizeof(T)];
+    std::memcpy(bytes, &value, sizeof(T));
+    out.append(bytes, sizeof(T));
+}
+
+template <typename T>
+std::string raw(const std::vector<T> &values) {
+    return std::string(reinterpret_cast<const char *>(values.data()), values.size() * sizeof(T));
+}
+
+template <typename T>
+bool get(std::istream &in, T &value) {
+    char bytes[sizeof(T)];
+    if (!in.read(bytes, sizeof(T))) {
+        return false;
+    }
+    std::memcpy(&value, bytes, sizeof(T));
+    return true;
+}
+
+const uint64_t HEADER_SIZE = sizeof(MAGIC) + sizeof(uint32_t);
+const uint64_t CHUNK_HEADER_SIZE = sizeof(CHUNK_MAGIC) + 2 * sizeof(uint32_t) + sizeof(uint64_t);
+
+// Длина заголовка и целых блоков файла размером size: дальше — недописанный
+// хвост от упавшей записи. 0 — нет даже заголовка; false — файл не *.mcol
+// или блок повреждён
+bool completeLength(std::ifstream &in, uint64_t size, uint64_t &length) {
+    length = 0;
+    if (size < HEADER_SIZE) {
+        return true;
+    }
+    char magic[sizeof(MAGIC)];
+    uint32_t version = 0;
+    if (!in.read(magic, sizeof(magic)) || !get(in, version) ||
+        std::memcmp(magic, MAGIC, sizeof(MAGIC)) != 0 || version != VERSION) {
+        return false;
+    }
+    uint64_t offset = HEADER_SIZE;
+    while (offset + CHUNK_HEADER_SIZE <= size) {
+        char chunkMagic[sizeof(CHUNK_MAGIC)];
+        uint32_t rows = 0, count = 0;
+        uint64_t chunkSize = 0;
+        in.seekg((std::streamoff)offset);
+        if (!in.read(chunkMagic, sizeof(chunkMagic)) || !get(in, rows) || !get(in, count) ||
+            !get(in, chunkSize) || std::memcmp(chunkMagic, CHUNK_MAGIC, sizeof(CHUNK_MAGIC)) != 0) {
+            return false;
+        }
+        if (chunkSize > size - offset - CHUNK_HEADER_SIZE) {
+            break;
+        }
+        offset += CHUNK_HEADER_SIZE + chunkSize;
+    }
+    length = offset;
+    return true;
+}
+
+} // namespace
+
+void ColumnarChunk::addColumn(const std::string &name, uint8_t type, size_t rows,
+                              std::string data) {
+    if (columns_.empty()) {
+        rows_ = rows;
+    } else if (rows != rows_) {
+        consistent_ = false;
+    }
+    if (name.size() > 255) {
+        consistent_ = false;
+    }
+
+    std::string column;
+    put<uint8_t>(column, (uint8_t)name.size());
+    column += name;
+    put<uint8_t>(column, type);
+    column += data;
+    columns_.push_back(std::move(column));
+}
+
+void ColumnarChunk::addFloat64(const std::string &name, const std::vector<double> &values) {
+    addColumn(name, TYPE_FLOAT64, values.size(), raw(values));
+}
+
+void ColumnarChunk::addInt64(const std::string &name, const std::vector<int64_t> &values) {
+    addColumn(name, TYPE_INT64, values.size(), raw(values));
+}
+
+void ColumnarChunk::addStrings(const std::string &name, const std::vector<std::string> &values) {
+    // Словарь: повторяющиеся имена алгоритмов и типов хранятся один раз
+    std::map<std::string, uint32_t> index;
+    std::vector<const std::string *> dictionary;
+    std::vector<uint32_t> codes;
+    codes.reserve(values.size());
+    for (const std::string &value : values) {
+        auto it = index.find(value);
+        if (it == index.end()) {
+            it = index.emplace(value, (uint32_t)dictionary.size()).first;
+            dictionary.push_back(&it->first);
+        }
+        codes.push_back(it->second);
+    }
+
+    std::string data;
+    put<uint32_t>(data, (uint32_t)dictionary.size());
+    for (const std::string *value : dictionary) {
+        if (value->size() > 65535) {
+            consistent_ = false;
+        }
+        put<uint16_t>(data, (uint16_t)value->size());
+        data += *value;
+    }
+    data += raw(codes);
+    addColumn(name, TYPE_STRING, values.size(), std::move(data));
+}
+
+std::string ColumnarChunk::encode() const {
+    std::string payload;
+    for (const std::string &column : columns_) {
+        payload += column;
+    }
+
+    std::string out(CHUNK_MAGIC, sizeof(CHUNK_MAGIC));
+    put<uint32_t>(out, (uint32_t)rows_);
+    put<uint32_t>(out, (uint32_t)columns_.size());
+    put<uint64_t>(out, (uint64_t)payload.size());
+    return out + payload;
+}
+
+bool ColumnarWriter::open(const std::string &path, bool truncate) {
+    if (!truncate) {
+        std::error_code error;
+        uint64_t size = std::filesystem::file_size(path, error);
+        if (!error && size > 0) {
+            // Недописанный хвост от упавшей записи отрезается: иначе новый
+            // блок лёг бы за ним и файл перестал бы читаться
+            uint64_t length = 0;
+            {
+                std::ifstream fin(path, std::ios::binary);
+                if (!fin.is_open() || !completeLength(fin, size, length)) {
+                    return false;
+                }
+            }
+            if (length < size) {
+                std::filesystem::resize_file(path, length, error);
+                if (error) {
+                    return false;
+                }
+            }
+            if (length > 0) {
+                out_.open(path, std::ios::binary | std::ios::app);
+                return out_.is_open();
+            }
+        }
+    }
+
+    out_.open(path, std::ios::binary | std::ios::trunc);
+    if (!out_.is_open()) {
+        return false;
+    }
+    std::string header(MAGIC, sizeof(MAGIC));
+    put<uint32_t>(header, VERSION);
+    out_.write(header.data(), (std::streamsize)header.size());
+    out_.flush();
+    return (bool)out_;
+}
+
+bool ColumnarWriter::append(const ColumnarChunk &chunk) {
+    if (!out_.is_open() || !chunk.consistent()) {
+        return false;
+    }
+    std::string data = chunk.encode();
+    out_.write(data.data(), (std::streamsize)data.size());
+    out_.flush();
+    return (bool)out_;
+}
@@ -1,9 +1,13 @@
 #include <iostream>
 #include <cstdlib>
 #include <ctime>
+#include <stdexcept>
+#include <string>
 
 #include "matrix_utils.h"
+#include "parallel.h"
 #include "strassen.h"
+#include "tuning.h"
 
 // Заполнение матрицы случайными числами 0..9
 void fillRandom(Matrix &m) {
@@ -15,15 +19,54 @@ void fillRandom(Matrix &m) {
     }
 }
 
-int main() {
-    std::cout << "Размер квадратных матриц n x n (n - степень двойки, например 2, 4, 8): ";
+// Параметры: --threads N (число потоков), --task-depth D (глубина задач Штрассена)
+bool parseOptions(int argc, char **argv) {
+    for (int i = 1; i < argc; ++i) {
+        std::string arg = argv[i];
+        if (i + 1 >= argc) {
+            std::cout << "Использование: app [--threads N] [--task-depth D]" << std::endl;
+            return false;
+        }
+        std::string value = argv[++i];
+        if (arg == "--threads") {
+            setThreadCount(std::stoi(value));
+        } else if (arg == "--task-depth") {
+            setStrassenTaskDepth(std::stoi(value));
+        } else {
+            std::cout << "Неизвестный параметр: " << arg << std::endl;
+            std::cout << "Использование: app [--threads N] [--task-depth D]" << std::endl;
+            return false;
+        }
+    }
+    return true;
+}
+
+int main(int argc, char **argv) {
+    try {
+        if (!parseOptions(argc, argv)) {
+            return 1;
+        }
+    } catch (const std::exception &e) {
+        std::cout << "Ошибка в параметрах: " << e.what() << std::endl;
+        return 1;
+    }
+    if (getThreadCount() > 1) {
+        std::cout << "Потоков: " << getThreadCount()
+                  << ", глубина задач Штрассена: " << getStrassenTaskDepth() << std::endl;
+    }
+
+    // Порог Штрассена из профиля автонастройки (если он есть для этой машины)
+    if (loadTuningProfile()) {
+        std::cout << "Профиль автонастройки: порог Штрассена = "
+                  << getStrassenCutoff() << std::endl;
+    }
+
+    std::cout << "Размер квадратных матриц n x n (например 2, 4, 5, 8): ";
     int n;
     std::cin >> n;
 
-    if (!isPowerOfTwo(n)) {
-        std::cout << "Ошибка: для алгоритма Штрассена n должно быть степенью двойки."
-                  << std::endl;
-        std::cout << "Выберите другое n или дополняйте матрицы нулями." << std::endl;
+    if (!std::cin || n < 1) {
+        std::cout << "Ошибка: n должно быть положительным целым числом." << std::endl;
         return 1;
     }
 
@@ -1,6 +1,21 @@
 #include "matrix_utils.h"
+#include "parallel.h"
+#include "trace.h"
+#include <algorithm>
 #include <iostream>
 #include <iomanip>
+#include <stdexcept>
+
+namespace {
+BlockSizes g_blockSizes;
+
+// Минимальная высота панели строк для одного потока: поток должен получить
+// хотя бы ~2^18 умножений-сложений, иначе запуск потока дороже самой работы
+int minPanelRows(int cols, int inner) {
+    long long perRow = std::max(1LL, (long long)cols * inner);
+    return (int)std::max(1LL, (1LL << 18) / perRow);
+}
+}
 
 Matrix createMatrix(int n) {
     return Matrix(n, std::vector<double>(n, 0.0));
@@ -30,6 +45,7 @@ void printMatrix(const Matrix &m, const std::string &name) {
 }
 
 Matrix addMatrix(const Matrix &A, const Matrix &B) {
+    TRACE_SCOPE("add");
     int n = (int)A.size();
     Matrix C = createMatrix(n);
     for (int i = 0; i < n; ++i) {
@@ -41,6 +57,7 @@ Matrix addMatrix(const Matrix &A, const Matrix &B) {
 }
 
 Matrix subMatrix(const Matrix &A, const Matrix &B) {
+    TRACE_SCOPE("add");
     int n = (int)A.size();
     Matrix C = createMatrix(n);
     for (int i = 0; i < n; ++i) {
@@ -54,8 +71,10 @@ Matrix subMatrix(const Matrix &A, const Matrix &B) {
 void splitMatrix(const Matrix &A,
                  Matrix &A11, Matrix &A12,
                  Matrix &A21, Matrix &A22) {
+    TRACE_SCOPE("split");
     int n = (int)A.size();
     int k = n / 2;
+    TRACE_COPIED(4 * (size_t)k * k * sizeof(double));
 
     A11 = createMatrix(k);
     A12 = createMatrix(k);
@@ -74,8 +93,10 @@ void splitMatrix(const Matrix &A,
 
 Matrix joinMatrix(const Matrix &C11, const Matrix &C12,
                   const Matrix &C21, const Matrix &C22) {
+    TRACE_SCOPE("join");
     int k = (int)C11.size();
     int n = 2 * k;
+    TRACE_COPIED((size_t)n * n * sizeof(double));
     Matrix C = createMatrix(n);
 
     for (int i = 0; i < k; ++i) {
@@ -91,19 +112,48 @@ Matrix joinMatrix(const Matrix &C11, const Matrix &C12,
 }
 
 Matrix multiplyStandard(const Matrix &A, const Matrix &B) {
+    TRACE_SCOPE("multiply");
     int n = (int)A.size();
     Matrix C = createMatrix(n);
 
+    // Панели строк C независимы — делим их между потоками
+    parallelFor(n, minPanelRows(n, n), [&](int rowBegin, int rowEnd) {
+        for (int i = rowBegin; i < rowEnd; ++i) {
+            for (int j = 0; j < n; ++j) {
+                double sum = 0.0;
+                for (int k = 0; k < n; ++k) {
+                    sum += A[i][k] * B[k][j];
+                }
+                C[i][j] = sum;
+            }
+        }
+    });
+
+    return C;
+}
+
+Matrix padMatrix(const Matrix &A, int size) {
+    TRACE_SCOPE("pad");
+    Matrix P = createMatrix(size);
+    int n = (int)A.size();
+    TRACE_COPIED((size_t)n * n * sizeof(double));
     for (int i = 0; i < n; ++i) {
         for (int j = 0; j < n; ++j) {
-            double sum = 0.0;
-            for (int k = 0; k < n; ++k) {
-                sum += A[i][k] * B[k][j];
-            }
-            C[i][j] = sum;
+            P[i][j] = A[i][j];
         }
     }
+    return P;
+}
 
+Matrix cropMatrix(const Matrix &A, int n) {
+    TRACE_SCOPE("crop");
+    TRACE_COPIED((size_t)n * n * sizeof(double));
+    Matrix C = createMatrix(n);
+    for (int i = 0; i < n; ++i) {
+        for (int j = 0; j < n; ++j) {
+            C[i][j] = A[i][j];
+        }
+    }
     return C;
 }
 
@@ -113,3 +163,200 @@ bool isPowerOfTwo(int n) {
     }
     return (n & (n - 1)) == 0;
 }
+
+FlatMatrix toFlat(const Matrix &m) {
+    return toFlatAs<double>(m);
+}
+
+template <typename T>
+BasicFlatMatrix<T> toFlatAs(const Matrix &m) {
+    int n = (int)m.size();
+    int cols = n > 0 ? (int)m[0].size() : 0;
+    BasicFlatMatrix<T> f(n, cols);
+    for (int i = 0; i < n; ++i) {
+        for (int j = 0; j < cols; ++j) {
+            f(i, j) = static_cast<T>(m[i][j]);
+        }
+    }
+    return f;
+}
+
+Matrix fromFlat(ConstMatrixView v) {
+    Matrix m(v.rows, std::vector<double>(v.cols, 0.0));
+    for (int i = 0; i < v.rows; ++i) {
+        for (int j = 0; j < v.cols; ++j) {
+            m[i][j] = v(i, j);
+        }
+    }
+    return m;
+}
+
+template <typename T>
+void splitView(BasicMatrixView<T> A,
+               BasicMatrixView<T> &A11, BasicMatrixView<T> &A12,
+               BasicMatrixView<T> &A21, BasicMatrixView<T> &A22) {
+    int r = A.rows / 2;
+    int c = A.cols / 2;
+    A11 = A.block(0, 0, r, c);
+    A12 = A.block(0, c, r, c);
+    A21 = A.block(r, 0, r, c);
+    A22 = A.block(r, c, r, c);
+}
+
+template <typename T>
+void addInto(BasicConstView<T> A, BasicConstView<T> B, BasicMatrixView<T> C) {
+    TRACE_SCOPE("add");
+    for (int i = 0; i < C.rows; ++i) {
+        const T *a = A.row(i);
+        const T *b = B.row(i);
+        T *c = C.row(i);
+        for (int j = 0; j < C.cols; ++j) {
+            c[j] = a[j] + b[j];
+        }
+    }
+}
+
+template <typename T>
+void subInto(BasicConstView<T> A, BasicConstView<T> B, BasicMatrixView<T> C) {
+    TRACE_SCOPE("add");
+    for (int i = 0; i < C.rows; ++i) {
+        const T *a = A.row(i);
+        const T *b = B.row(i);
+        T *c = C.row(i);
+        for (int j = 0; j < C.cols; ++j) {
+            c[j] = a[j] - b[j];
+        }
+    }
+}
+
+template <typename T>
+void copyInto(BasicConstView<T> A, BasicMatrixView<T> C) {
+    TRACE_SCOPE("copy");
+    TRACE_COPIED((size_t)C.rows * C.cols * sizeof(T));
+    for (int i = 0; i < C.rows; ++i) {
+        const T *a = A.row(i);
+        T *c = C.row(i);
+        for (int j = 0; j < C.cols; ++j) {
+            c[j] = a[j];
+        }
+    }
+}
+
+template <typename T>
+void addTo(BasicMatrixView<T> C, BasicConstView<T> A) {
+    TRACE_SCOPE("add");
+    for (int i = 0; i < C.rows; ++i) {
+        const T *a = A.row(i);
+        T *c = C.row(i);
+        for (int j = 0; j < C.cols; ++j) {
+            c[j] += a[j];
+        }
+    }
+}
+
+template <typename T>
+void subFrom(BasicMatrixView<T> C, BasicConstView<T> A) {
+    TRACE_SCOPE("add");
+    for (int i = 0; i < C.rows; ++i) {
+        const T *a = A.row(i);
+        T *c = C.row(i);
+        for (int j = 0; j < C.cols; ++j) {
+            c[j] -= a[j];
+        }
+    }
+}
+
+template <typename T>
+void multiplyStandard(BasicConstView<T> A, BasicConstView<T> B, BasicMatrixView<T> C) {
+    TRACE_SCOPE("multiply");
+    int n = A.rows;
+    int m = B.cols;
+    int inner = A.cols;
+
+    parallelFor(n, minPanelRows(m, inner), [&](int rowBegin, int rowEnd) {
+        for (int i = rowBegin; i < rowEnd; ++i) {
+            for (int j = 0; j < m; ++j) {
+                T sum = T(0);
+                for (int k = 0; k < inner; ++k) {
+                    sum += A(i, k) * B(k, j);
+                }
+                C(i, j) = sum;
+            }
+        }
+    });
+}
+
+void setBlockSizes(const BlockSizes &sizes) {
+    if (sizes.rows < 1 || sizes.inner < 1 || sizes.cols < 1) {
+        throw std::invalid_argument("размеры блоков должны быть >= 1");
+    }
+    g_blockSizes = sizes;
+}
+
+BlockSizes getBlockSizes() {
+    return g_blockSizes;
+}
+
+template <typename T>
+void multiplyBlocked(BasicConstView<T> A, BasicConstView<T> B, BasicMatrixView<T> C) {
+    TRACE_SCOPE("multiply");
+    int n = A.rows;
+    int m = B.cols;
+    int inner = A.cols;
+    BlockSizes bs = g_blockSizes;
+
+    parallelFor(n, std::max(bs.rows, minPanelRows(m, inner)), [&](int rowBegin, int rowEnd) {
+        for (int i0 = rowBegin; i0 < rowEnd; i0 += bs.rows) {
+            int i1 = std::min(i0 + bs.rows, rowEnd);
+
+            for (int j0 = 0; j0 < m; j0 += bs.cols) {
+                int width = std::min(bs.cols, m - j0);
+
+                // Блок C (i0..i1) x (j0..j0+width) накапливается по всем блокам k
+                for (int i = i0; i < i1; ++i) {
+                    T *c = C.row(i) + j0;
+                    for (int j = 0; j < width; ++j) {
+                        c[j] = T(0);
+                    }
+                }
+
+                for (int k0 = 0; k0 < inner; k0 += bs.inner) {
+                    int k1 = std::min(k0 + bs.inner, inner);
+                    for (int i = i0; i < i1; ++i) {
+                        T *__restrict c = C.row(i) + j0;
+                        const T *a = A.row(i);
+                        for (int k = k0; k < k1; ++k) {
+                            const T aik = a[k];
+                            const T *__restrict b = B.row(k) + j0;
+                            for (int j = 0; j < width; ++j) {
+                                c[j] += aik * b[j];
+                            }
+                        }
+                    }
+                }
+            }
+        }
+    });
+}
+
+// Ядра на представлениях собираются для этих типов элементов
+#define INSTANTIATE_VIEW_KERNELS(T)                                                      \
+    template BasicFlatMatrix<T> toFlatAs<T>(const Matrix &);                               \
+    template void splitView<T>(BasicMatrixView<T>, BasicMatrixView<T> &,                   \
+                               BasicMatrixView<T> &, BasicMatrixView<T> &,                 \
+                               BasicMatrixView<T> &);                                      \
+    template void splitView<const T>(BasicMatrixView<const T>, BasicMatrixView<const T> &, \
+                                     BasicMatrixView<const T> &, BasicMatrixView<const T> &, \
+                                     BasicMatrixView<const T> &);                          \
+    template void addInto<T>(BasicConstView<T>, BasicConstView<T>, BasicMatrixView<T>);   \
+    template void subInto<T>(BasicConstView<T>, BasicConstView<T>, BasicMatrixView<T>);   \
+    template void copyInto<T>(BasicConstView<T>, BasicMatrixView<T>);                     \
+    template void addTo<T>(BasicMatrixView<T>, BasicConstView<T>);                        \
+    template void subFrom<T>(BasicMatrixView<T>, BasicConstView<T>);                      \
+    template void multiplyStandard<T>(BasicConstView<T>, BasicConstView<T>,               \
+                                      BasicMatrixView<T>);                                 \
+    template void multiplyBlocked<T>(BasicConstView<T>, BasicConstView<T>, BasicMatrixView<T>);
+
+INSTANTIATE_VIEW_KERNELS(float)
+INSTANTIATE_VIEW_KERNELS(double)
+INSTANTIATE_VIEW_KERNELS(int64_t)
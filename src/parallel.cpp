@@ -0,0 +1,99 @@
+#include "parallel.h"
+
+#include <algorithm>
+#include <atomic>
+#include <exception>
+#include <mutex>
+#include <stdexcept>
+#include <thread>
+#include <vector>
+
+namespace {
+int g_threadCount = 1;
+int g_strassenTaskDepth = 1;
+
+// Бюджет потоков текущей задачи; 0 — задача не запущена, берём g_threadCount
+thread_local int t_budget = 0;
+
+// Устанавливает бюджет потока на время жизни объекта
+struct BudgetScope {
+    int saved;
+    explicit BudgetScope(int budget) : saved(t_budget) { t_budget = budget; }
+    ~BudgetScope() { t_budget = saved; }
+};
+}
+
+void setThreadCount(int threads) {
+    if (threads < 1) {
+        throw std::invalid_argument("число потоков должно быть >= 1");
+    }
+    g_threadCount = threads;
+}
+
+int getThreadCount() {
+    return g_threadCount;
+}
+
+void setStrassenTaskDepth(int depth) {
+    if (depth < 0) {
+        throw std::invalid_argument("глубина задач Штрассена должна быть >= 0");
+    }
+    g_strassenTaskDepth = depth;
+}
+
+int getStrassenTaskDepth() {
+    return g_strassenTaskDepth;
+}
+
+int currentThreadBudget() {
+    return t_budget > 0 ? t_budget : g_threadCount;
+}
+
+void runTasks(int count, const std::function<void(int)> &task) {
+    int budget = currentThreadBudget();
+    int workers = std::min(budget, count);
+    if (workers <= 1) {
+        for (int i = 0; i < count; ++i) {
+            task(i);
+        }
+        return;
+    }
+
+    int inner = std::max(1, budget / workers);
+    std::atomic<int> next(0);
+    std::exception_ptr error;
+    std::mutex errorMutex;
+
+    // Потоки разбирают задачи по очереди, пока они не кончатся
+    auto worker = [&]() {
+        BudgetScope scope(inner);
+        for (int i = next++; i < count; i = next++) {
+            try {
+                task(i);
+            } catch (...) {
+                std::lock_guard<std::mutex> lock(errorMutex);
+                if (!error) {
+                    error = std::current_exception();
+                }
+            }
+        }
+    };
+
+    std::vector<std::thread> threads;
+    threads.reserve(workers - 1);
+    for (int w = 1; w < workers; ++w) {
+        threads.emplace_back(worker);
+    }
+    worker();
+    for (std::thread &t : threads) {
+        t.join();
+    }
+
+    if (error) {
+        std::rethrow_exception(error);
+    }
+}
+
+int parallelParts(int count, int minChunk) {
+    return std::min(currentThreadBudget(), count / std::max(minChunk, 1));
+}
@@ -0,0 +1,322 @@
+#include "sparse.h"
+#include "parallel.h"
+
+#include <algorithm>
+#include <cstdint>
+#include <random>
+#include <stdexcept>
+
+namespace {
+double g_sparseThreshold = 0.05;
+
+// Грубая модель стоимости разреженных ядер в «умножениях-сложениях» плотного
+// ядра: сжатие в CSR/CSC — просмотр с ветвлением на каждый элемент;
+// csr_dense — axpy по непрерывным строкам B (векторизуется); dense_csc —
+// чтение строки A по индексам; csr_csr — разброс в накопитель и сортировка
+// столбцов строки (на порядок дороже axpy), плюс запись плотного результата
+const double CONVERT_PENALTY = 4.0;
+const double AXPY_PENALTY = 1.0;
+const double GATHER_PENALTY = 3.0;
+const double GUSTAVSON_PENALTY = 32.0;
+const double COPY_PENALTY = 1.0;
+
+// Минимум строк на поток: ~2^18 умножений-сложений, как в плотных ядрах
+int minSparseRows(size_t nnz, int rows, int cols) {
+    long long perRow = std::max(1LL, (long long)(nnz / std::max(rows, 1)) * cols);
+    return (int)std::max(1LL, (1LL << 18) / perRow);
+}
+} // namespace
+
+template <typename T>
+BasicCsrMatrix<T> toCsr(BasicConstView<T> A) {
+    BasicCsrMatrix<T> S;
+    S.rows = A.rows;
+    S.cols = A.cols;
+    S.rowPtr.assign(A.rows + 1, 0);
+    for (int i = 0; i < A.rows; ++i) {
+        const T *a = A.row(i);
+        for (int j = 0; j < A.cols; ++j) {
+            if (a[j] != T(0)) {
+                S.colIdx.push_back(j);
+                S.values.push_back(a[j]);
+            }
+        }
+        S.rowPtr[i + 1] = (int)S.values.size();
+    }
+    return S;
+}
+
+template <typename T>
+BasicCscMatrix<T> toCsc(BasicConstView<T> A) {
+    BasicCscMatrix<T> S;
+    S.rows = A.rows;
+    S.cols = A.cols;
+    S.colPtr.assign(A.cols + 1, 0);
+
+    // Первый проход — число ненулевых в каждом столбце, второй — раскладка;
+    // строки обходятся по порядку, поэтому rowIdx в столбце возрастают
+    for (int i = 0; i < A.rows; ++i) {
+        const T *a = A.row(i);
+        for (int j = 0; j < A.cols; ++j) {
+            if (a[j] != T(0)) {
+                ++S.colPtr[j + 1];
+            }
+        }
+    }
+    for (int j = 0; j < A.cols; ++j) {
+        S.colPtr[j + 1] += S.colPtr[j];
+    }
+    S.rowIdx.resize(S.colPtr[A.cols]);
+    S.values.resize(S.colPtr[A.cols]);
+
+    std::vector<int> next(S.colPtr.begin(), S.colPtr.end() - 1);
+    for (int i = 0; i < A.rows; ++i) {
+        const T *a = A.row(i);
+        for (int j = 0; j < A.cols; ++j) {
+            if (a[j] != T(0)) {
+                int p = next[j]++;
+                S.rowIdx[p] = i;
+                S.values[p] = a[j];
+            }
+        }
+    }
+    return S;
+}
+
+template <typename T>
+void toDense(const BasicCsrMatrix<T> &A, BasicMatrixView<T> C) {
+    for (int i = 0; i < A.rows; ++i) {
+        T *c = C.row(i);
+        std::fill(c, c + A.cols, T(0));
+        for (int p = A.rowPtr[i]; p < A.rowPtr[i + 1]; ++p) {
+            c[A.colIdx[p]] = A.values[p];
+        }
+    }
+}
+
+template <typename T>
+void multiplySparseDense(const BasicCsrMatrix<T> &A, BasicConstView<T> B,
+                         BasicMatrixView<T> C) {
+    int m = B.cols;
+
+    parallelFor(A.rows, minSparseRows(A.nnz(), A.rows, m), [&](int rowBegin, int rowEnd) {
+        for (int i = rowBegin; i < rowEnd; ++i) {
+            T *__restrict c = C.row(i);
+            std::fill(c, c + m, T(0));
+            for (int p = A.rowPtr[i]; p < A.rowPtr[i + 1]; ++p) {
+                const T aik = A.values[p];
+                const T *__restrict b = B.row(A.colIdx[p]);
+                for (int j = 0; j < m; ++j) {
+                    c[j] += aik * b[j];
+                }
+            }
+        }
+    });
+}
+
+template <typename T>
+void multiplyDenseSparse(BasicConstView<T> A, const BasicCscMatrix<T> &B,
+                         BasicMatrixView<T> C) {
+    parallelFor(A.rows, minSparseRows(B.nnz(), 1, 1), [&](int rowBegin, int rowEnd) {
+        for (int i = rowBegin; i < rowEnd; ++i) {
+            const T *a = A.row(i);
+            T *c = C.row(i);
+            for (int j = 0; j < B.cols; ++j) {
+                T sum = T(0);
+                for (int p = B.colPtr[j]; p < B.colPtr[j + 1]; ++p) {
+                    sum += a[B.rowIdx[p]] * B.values[p];
+                }
+                c[j] = sum;
+            }
+        }
+    });
+}
+
+template <typename T>
+BasicCsrMatrix<T> multiplySparse(const BasicCsrMatrix<T> &A, const BasicCsrMatrix<T> &B) {
+    if (A.cols != B.rows) {
+        throw std::invalid_argument("multiplySparse: число столбцов A не равно числу строк B");
+    }
+    BasicCsrMatrix<T> C;
+    C.rows = A.rows;
+    C.cols = B.cols;
+    C.rowPtr.assign(A.rows + 1, 0);
+
+    // Каждая часть строк собирает свои столбцы и значения отдельно,
+    // затем части склеиваются по порядку
+    size_t work = 0;
+    for (size_t p = 0; p < A.nnz(); ++p) {
+        int k = A.colIdx[p];
+        work += B.rowPtr[k + 1] - B.rowPtr[k];
+    }
+    int parts = std::max(1, parallelParts(A.rows, minSparseRows(work, A.rows, 1)));
+    std::vector<std::vector<int> > partCols(parts);
+    std::vector<std::vector<T> > partValues(parts);
+
+    auto task = [&](int part) {
+        int begin = (int)((long long)A.rows * part / parts);
+        int end = (int)((long long)A.rows * (part + 1) / parts);
+        std::vector<T> acc(B.cols, T(0));
+        std::vector<int> mark(B.cols, -1); // строка, в которой столбец уже встречался
+        std::vector<int> rowCols;
+
+        for (int i = begin; i < end; ++i) {
+            rowCols.clear();
+            for (int pa = A.rowPtr[i]; pa < A.rowPtr[i + 1]; ++pa) {
+                const T aik = A.values[pa];
+                int k = A.colIdx[pa];
+                for (int pb = B.rowPtr[k]; pb < B.rowPtr[k + 1]; ++pb) {
+                    int j = B.colIdx[pb];
+                    if (mark[j] != i) {
+                        mark[j] = i;
+                        acc[j] = T(0);
+                        rowCols.push_back(j);
+                    }
+                    acc[j] += aik * B.values[pb];
+                }
+            }
+            std::sort(rowCols.begin(), rowCols.end());
+            for (int j : rowCols) {
+                partCols[part].push_back(j);
+                partValues[part].push_back(acc[j]);
+            }
+            C.rowPtr[i + 1] = (int)rowCols.size();
+        }
+    };
+    if (parts <= 1) {
+        task(0);
+    } else {
+        runTasks(parts, task);
+    }
+
+    for (int i = 0; i < A.rows; ++i) {
+        C.rowPtr[i + 1] += C.rowPtr[i];
+    }
+    C.colIdx.reserve(C.rowPtr[A.rows]);
+    C.values.reserve(C.rowPtr[A.rows]);
+    for (int part = 0; part < parts; ++part) {
+        C.colIdx.insert(C.colIdx.end(), partCols[part].begin(), partCols[part].end());
+        C.values.insert(C.values.end(), partValues[part].begin(), partValues[part].end());
+    }
+    return C;
+}
+
+template <typename T>
+double estimateDensity(BasicConstView<T> A, int samples) {
+    long long total = (long long)A.rows * A.cols;
+    if (total == 0) {
+        return 0.0;
+    }
+
+    long long nonzero = 0;
+    if (total <= samples) {
+        for (int i = 0; i < A.rows; ++i) {
+            const T *a = A.row(i);
+            for (int j = 0; j < A.cols; ++j) {
+                nonzero += a[j] != T(0);
+            }
+        }
+        return (double)nonzero / total;
+    }
+
+    std::mt19937_64 rng(12345);
+    std::uniform_int_distribution<long long> position(0, total - 1);
+    for (int s = 0; s < samples; ++s) {
+        long long p = position(rng);
+        nonzero += A((int)(p / A.cols), (int)(p % A.cols)) != T(0);
+    }
+    return (double)nonzero / samples;
+}
+
+void setSparseThreshold(double threshold) {
+    if (!(threshold >= 0.0 && threshold <= 1.0)) {
+        throw std::invalid_argument("порог плотности должен быть в [0, 1]");
+    }
+    g_sparseThreshold = threshold;
+}
+
+double getSparseThreshold() {
+    return g_sparseThreshold;
+}
+
+const char *kernelName(MultiplyKernel kernel) {
+    switch (kernel) {
+    case MultiplyKernel::SparseDense:
+        return "csr_dense";
+    case MultiplyKernel::DenseSparse:
+        return "dense_csc";
+    case MultiplyKernel::SparseSparse:
+        return "csr_csr";
+    default:
+        return "dense";
+    }
+}
+
+MultiplyKernel chooseKernel(int m, int k, int n, double densityA, double densityB) {
+    bool sparseA = densityA < g_sparseThreshold;
+    bool sparseB = densityB < g_sparseThreshold;
+    double sizeA = (double)m * k, sizeB = (double)k * n, sizeC = (double)m * n;
+    double flops = sizeA * n;
+
+    MultiplyKernel best = MultiplyKernel::Dense;
+    double bestCost = 0.0;
+    auto consider = [&](MultiplyKernel kernel, double cost) {
+        if (best == MultiplyKernel::Dense || cost < bestCost) {
+            best = kernel;
+            bestCost = cost;
+        }
+    };
+    if (sparseA) {
+        consider(MultiplyKernel::SparseDense,
+                 CONVERT_PENALTY * sizeA + AXPY_PENALTY * densityA * flops);
+    }
+    if (sparseB) {
+        consider(MultiplyKernel::DenseSparse,
+                 CONVERT_PENALTY * sizeB + GATHER_PENALTY * densityB * flops);
+    }
+    if (sparseA && sparseB) {
+        consider(MultiplyKernel::SparseSparse,
+                 CONVERT_PENALTY * (sizeA + sizeB) + COPY_PENALTY * sizeC +
+                     GUSTAVSON_PENALTY * densityA * densityB * flops);
+    }
+    return best;
+}
+
+template <typename T>
+MultiplyKernel multiplyAuto(BasicConstView<T> A, BasicConstView<T> B, BasicMatrixView<T> C) {
+    MultiplyKernel kernel = chooseKernel(A.rows, A.cols, B.cols, estimateDensity<T>(A),
+                                         estimateDensity<T>(B));
+    switch (kernel) {
+    case MultiplyKernel::SparseSparse:
+        toDense(multiplySparse(toCsr<T>(A), toCsr<T>(B)), C);
+        break;
+    case MultiplyKernel::SparseDense:
+        multiplySparseDense(toCsr<T>(A), B, C);
+        break;
+    case MultiplyKernel::DenseSparse:
+        multiplyDenseSparse(A, toCsc<T>(B), C);
+        break;
+    default:
+        multiplyBlocked(A, B, C);
+        break;
+    }
+    return kernel;
+}
+
+#define INSTANTIATE_SPARSE_KERNELS(T)                                                      \
+    template BasicCsrMatrix<T> toCsr<T>(BasicConstView<T>);                                 \
+    template BasicCscMatrix<T> toCsc<T>(BasicConstView<T>);                                 \
+    template void toDense<T>(const BasicCsrMatrix<T> &, BasicMatrixView<T>);                \
+    template void multiplySparseDense<T>(const BasicCsrMatrix<T> &, BasicConstView<T>,      \
+                                         BasicMatrixView<T>);                               \
+    template void multiplyDenseSparse<T>(BasicConstView<T>, const BasicCscMatrix<T> &,      \
+                                         BasicMatrixView<T>);                               \
+    template BasicCsrMatrix<T> multiplySparse<T>(const BasicCsrMatrix<T> &,                 \
+                                                 const BasicCsrMatrix<T> &);                \
+    template double estimateDensity<T>(BasicConstView<T>, int);                             \
+    template MultiplyKernel multiplyAuto<T>(BasicConstView<T>, BasicConstView<T>,           \
+                                            BasicMatrixView<T>);
+
+INSTANTIATE_SPARSE_KERNELS(float)
+INSTANTIATE_SPARSE_KERNELS(double)
+INSTANTIATE_SPARSE_KERNELS(int64_t)
@@ -1,16 +1,96 @@
 #include "strassen.h"
+#include "parallel.h"
+#include "trace.h"
+#include <algorithm>
 #include <iostream>
+#include <stdexcept>
 
-// Рекурсивная функция Штрассена (без печати)
-Matrix strassenRec(const Matrix &A, const Matrix &B) {
+namespace {
+int g_strassenCutoff = 1;
+}
+
+void setStrassenCutoff(int cutoff) {
+    if (cutoff < 1) {
+        throw std::invalid_argument("порог Штрассена должен быть >= 1");
+    }
+    g_strassenCutoff = cutoff;
+}
+
+int getStrassenCutoff() {
+    return g_strassenCutoff;
+}
+
+namespace {
+
+// Грубая модель стоимости для выбора между отсечением и дополнением, в
+// «умножениях-сложениях блочного ядра»: тонкое умножение строки/столбца,
+// сложение блоков и копирование обходятся примерно во столько операций
+// на элемент (все они упираются в память)
+const double PEEL_PENALTY = 4.0;
+const double ADD_PENALTY = 2.0;
+const double COPY_PENALTY = 2.0;
+
+int roundUp(int value, int unit) {
+    return (value + unit - 1) / unit * unit;
+}
+
+// Сколько уровней рекурсии пройдёт Штрассен до порога (размеры округляются вверх)
+int strassenLevels(int m, int k, int n) {
+    int levels = 0;
+    while (std::min(m, std::min(k, n)) > g_strassenCutoff) {
+        m = (m + 1) / 2;
+        k = (k + 1) / 2;
+        n = (n + 1) / 2;
+        ++levels;
+    }
+    return levels;
+}
+
+// Оценка стоимости Штрассена с отсечением для m x k на k x n.
+// Подзадач на уровне l — 7^l; каждая делает 18 сложений блоков
+// (5 размера A, 5 размера B, 8 размера C) и, если размер нечётный,
+// тонкие умножения для отсечённых строки/столбца. В листьях — m k n.
+double strassenCost(int m, int k, int n) {
+    double cost = 0.0, subproblems = 1.0;
+    while (std::min(m, std::min(k, n)) > g_strassenCutoff) {
+        double hm = m / 2, hk = k / 2, hn = n / 2;
+        double level = ADD_PENALTY * (5 * hm * hk + 5 * hk * hn + 8 * hm * hn);
+        if (k & 1) {
+            level += PEEL_PENALTY * (double)(m & ~1) * (n & ~1);
+        }
+        if (n & 1) {
+            level += PEEL_PENALTY * (double)m * k;
+        }
+        if (m & 1) {
+            level += PEEL_PENALTY * (double)k * (n & ~1);
+        }
+        cost += subproblems * level;
+        subproblems *= 7;
+        m /= 2;
+        k /= 2;
+        n /= 2;
+    }
+    return cost + subproblems * m * k * n;
+}
+
+// Считать ли M1..M7 этого уровня параллельными задачами
+bool useTasks(int depth) {
+    return depth < getStrassenTaskDepth() && currentThreadBudget() > 1;
+}
+
+Matrix strassenRec(const Matrix &A, const Matrix &B, int depth) {
+    TRACE_LEVEL(depth);
     int n = (int)A.size();
 
-    // Базовый случай: матрица 1x1
-    if (n == 1) {
+    // Базовый случай: блок не больше порога — стандартное умножение
+    if (n <= g_strassenCutoff) {
         return multiplyStandard(A, B);
     }
 
-    int k = n / 2;
+    // Нечётный n: дополняем нулями до n + 1 и отрезаем лишнее у результата
+    if (n % 2 != 0) {
+        return cropMatrix(strassenRec(padMatrix(A, n + 1), padMatrix(B, n + 1), depth), n);
+    }
 
     Matrix A11, A12, A21, A22;
     Matrix B11, B12, B21, B22;
@@ -18,13 +98,29 @@ Matrix strassenRec(const Matrix &A, const Matrix &B) {
     splitMatrix(A, A11, A12, A21, A22);
     splitMatrix(B, B11, B12, B21, B22);
 
-    Matrix M1 = strassenRec(addMatrix(A11, A22), addMatrix(B11, B22));
-    Matrix M2 = strassenRec(addMatrix(A21, A22), B11);
-    Matrix M3 = strassenRec(A11, subMatrix(B12, B22));
-    Matrix M4 = strassenRec(A22, subMatrix(B21, B11));
-    Matrix M5 = strassenRec(addMatrix(A11, A12), B22);
-    Matrix M6 = strassenRec(subMatrix(A21, A11), addMatrix(B11, B12));
-    Matrix M7 = strassenRec(subMatrix(A12, A22), addMatrix(B21, B22));
+    // Семь независимых произведений: последовательно или как задачи
+    Matrix M[7];
+    auto product = [&](int i) {
+        switch (i) {
+        case 0: M[0] = strassenRec(addMatrix(A11, A22), addMatrix(B11, B22), depth + 1); break;
+        case 1: M[1] = strassenRec(addMatrix(A21, A22), B11, depth + 1); break;
+        case 2: M[2] = strassenRec(A11, subMatrix(B12, B22), depth + 1); break;
+        case 3: M[3] = strassenRec(A22, subMatrix(B21, B11), depth + 1); break;
+        case 4: M[4] = strassenRec(addMatrix(A11, A12), B22, depth + 1); break;
+        case 5: M[5] = strassenRec(subMatrix(A21, A11), addMatrix(B11, B12), depth + 1); break;
+        case 6: M[6] = strassenRec(subMatrix(A12, A22), addMatrix(B21, B22), depth + 1); break;
+        }
+    };
+    if (useTasks(depth)) {
+        runTasks(7, product);
+    } else {
+        for (int i = 0; i < 7; ++i) {
+            product(i);
+        }
+    }
+
+    const Matrix &M1 = M[0], &M2 = M[1], &M3 = M[2], &M4 = M[3];
+    const Matrix &M5 = M[4], &M6 = M[5], &M7 = M[6];
 
     Matrix C11 = addMatrix(subMatrix(addMatrix(M1, M4), M5), M7);
     Matrix C12 = addMatrix(M3, M5);
@@ -35,6 +131,252 @@ Matrix strassenRec(const Matrix &A, const Matrix &B) {
     return C;
 }
 
+template <typename T>
+void strassenRec(BasicConstView<T> A, BasicConstView<T> B, BasicMatrixView<T> C, int depth);
+
+// Уровень с параллельными задачами: у каждого произведения свои буферы
+// (ta, tb, m), поэтому памяти нужно 7 * 3 блока вместо трёх
+template <typename T>
+void strassenTasks(BasicConstView<T> A, BasicConstView<T> B, BasicMatrixView<T> C, int depth) {
+    int hm = A.rows / 2, hk = A.cols / 2, hn = B.cols / 2;
+
+    BasicConstView<T> A11, A12, A21, A22;
+    BasicConstView<T> B11, B12, B21, B22;
+    BasicMatrixView<T> C11, C12, C21, C22;
+
+    splitView(A, A11, A12, A21, A22);
+    splitView(B, B11, B12, B21, B22);
+    splitView(C, C11, C12, C21, C22);
+
+    BasicFlatMatrix<T> M[7];
+    runTasks(7, [&](int i) {
+        BasicFlatMatrix<T> TA(hm, hk), TB(hk, hn);
+        M[i] = BasicFlatMatrix<T>(hm, hn);
+        BasicMatrixView<T> ta = TA.view(), tb = TB.view(), m = M[i].view();
+
+        switch (i) {
+        case 0: // M1 = (A11 + A22)(B11 + B22)
+            addInto(A11, A22, ta);
+            addInto(B11, B22, tb);
+            strassenRec(ta, tb, m, depth + 1);
+            break;
+        case 1: // M2 = (A21 + A22) B11
+            addInto(A21, A22, ta);
+            strassenRec(ta, B11, m, depth + 1);
+            break;
+        case 2: // M3 = A11 (B12 - B22)
+            subInto(B12, B22, tb);
+            strassenRec(A11, tb, m, depth + 1);
+            break;
+        case 3: // M4 = A22 (B21 - B11)
+            subInto(B21, B11, tb);
+            strassenRec(A22, tb, m, depth + 1);
+            break;
+        case 4: // M5 = (A11 + A12) B22
+            addInto(A11, A12, ta);
+            strassenRec(ta, B22, m, depth + 1);
+            break;
+        case 5: // M6 = (A21 - A11)(B11 + B12)
+            subInto(A21, A11, ta);
+            addInto(B11, B12, tb);
+            strassenRec(ta, tb, m, depth + 1);
+            break;
+        case 6: // M7 = (A12 - A22)(B21 + B22)
+            subInto(A12, A22, ta);
+            addInto(B21, B22, tb);
+            strassenRec(ta, tb, m, depth + 1);
+            break;
+        }
+    });
+
+    // C11 = M1 + M4 - M5 + M7
+    addInto(M[0].view(), M[3].view(), C11);
+    subFrom(C11, M[4].view());
+    addTo(C11, M[6].view());
+    // C12 = M3 + M5
+    addInto(M[2].view(), M[4].view(), C12);
+    // C21 = M2 + M4
+    addInto(M[1].view(), M[3].view(), C21);
+    // C22 = M1 - M2 + M3 + M6
+    subInto(M[0].view(), M[1].view(), C22);
+    addTo(C22, M[2].view());
+    addTo(C22, M[5].view());
+}
+
+// C += a b, где a — столбец (m x 1), b — строка (1 x n)
+template <typename T>
+void addOuterProduct(BasicConstView<T> a, BasicConstView<T> b, BasicMatrixView<T> C) {
+    const T *__restrict br = b.row(0);
+    for (int i = 0; i < C.rows; ++i) {
+        const T ai = a(i, 0);
+        T *__restrict c = C.row(i);
+        for (int j = 0; j < C.cols; ++j) {
+            c[j] += ai * br[j];
+        }
+    }
+}
+
+// Динамическое отсечение (peeling): Штрассен считает чётную часть
+// me x ke на ke x ne, а последние строка/столбец добавляются отдельно:
+//   нечётное k — C[0:me, 0:ne] += A[0:me, k-1] B[k-1, 0:ne];
+//   нечётное n — последний столбец C = A B[:, n-1];
+//   нечётное m — последняя строка C[m-1, 0:ne] = A[m-1, :] B[:, 0:ne].
+template <typename T>
+void strassenPeel(BasicConstView<T> A, BasicConstView<T> B, BasicMatrixView<T> C, int depth) {
+    int m = A.rows, k = A.cols, n = B.cols;
+    int me = m & ~1, ke = k & ~1, ne = n & ~1;
+
+    BasicMatrixView<T> core = C.block(0, 0, me, ne);
+    strassenRec(A.block(0, 0, me, ke), B.block(0, 0, ke, ne), core, depth);
+
+    TRACE_SCOPE("peel");
+    if (ke < k) {
+        addOuterProduct(A.block(0, k - 1, me, 1), B.block(k - 1, 0, 1, ne), core);
+    }
+    if (ne < n) {
+        multiplyBlocked(A, B.block(0, n - 1, k, 1), C.block(0, n - 1, m, 1));
+    }
+    if (me < m) {
+        multiplyBlocked(A.block(m - 1, 0, 1, k), B.block(0, 0, k, ne), C.block(m - 1, 0, 1, ne));
+    }
+}
+
+// Штрассен на представлениях (A: m x k, B: k x n):
+// на уровень выделяются только три буфера — блоки A, B и C
+template <typename T>
+void strassenRec(BasicConstView<T> A, BasicConstView<T> B, BasicMatrixView<T> C, int depth) {
+    TRACE_LEVEL(depth);
+    int m = A.rows, n = B.cols;
+    int k = A.cols;
+
+    if (std::min(m, std::min(k, n)) <= g_strassenCutoff) {
+        multiplyBlocked(A, B, C);
+        return;
+    }
+
+    if ((m | k | n) & 1) {
+        strassenPeel(A, B, C, depth);
+        return;
+    }
+
+    if (useTasks(depth)) {
+        strassenTasks(A, B, C, depth);
+        return;
+    }
+
+    BasicConstView<T> A11, A12, A21, A22;
+    BasicConstView<T> B11, B12, B21, B22;
+    BasicMatrixView<T> C11, C12, C21, C22;
+
+    splitView(A, A11, A12, A21, A22);
+    splitView(B, B11, B12, B21, B22);
+    splitView(C, C11, C12, C21, C22);
+
+    BasicFlatMatrix<T> TA(m / 2, k / 2), TB(k / 2, n / 2), M(m / 2, n / 2);
+    BasicMatrixView<T> ta = TA.view(), tb = TB.view(), mv = M.view();
+
+    // M1 = (A11 + A22)(B11 + B22) -> C11, C22
+    addInto(A11, A22, ta);
+    addInto(B11, B22, tb);
+    strassenRec(ta, tb, mv, depth + 1);
+    copyInto(mv, C11);
+    copyInto(mv, C22);
+
+    // M2 = (A21 + A22) B11 -> C21, -C22
+    addInto(A21, A22, ta);
+    strassenRec(ta, B11, mv, depth + 1);
+    copyInto(mv, C21);
+    subFrom(C22, mv);
+
+    // M3 = A11 (B12 - B22) -> C12, C22
+    subInto(B12, B22, tb);
+    strassenRec(A11, tb, mv, depth + 1);
+    copyInto(mv, C12);
+    addTo(C22, mv);
+
+    // M4 = A22 (B21 - B11) -> C11, C21
+    subInto(B21, B11, tb);
+    strassenRec(A22, tb, mv, depth + 1);
+    addTo(C11, mv);
+    addTo(C21, mv);
+
+    // M5 = (A11 + A12) B22 -> -C11, C12
+    addInto(A11, A12, ta);
+    strassenRec(ta, B22, mv, depth + 1);
+    subFrom(C11, mv);
+    addTo(C12, mv);
+
+    // M6 = (A21 - A11)(B11 + B12) -> C22
+    subInto(A21, A11, ta);
+    addInto(B11, B12, tb);
+    strassenRec(ta, tb, mv, depth + 1);
+    addTo(C22, mv);
+
+    // M7 = (A12 - A22)(B21 + B22) -> C11
+    subInto(A12, A22, ta);
+    addInto(B21, B22, tb);
+    strassenRec(ta, tb, mv, depth + 1);
+    addTo(C11, mv);
+}
+
+} // namespace
+
+// Рекурсивная функция Штрассена (без печати)
+Matrix strassenRec(const Matrix &A, const Matrix &B) {
+    return strassenRec(A, B, 0);
+}
+
+template <typename T>
+void strassenPeeled(BasicConstView<T> A, BasicConstView<T> B, BasicMatrixView<T> C) {
+    strassenRec(A, B, C, 0);
+}
+
+template <typename T>
+void strassenPadded(BasicConstView<T> A, BasicConstView<T> B, BasicMatrixView<T> C) {
+    int m = A.rows, k = A.cols, n = B.cols;
+    int unit = 1 << strassenLevels(m, k, n);
+    int mp = roundUp(m, unit), kp = roundUp(k, unit), np = roundUp(n, unit);
+    if (mp == m && kp == k && np == n) {
+        strassenRec(A, B, C, 0);
+        return;
+    }
+
+    BasicFlatMatrix<T> PA(mp, kp), PB(kp, np), PC(mp, np);
+    copyInto(A, PA.view().block(0, 0, m, k));
+    copyInto(B, PB.view().block(0, 0, k, n));
+    strassenRec(PA.view(), PB.view(), PC.view(), 0);
+    copyInto(PC.view().block(0, 0, m, n), C);
+}
+
+bool strassenPrefersPadding(int m, int k, int n) {
+    // Дополнение: рекурсия по размерам, кратным 2^уровней (без отсечений),
+    // плюс копирование A, B и C в дополненные буферы. Оно может добавить
+    // целый уровень рекурсии (100 -> 128), и тогда проигрывает.
+    int unit = 1 << strassenLevels(m, k, n);
+    int mp = roundUp(m, unit), kp = roundUp(k, unit), np = roundUp(n, unit);
+    double pad = strassenCost(mp, kp, np) +
+                 COPY_PENALTY * ((double)mp * kp + (double)kp * np + (double)mp * np);
+    return pad < strassenCost(m, k, n);
+}
+
+template <typename T>
+void strassenRec(BasicConstView<T> A, BasicConstView<T> B, BasicMatrixView<T> C) {
+    if (strassenPrefersPadding(A.rows, A.cols, B.cols)) {
+        strassenPadded(A, B, C);
+    } else {
+        strassenPeeled(A, B, C);
+    }
+}
+
+#define INSTANTIATE_STRASSEN(T)                                                              \
+    template void strassenRec<T>(BasicConstView<T>, BasicConstView<T>, BasicMatrixView<T>);    \
+    template void strassenPeeled<T>(BasicConstView<T>, BasicConstView<T>, BasicMatrixView<T>); \
+    template void strassenPadded<T>(BasicConstView<T>, BasicConstView<T>, BasicMatrixView<T>);
+
+INSTANTIATE_STRASSEN(float)
+INSTANTIATE_STRASSEN(double)
+INSTANTIATE_STRASSEN(int64_t)
+
 // Верхний уровень: вывод M1..M7 и C11..C22
 Matrix strassenWithPrint(const Matrix &A, const Matrix &B) {
     int n = (int)A.size();
@@ -45,7 +387,11 @@ Matrix strassenWithPrint(const Matrix &A, const Matrix &B) {
         return multiplyStandard(A, B);
     }
 
-    int k = n / 2;
+    if (n % 2 != 0) {
+        std::cout << "n = " << n << " нечётное: матрицы дополнены нулями до "
+                  << n + 1 << " x " << n + 1 << std::endl;
+        return cropMatrix(strassenWithPrint(padMatrix(A, n + 1), padMatrix(B, n + 1)), n);
+    }
 
     Matrix A11, A12, A21, A22;
     Matrix B11, B12, B21, B22;
@@ -0,0 +1,157 @@
+// Трассировка рекурсии Штрассена: один прогон strassenRec с записью
+// областей по уровням в формате Chrome trace и сводкой по уровням.
+// Собирается с MATMUL_TRACE (цель strassen_trace в CMakeLists.txt).
+
+#include <cstdlib>
+#include <filesystem>
+#include <iostream>
+#include <stdexcept>
+#include <string>
+
+#include "matrix_utils.h"
+#include "parallel.h"
+#include "strassen.h"
+#include "trace.h"
+#include "tuning.h"
+
+namespace {
+
+struct Options {
+    int n = 512;
+    int cutoff = 0; // 0 — из профиля
+    std::string variant = "flat";
+    int threads = 1;
+    int taskDepth = -1;
+    int depth = 3;
+    std::string out;
+};
+
+void printUsage() {
+    std::cout << "Использование: strassen_trace [--n 512] [--variant flat|peel|pad|matrix]\n"
+                 "                              [--cutoff N] [--threads N] [--task-depth D]\n"
+                 "                              [--depth 3] [--out data/trace/strassen.json]\n"
+                 "  --variant  flat — strassenRec на представлениях (отсечение или\n"
+                 "             дополнение по модели стоимости), peel/pad — принудительно,\n"
+                 "             matrix — strassenRec на векторе векторов\n"
+                 "  --depth    в файл трассы попадают уровни < depth (сводка — по всем)\n"
+                 "  --out      файл трассы; сводка пишется рядом в *_levels.csv\n";
+}
+
+bool parseOptions(int argc, char **argv, Options &opt) {
+    for (int i = 1; i < argc; ++i) {
+        std::string arg = argv[i];
+        if (arg == "--help" || arg == "-h") {
+            printUsage();
+            return false;
+        }
+        if (i + 1 >= argc) {
+            throw std::invalid_argument("нет значения для " + arg);
+        }
+        std::string value = argv[++i];
+        if (arg == "--n") {
+            opt.n = std::stoi(value);
+        } else if (arg == "--variant") {
+            opt.variant = value;
+        } else if (arg == "--cutoff") {
+            opt.cutoff = std::stoi(value);
+        } else if (arg == "--threads") {
+            opt.threads = std::stoi(value);
+        } else if (arg == "--task-depth") {
+            opt.taskDepth = std::stoi(value);
+        } else if (arg == "--depth") {
+            opt.depth = std::stoi(value);
+        } else if (arg == "--out") {
+            opt.out = value;
+        } else {
+            throw std::invalid_argument("неизвестный параметр " + arg);
+        }
+    }
+    if (opt.n < 1) {
+        throw std::invalid_argument("--n должен быть >= 1");
+    }
+    if (opt.variant != "flat" && opt.variant != "peel" && opt.variant != "pad" &&
+        opt.variant != "matrix") {
+        throw std::invalid_argument("--variant: flat, peel, pad или matrix");
+    }
+    if (opt.out.empty()) {
+        opt.out = "data/trace/strassen_" + opt.variant + "_" + std::to_string(opt.n) + ".json";
+    }
+    return true;
+}
+
+std::string summaryPath(const std::string &tracePath) {
+    std::string base = tracePath;
+    if (base.size() > 5 && base.compare(base.size() - 5, 5, ".json") == 0) {
+        base.resize(base.size() - 5);
+    }
+    return base + "_levels.csv";
+}
+
+} // namespace
+
+int main(int argc, char **argv) {
+    Options opt;
+    try {
+        if (!parseOptions(argc, argv, opt)) {
+            return 1;
+        }
+        if (opt.cutoff > 0) {
+            setStrassenCutoff(opt.cutoff);
+        } else {
+            loadTuningProfile();
+        }
+        setThreadCount(opt.threads);
+        if (opt.taskDepth >= 0) {
+            setStrassenTaskDepth(opt.taskDepth);
+        }
+    } catch (const std::exception &e) {
+        std::cout << "Ошибка в параметрах: " << e.what() << std::endl;
+        return 1;
+    }
+
+    std::cout << "n = " << opt.n << ", вариант " << opt.variant
+              << ", порог Штрассена " << getStrassenCutoff()
+              << ", потоков " << getThreadCount() << std::endl;
+
+    Matrix A = createMatrix(opt.n), B = createMatrix(opt.n);
+    for (int i = 0; i < opt.n; ++i) {
+        for (int j = 0; j < opt.n; ++j) {
+            A[i][j] = std::rand() % 10;
+            B[i][j] = std::rand() % 10;
+        }
+    }
+    FlatMatrix FA = toFlat(A), FB = toFlat(B), FC(opt.n, opt.n);
+
+    auto run = [&]() {
+        if (opt.variant == "matrix") {
+            Matrix C = strassenRec(A, B);
+        } else if (opt.variant == "peel") {
+            strassenPeeled(FA.view(), FB.view(), FC.view());
+        } else if (opt.variant == "pad") {
+            strassenPadded(FA.view(), FB.view(), FC.view());
+        } else {
+            strassenRec(FA.view(), FB.view(), FC.view());
+        }
+    };
+
+    // Прогрев без трассировки, затем один прогон с ней
+    run();
+    traceStart(opt.depth);
+    run();
+    traceStop();
+
+    printTraceSummary(std::cout);
+
+    std::filesystem::path out(opt.out);
+    if (out.has_parent_path()) {
+        std::filesystem::create_directories(out.parent_path());
+    }
+    std::string summary = summaryPath(opt.out);
+    if (!writeChromeTrace(opt.out) || !writeTraceSummaryCsv(summary)) {
+        std::cout << "Не удалось записать " << opt.out << " или " << summary << std::endl;
+        return 1;
+    }
+    std::cout << "Трасса: " << opt.out << " (chrome://tracing, ui.perfetto.dev)\n"
+              << "Сводка по уровням: " << summary << std::endl;
+    return 0;
+}
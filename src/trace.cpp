@@ -0,0 +1,214 @@
+#include "trace.h"
+#include "alloc_tracker.h"
+
+#include <atomic>
+#include <chrono>
+#include <cstring>
+#include <fstream>
+#include <iomanip>
+#include <map>
+#include <mutex>
+#include <utility>
+
+namespace {
+
+// Событие для файла трассы (полная длительность, "ph": "X")
+struct TraceEvent {
+    const char *name;
+    int level;
+    int tid;
+    double startUs;
+    double durUs;
+    size_t allocations; // вместе с вложенными областями
+    size_t bytesCopied;
+};
+
+// Открытая область в стеке текущего потока
+struct Frame {
+    const char *name;
+    int level;
+    double startUs;
+    size_t allocations0;
+    double childUs = 0.0;
+    size_t childAllocations = 0;
+    size_t selfBytes = 0;
+    size_t childBytes = 0;
+};
+
+using Clock = std::chrono::steady_clock;
+
+std::atomic<bool> g_active(false);
+std::atomic<int> g_nextTid(0);
+int g_eventDepth = 0;
+Clock::time_point g_origin;
+
+std::mutex g_mutex;
+std::vector<TraceEvent> g_events;
+std::map<std::pair<int, std::string>, TraceLevelStats> g_stats;
+
+thread_local std::vector<Frame> t_stack;
+thread_local int t_tid = -1;
+// Выделения памяти самой трассировкой в этом потоке: вычитаются из счётчика
+thread_local size_t t_overhead = 0;
+
+double nowUs() {
+    return std::chrono::duration<double, std::micro>(Clock::now() - g_origin).count();
+}
+
+// Счётчик своего потока: стек областей у каждого потока свой, и выделения
+// соседних потоков (--threads N) не должны попадать в его области
+size_t allocationsNow() {
+    return threadAllocations() - t_overhead;
+}
+
+// Выделения внутри области учитываются как накладные расходы трассировки
+struct OverheadScope {
+    size_t before = threadAllocations();
+    ~OverheadScope() { t_overhead += threadAllocations() - before; }
+};
+
+} // namespace
+
+void traceStart(int eventDepth) {
+    std::lock_guard<std::mutex> lock(g_mutex);
+    g_events.clear();
+    g_stats.clear();
+    g_eventDepth = eventDepth;
+    resetAllocStats();
+    g_origin = Clock::now();
+    g_active = true;
+}
+
+void traceStop() {
+    g_active = false;
+}
+
+void traceCopied(size_t bytes) {
+    if (g_active && !t_stack.empty()) {
+        t_stack.back().selfBytes += bytes;
+    }
+}
+
+TraceScope::TraceScope(const char *name, int level) : active_(g_active) {
+    if (!active_) {
+        return;
+    }
+    {
+        OverheadScope overhead;
+        if (t_tid < 0) {
+            t_tid = g_nextTid++;
+        }
+        if (level < 0) {
+            level = t_stack.empty() ? 0 : t_stack.back().level;
+        } else if (!t_stack.empty() && t_stack.back().level == level &&
+                   std::strcmp(t_stack.back().name, name) == 0) {
+            // Тот же уровень ещё раз (отсечение, дополнение нулями) — не новая область
+            active_ = false;
+            return;
+        }
+        Frame frame;
+        frame.name = name;
+        frame.level = level;
+        t_stack.push_back(frame);
+    }
+    // Счётчики снимаются после учёта накладных расходов на push_back
+    t_stack.back().allocations0 = allocationsNow();
+    t_stack.back().startUs = nowUs();
+}
+
+TraceScope::~TraceScope() {
+    if (!active_) {
+        return;
+    }
+    double endUs = nowUs();
+    size_t allocations = allocationsNow();
+
+    OverheadScope overhead;
+    Frame frame = t_stack.back();
+    t_stack.pop_back();
+
+    double durUs = endUs - frame.startUs;
+    size_t totalAllocations = allocations - frame.allocations0;
+    size_t totalBytes = frame.selfBytes + frame.childBytes;
+
+    // Родитель в том же потоке получает полные значения как «вложенные»
+    if (!t_stack.empty()) {
+        Frame &parent = t_stack.back();
+        parent.childUs += durUs;
+        parent.childAllocations += totalAllocations;
+        parent.childBytes += totalBytes;
+    }
+
+    std::lock_guard<std::mutex> lock(g_mutex);
+    TraceLevelStats &s = g_stats[{frame.level, frame.name}];
+    s.level = frame.level;
+    s.name = frame.name;
+    s.calls += 1;
+    s.totalMs += durUs / 1000.0;
+    s.selfMs += (durUs - frame.childUs) / 1000.0;
+    s.allocations += totalAllocations - frame.childAllocations;
+    s.bytesCopied += frame.selfBytes;
+
+    if (frame.level < g_eventDepth) {
+        g_events.push_back({frame.name, frame.level, t_tid, frame.startUs, durUs,
+                            totalAllocations, totalBytes});
+    }
+}
+
+std::vector<TraceLevelStats> traceSummary() {
+    std::lock_guard<std::mutex> lock(g_mutex);
+    std::vector<TraceLevelStats> rows;
+    for (const auto &entry : g_stats) {
+        rows.push_back(entry.second);
+    }
+    return rows;
+}
+
+bool writeChromeTrace(const std::string &path) {
+    std::ofstream out(path);
+    if (!out) {
+        return false;
+    }
+    std::lock_guard<std::mutex> lock(g_mutex);
+    out << std::fixed << std::setprecision(3);
+    out << "{\"displayTimeUnit\": \"ms\", \"traceEvents\": [\n";
+    for (size_t i = 0; i < g_events.size(); ++i) {
+        const TraceEvent &e = g_events[i];
+        out << "{\"name\": \"" << e.name << "\", \"cat\": \"strassen\", \"ph\": \"X\""
+            << ", \"pid\": 1, \"tid\": " << e.tid
+            << ", \"ts\": " << e.startUs << ", \"dur\": " << e.durUs
+            << ", \"args\": {\"level\": " << e.level
+            << ", \"allocations\": " << e.allocations
+            << ", \"bytes_copied\": " << e.bytesCopied << "}}"
+            << (i + 1 < g_events.size() ? ",\n" : "\n");
+    }
+    out << "]}\n";
+    return (bool)out;
+}
+
+void printTraceSummary(std::ostream &out) {
+    out << std::left << std::setw(6) << "level" << std::setw(14) << "name" << std::right
+        << std::setw(10) << "calls" << std::setw(12) << "total_ms" << std::setw(12) << "self_ms"
+        << std::setw(12) << "allocs" << std::setw(14) << "copied_MB" << "\n";
+    out << std::fixed;
+    for (const TraceLevelStats &s : traceSummary()) {
+        out << std::left << std::setw(6) << s.level << std::setw(14) << s.name << std::right
+            << std::setw(10) << s.calls << std::setprecision(3) << std::setw(12) << s.totalMs
+            << std::setw(12) << s.selfMs << std::setw(12) << s.allocations << std::setw(14)
+            << s.bytesCopied / 1e6 << "\n";
+    }
+    out.unsetf(std::ios::fixed);
+}
+
+bool writeTraceSummaryCsv(const std::string &path) {
+    std::ofstream out(path);
+    if (!out) {
+        return false;
+    }
+    out << "level,name,calls,total_ms,self_ms,allocations,bytes_copied\n";
+    for (const TraceLevelStats &s : traceSummary()) {
+        out << s.level << "," << s.name << "," << s.calls << "," << s.totalMs << ","
+            << s.selfMs << "," << s.allocations << "," << s.bytesCopied << "\n";
+    }
+    return (bool)out;
+}
@@ -0,0 +1,124 @@
+#include "tuning.h"
+#include "sparse.h"
+#include "strassen.h"
+
+#include <cstdint>
+#include <cstdio>
+#include <fstream>
+#include <iostream>
+#include <sstream>
+#include <thread>
+
+#include <sys/utsname.h>
+#ifdef __APPLE__
+#include <sys/sysctl.h>
+#endif
+
+const char *const TUNING_DIR = "data/tuning";
+
+namespace {
+
+std::string trim(const std::string &s) {
+    size_t begin = s.find_first_not_of(" \t\r\n");
+    if (begin == std::string::npos) {
+        return "";
+    }
+    size_t end = s.find_last_not_of(" \t\r\n");
+    return s.substr(begin, end - begin + 1);
+}
+
+// Название модели процессора
+std::string cpuBrand() {
+#ifdef __APPLE__
+    char buf[256];
+    size_t size = sizeof(buf);
+    if (sysctlbyname("machdep.cpu.brand_string", buf, &size, nullptr, 0) == 0) {
+        return trim(std::string(buf));
+    }
+#else
+    std::ifstream fin("/proc/cpuinfo");
+    std::string line;
+    while (std::getline(fin, line)) {
+        size_t colon = line.find(':');
+        if (colon != std::string::npos && trim(line.substr(0, colon)) == "model name") {
+            return trim(line.substr(colon + 1));
+        }
+    }
+#endif
+    return "unknown";
+}
+
+std::string fnv1a64(const std::string &text) {
+    uint64_t hash = 14695981039346656037ULL;
+    for (unsigned char c : text) {
+        hash ^= c;
+        hash *= 1099511628211ULL;
+    }
+    char buf[17];
+    std::snprintf(buf, sizeof(buf), "%016llx", (unsigned long long)hash);
+    return buf;
+}
+
+} // namespace
+
+std::string cpuFingerprint() {
+    struct utsname info;
+    std::string machine = uname(&info) == 0 ? info.machine : "unknown";
+    std::ostringstream ss;
+    ss << cpuBrand() << "|" << machine << "|" << std::thread::hardware_concurrency();
+    return fnv1a64(ss.str());
+}
+
+std::string tuningProfilePath() {
+    return std::string(TUNING_DIR) + "/" + cpuFingerprint() + ".cfg";
+}
+
+bool readTuningProfile(const std::string &path,
+                       std::map<std::string, std::string> &values) {
+    std::ifstream fin(path);
+    if (!fin.is_open()) {
+        return false;
+    }
+    std::string line;
+    while (std::getline(fin, line)) {
+        line = trim(line);
+        if (line.empty() || line[0] == '#') {
+            continue;
+        }
+        size_t eq = line.find('=');
+        if (eq != std::string::npos) {
+            values[trim(line.substr(0, eq))] = trim(line.substr(eq + 1));
+        }
+    }
+    return true;
+}
+
+bool loadTuningProfile() {
+    std::map<std::string, std::string> values;
+    std::string path = tuningProfilePath();
+    if (!readTuningProfile(path, values)) {
+        return false;
+    }
+
+    // Порог плотности для multiplyAuto (sparse.h) — необязательный ключ
+    auto sparse = values.find("cpp_sparse_threshold");
+    if (sparse != values.end()) {
+        try {
+            setSparseThreshold(std::stod(sparse->second));
+        } catch (const std::exception &) {
+            std::cout << "Некорректный cpp_sparse_threshold в " << path << std::endl;
+        }
+    }
+
+    auto it = values.find("cpp_strassen_cutoff");
+    if (it == values.end()) {
+        return false;
+    }
+    try {
+        setStrassenCutoff(std::stoi(it->second));
+    } catch (const std::exception &) {
+        std::cout << "Некорректный cpp_strassen_cutoff в " << path << std::endl;
+        return false;
+    }
+    return true;
+}
@@ -0,0 +1,91 @@
+#include "winograd.h"
+#include "strassen.h"
+
+#include <stdexcept>
+
+WinogradWorkspace::WinogradWorkspace(int n, int cutoff)
+    : n_(n), cutoff_(cutoff > 0 ? cutoff : getStrassenCutoff()) {
+    // Размеры блоков по уровням: n/2, n/4, ... пока рекурсия продолжается
+    std::vector<int> blocks;
+    size_t total = 0;
+    for (int size = n; size > cutoff_ && size % 2 == 0; size /= 2) {
+        int k = size / 2;
+        blocks.push_back(k);
+        total += 2 * (size_t)k * k;
+    }
+
+    // Один буфер на все уровни: X и Y уровня l лежат подряд
+    buf_.assign(total, 0.0);
+    x_.reserve(blocks.size());
+    y_.reserve(blocks.size());
+    double *p = buf_.data();
+    for (int k : blocks) {
+        x_.push_back(MatrixView(p, k, k, k));
+        p += (size_t)k * k;
+        y_.push_back(MatrixView(p, k, k, k));
+        p += (size_t)k * k;
+    }
+}
+
+namespace {
+
+void winogradRec(ConstMatrixView A, ConstMatrixView B, MatrixView C,
+                 const WinogradWorkspace &ws, int level) {
+    int n = A.rows;
+
+    if (n <= ws.cutoff() || n % 2 != 0) {
+        multiplyBlocked(A, B, C);
+        return;
+    }
+
+    ConstMatrixView A11, A12, A21, A22;
+    ConstMatrixView B11, B12, B21, B22;
+    MatrixView C11, C12, C21, C22;
+
+    splitView(A, A11, A12, A21, A22);
+    splitView(B, B11, B12, B21, B22);
+    splitView(C, C11, C12, C21, C22);
+
+    MatrixView X = ws.x(level), Y = ws.y(level);
+    int next = level + 1;
+
+    // Порядок вычислений, при котором хватает двух временных блоков:
+    // S1..S4 и T1..T4 по очереди живут в X и Y, P1..P7 и U1..U7 — в блоках C
+    subInto(A11, A21, X);                     // X = S3 = A11 - A21
+    subInto(B22, B12, Y);                     // Y = T3 = B22 - B12
+    winogradRec(X, Y, C21, ws, next);         // C21 = P7 = S3 T3
+    addInto(A21, A22, X);                     // X = S1 = A21 + A22
+    subInto(B12, B11, Y);                     // Y = T1 = B12 - B11
+    winogradRec(X, Y, C22, ws, next);         // C22 = P5 = S1 T1
+    subFrom(X, A11);                          // X = S2 = S1 - A11
+    subInto(B22, Y, Y);                       // Y = T2 = B22 - T1
+    winogradRec(X, Y, C12, ws, next);         // C12 = P6 = S2 T2
+    subInto(A12, X, X);                       // X = S4 = A12 - S2
+    winogradRec(X, B22, C11, ws, next);       // C11 = P3 = S4 B22
+    winogradRec(A11, B11, X, ws, next);       // X = P1 = A11 B11
+    addTo(C12, X);                            // C12 = U2 = P1 + P6
+    addTo(C21, C12);                          // C21 = U3 = U2 + P7
+    addTo(C12, C22);                          // C12 = U4 = U2 + P5
+    addTo(C22, C21);                          // C22 = U7 = U3 + P5
+    addTo(C12, C11);                          // C12 = U5 = U4 + P3
+    subFrom(Y, B21);                          // Y = T4 = T2 - B21
+    winogradRec(A22, Y, C11, ws, next);       // C11 = P4 = A22 T4
+    subFrom(C21, C11);                        // C21 = U6 = U3 - P4
+    winogradRec(A12, B21, C11, ws, next);     // C11 = P2 = A12 B21
+    addTo(C11, X);                            // C11 = U1 = P1 + P2
+}
+
+} // namespace
+
+void strassenWinograd(ConstMatrixView A, ConstMatrixView B, MatrixView C,
+                      const WinogradWorkspace &ws) {
+    if (A.rows != A.cols || B.rows != A.rows || B.cols != A.cols || ws.size() != A.rows) {
+        throw std::invalid_argument("strassenWinograd: нужны квадратные матрицы размера рабочей области");
+    }
+    winogradRec(A, B, C, ws, 0);
+}
+
+void strassenWinograd(ConstMatrixView A, ConstMatrixView B, MatrixView C) {
+    WinogradWorkspace ws(A.rows);
+    strassenWinograd(A, B, C, ws);
+}